@@ -0,0 +1,364 @@
+__author__ = 'Acko'
+
+import ctypes
+import math
+import mmap
+import operator
+import sys
+
+from application.Heap import Heap
+from application.SearchBudget import SearchLimitExceeded
+from application.Solution import Solution
+from application.TableState import TableState
+
+
+class DictionaryClosedSet(dict):
+    """
+        Class which represents closed set (already expanded states) as plain dictionary, state -> state.
+
+        It is fastest closed set, but every entry keeps whole TableState instance alive (about hundred bytes
+        with dictionary overhead). All closed sets have same interface (add, in, len, memory, path, close),
+        so they can be used interchangeably by search engines.
+    """
+
+    __CHECK_INTERVAL__ = 1024
+
+    def __init__(self, board_type, max_memory=None):
+        """
+            Constructor, creates empty set.
+
+            :param board_type: (BoardType) type of boards which will be stored (not used by this set)
+            :param max_memory: (int) memory ceiling in bytes (no limit if None)
+        """
+
+        super(DictionaryClosedSet, self).__init__()
+        self.max_memory = max_memory
+
+    def add(self, state):
+        """
+            Stores state (with its last move).
+
+            :raises: (SearchLimitExceeded) if set uses more memory than allowed
+        """
+
+        self[state] = state
+        if self.max_memory is not None and not len(self) % self.__CHECK_INTERVAL__ and \
+                self.memory() > self.max_memory:
+            raise SearchLimitExceeded('Closed set memory limit exceeded: ' + str(self.memory()) + ' bytes')
+
+    def memory(self):
+        """ Returns estimated number of bytes used by set (dictionary and stored states) """
+
+        return sys.getsizeof(self) + len(self) * sys.getsizeof(TableState.goal())
+
+    def path(self, initial_state, final_state):
+        """
+            Returns moves which lead from initial state to final state, by undoing last moves of stored states.
+
+            :param initial_state: (TableState) state from which search started
+            :param final_state: (TableState) reached state, its predecessors must be in set
+            :return: (string) moves from initial state to final state
+        """
+
+        return Solution.backtrack(final_state, self)
+
+    def close(self):
+        """ Releases stored states """
+
+        self.clear()
+
+
+class PackedClosedSet(object):
+    """
+        Class which represents closed set as hash table of packed boards, with open addressing (linear probing).
+
+        Each entry is packed board (one or more 64 bit words) and one byte with code of last move (0 marks
+        empty slot), so 4x4 state takes 9 bytes instead of TableState instance with dictionary entry. Table is
+        kept in one buffer (ctypes arrays over it), and it is doubled when it gets too full. Home slot is taken
+        from high bits of 64-bit product of board (words folded by xor) and golden ratio constant (Fibonacci
+        hashing), so every tile changes it.
+
+        When doubled table would exceed memory ceiling, table is moved to memory mapped temporary file (if
+        spilling is allowed), so operating system can keep only used pages in memory. Otherwise search is
+        stopped by SearchLimitExceeded.
+    """
+
+    __MAX_LOAD__ = 0.7
+    __WORD_MASK__ = (1 << 64) - 1
+    __MULTIPLIER__ = 0x9E3779B97F4A7C15
+
+    """ Move codes, by last move (0 is empty slot) """
+    __CODES__ = {None: 1, TableState.LEFT: 2, TableState.UP: 3, TableState.RIGHT: 4, TableState.DOWN: 5}
+    __MOVES__ = (None, None, TableState.LEFT, TableState.UP, TableState.RIGHT, TableState.DOWN)
+
+    def __init__(self, board_type, max_memory=None, spill_directory=None, capacity=1024):
+        """
+            Constructor, allocates table.
+
+            :param board_type: (BoardType) type of boards which will be stored
+            :param max_memory: (int) memory ceiling in bytes (no limit if None)
+            :param spill_directory: (string) directory for temporary file used when table outgrows memory ceiling,
+                if None search is stopped instead
+            :param capacity: (int) initial number of slots (power of two)
+        """
+
+        self.board_type = board_type
+        self.max_memory = max_memory
+        self.spill_directory = spill_directory
+        self.spilled = False
+        self.__words = (board_type.bits * board_type.length + 63) // 64
+        self.__size = 0
+        self.__file = self.__buffer = self.__keys = self.__moves = None
+        self.__allocate(capacity)
+
+    def __len__(self):
+        """ Overriding __len__, returns number of stored states """
+
+        return self.__size
+
+    def __allocate(self, capacity):
+        """
+            Helper method which makes new empty table with given number of slots (old one is not released).
+
+            :raises: (SearchLimitExceeded) if table exceeds memory ceiling, and spilling is not allowed
+        """
+
+        size = capacity * (8 * self.__words + 1)
+        if not self.spilled and self.max_memory is not None and size > self.max_memory:
+            if self.spill_directory is None:
+                raise SearchLimitExceeded('Closed set memory limit exceeded: ' + str(size) + ' bytes')
+            self.spilled = True
+
+        if self.spilled:
+            import tempfile
+            self.__file = tempfile.TemporaryFile(dir=self.spill_directory)
+            self.__file.truncate(size)
+            self.__buffer = mmap.mmap(self.__file.fileno(), size)
+        else:
+            self.__file, self.__buffer = None, bytearray(size)
+
+        self.__mask = capacity - 1
+        self.__shift = 64 - (capacity.bit_length() - 1)
+        self.__keys = (ctypes.c_uint64 * (capacity * self.__words)).from_buffer(self.__buffer)
+        self.__moves = (ctypes.c_uint8 * capacity).from_buffer(self.__buffer, capacity * self.__words * 8)
+
+    def __grow(self):
+        """ Helper method which doubles table and moves all entries into it """
+
+        keys, moves, buffer, handle = self.__keys, self.__moves, self.__buffer, self.__file
+        words = self.__words
+
+        self.__allocate(2 * (self.__mask + 1))
+        self.__size = 0
+        for slot in xrange(len(moves)):
+            if moves[slot]:
+                board = 0
+                for word in xrange(words):
+                    board |= keys[slot * words + word] << (64 * word)
+                self.__store(board, moves[slot])
+
+        del keys, moves
+        if handle is not None:
+            buffer.close()
+            handle.close()
+
+    def __split(self, board):
+        """ Helper method which splits board into 64 bit words """
+
+        return [(board >> (64 * word)) & self.__WORD_MASK__ for word in xrange(self.__words)]
+
+    def __find(self, board):
+        """
+            Helper method which finds slot where board is, or should be, stored.
+
+            Boards which fit in one word (up to 4x4) are compared directly, bigger ones word by word.
+
+            :return: (int) slot
+        """
+
+        keys, moves, mask = self.__keys, self.__moves, self.__mask
+        if self.__words == 1:
+            slot = ((board * self.__MULTIPLIER__) & self.__WORD_MASK__) >> self.__shift
+            while moves[slot] and keys[slot] != board:
+                slot = (slot + 1) & mask
+            return slot
+
+        words, parts = self.__words, self.__split(board)
+        slot = ((reduce(operator.xor, parts) * self.__MULTIPLIER__) & self.__WORD_MASK__) >> self.__shift
+        while moves[slot] and keys[slot * words:(slot + 1) * words] != parts:
+            slot = (slot + 1) & mask
+        return slot
+
+    def __store(self, board, code):
+        """ Helper method which writes board and move code into its slot """
+
+        slot = self.__find(board)
+        if not self.__moves[slot]:
+            self.__size += 1
+        self.__keys[slot * self.__words:(slot + 1) * self.__words] = self.__split(board)
+        self.__moves[slot] = code
+
+    def add(self, state):
+        """
+            Stores state (with its last move).
+
+            :raises: (SearchLimitExceeded) if set exceeds memory ceiling and spilling is not allowed
+        """
+
+        if self.__size + 1 > self.__MAX_LOAD__ * (self.__mask + 1):
+            self.__grow()
+        self.__store(state.board, self.__CODES__[state.last_move])
+
+    def __contains__(self, state):
+        """ Overriding operator in """
+
+        return bool(self.__moves[self.__find(state.board)])
+
+    def __getitem__(self, state):
+        """
+            Overriding operator[], returns stored state (equal to sent one, but with last move it was stored with).
+
+            :raises: (KeyError) if state is not stored
+        """
+
+        code = self.__moves[self.__find(state.board)]
+        if not code:
+            raise KeyError(state)
+        return TableState(state.board, self.__MOVES__[code], self.board_type)
+
+    def memory(self):
+        """ Returns number of bytes used by table (in memory, or in temporary file if set is spilled) """
+
+        return len(self.__buffer)
+
+    def path(self, initial_state, final_state):
+        """ Returns moves which lead from initial state to final state (see DictionaryClosedSet.path) """
+
+        return Solution.backtrack(final_state, self)
+
+    def close(self):
+        """ Releases table (and its temporary file) """
+
+        self.__keys = self.__moves = None
+        if self.__file is not None:
+            self.__buffer.close()
+            self.__file.close()
+        self.__file = self.__buffer = None
+
+
+class BloomClosedSet(object):
+    """
+        Class which represents approximate closed set, Bloom filter over packed boards.
+
+        Filter uses fixed amount of memory (few bits per state), but it can report state which was never
+        added (false positive), so search which uses it can skip some states: it stays correct (every
+        returned solution is valid), but it can miss solution or find longer one. Meant for greedy search.
+
+        Last moves are not stored, so path is recovered by search from final state back to initial state,
+        which goes only through states reported as added. Any such path is valid sequence of moves.
+    """
+
+    def __init__(self, board_type, max_memory=None, capacity=10 ** 6, error_rate=0.001):
+        """
+            Constructor, allocates filter big enough for capacity states with given false positive rate.
+
+            :param board_type: (BoardType) type of boards which will be stored
+            :param max_memory: (int) memory ceiling in bytes, filter is made smaller (with higher error rate)
+                to fit in it
+            :param capacity: (int) expected number of stored states
+            :param error_rate: (float) expected false positive rate at full capacity
+        """
+
+        bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        if max_memory is not None:
+            bits = min(bits, max_memory * 8)
+
+        self.board_type = board_type
+        self.__bits = max(bits, 64)
+        self.__hashes = max(1, int(round(float(self.__bits) / capacity * math.log(2))))
+        self.__filter = bytearray((self.__bits + 7) // 8)
+        self.__size = 0
+
+    def __len__(self):
+        """ Overriding __len__, returns number of added states """
+
+        return self.__size
+
+    def __positions(self, board):
+        """
+            Helper method which returns bit positions of board (double hashing). Both hashes are high 32 bits of
+            64-bit products (with different odd constants), low bits of products depend only on low bits of board.
+        """
+
+        folded = 0
+        while board:
+            folded ^= board & 0xFFFFFFFFFFFFFFFF
+            board >>= 64
+        first = ((folded * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32
+        second = (((folded * 0xC2B2AE3D27D4EB4F) & 0xFFFFFFFFFFFFFFFF) >> 32) | 1
+        return [(first + i * second) % self.__bits for i in xrange(self.__hashes)]
+
+    def add(self, state):
+        """ Stores state """
+
+        for position in self.__positions(state.board):
+            self.__filter[position >> 3] |= 1 << (position & 7)
+        self.__size += 1
+
+    def __contains__(self, state):
+        """ Overriding operator in (can return True for state which was never added) """
+
+        return all(self.__filter[position >> 3] & (1 << (position & 7))
+                   for position in self.__positions(state.board))
+
+    def memory(self):
+        """ Returns number of bytes used by filter """
+
+        return len(self.__filter)
+
+    def path(self, initial_state, final_state):
+        """
+            Returns moves which lead from initial state to final state, through states reported as added.
+
+            Backward search is greedy best-first, ordered by manhattan distance to initial state.
+
+            :param initial_state: (TableState) state from which search started
+            :param final_state: (TableState) reached state
+            :return: (string) moves from initial state to final state
+        """
+
+        initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+        reached = {final_state.board: None}
+        queue = Heap(Heap.HEAP_DOWN)
+        queue.add(final_state.manhattan_to(initial_state), TableState(final_state.board, board_type=self.board_type))
+
+        while not queue.is_empty():
+            state = queue.pop()[1]
+            if state == initial_state:
+                break
+            for next_state in state.generate_next_moves():
+                if next_state.board in reached or (next_state != initial_state and next_state not in self):
+                    continue
+                reached[next_state.board] = next_state.last_move
+                queue.add(next_state.manhattan_to(initial_state), next_state)
+
+        moves = []
+        state = initial_state
+        while reached[state.board] is not None:
+            move = reached[state.board]
+            moves.append(TableState.INVERSE[move])
+            state = state.move(TableState.INVERSE[move])
+        return ''.join(moves)
+
+    def close(self):
+        """ Releases filter """
+
+        self.__filter = bytearray()
+
+
+""" Available closed sets, by name """
+CLOSED_SETS = {
+    'dict': DictionaryClosedSet,
+    'packed': PackedClosedSet,
+    'bloom': BloomClosedSet
+}
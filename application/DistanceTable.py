@@ -0,0 +1,282 @@
+__author__ = 'Acko'
+
+import mmap
+import os
+import struct
+import sys
+
+from application import tables
+from application.BoardType import BoardType
+from application.SearchBudget import SearchBudget
+from application.SearchStats import SearchStats
+from application.Solution import Solution
+from application.TableState import TableState
+
+
+class DistanceTable(object):
+    """
+        Class which represents optimal distances of all states of small board, so puzzles are solved by lookup.
+
+        Table is built by breadth-first search from goal state over whole reachable state space (181440 states
+        of 3x3 board). Every permutation of tiles (empty block counted as tile) has its place, given by its Lehmer
+        code (perfect hash, see rank), and gets 4 bits. Longest optimal solutions are longer than 15 moves, so
+        distances are stored modulo 15 (15 marks unreachable state). That is enough for finding optimal path:
+        neighbours of every state are exactly one move closer or farther, so path goes through neighbour whose
+        value is one smaller (modulo 15) until goal is reached, without any search.
+
+        File format (little endian): magic, rows, columns, then two values in every byte (lower 4 bits first),
+        in order of ranks. Loaded tables are memory-mapped read-only, so several processes share the same pages.
+    """
+
+    __MAGIC__ = 'DST1'
+    __HEADER__ = struct.Struct('<4sBB')
+    __MODULUS__ = 15
+    __MAX_LENGTH__ = 10
+    __tables = {}
+
+    """ Value of states which can't be reached from goal state """
+    UNREACHABLE = 15
+
+    def __init__(self, board_type, data, offset=0):
+        """
+            Constructor, sets properties to data sent to it, use build(), load() or get() for creating instances.
+
+            :param board_type: (BoardType) dimensions of board
+            :param data: (string|mmap) packed values
+            :param offset: (int) position of first packed value inside data
+        """
+
+        self.board_type = board_type
+        self.__data = data
+        self.__offset = offset
+        self.__mmap = None
+
+        length = board_type.length
+        self.__factorials = [1] * length
+        for i in xrange(length - 2, -1, -1):
+            self.__factorials[i] = self.__factorials[i + 1] * (length - 1 - i)
+        self.__popcounts = [bin(mask).count('1') for mask in xrange(1 << length)]
+
+    def __len__(self):
+        """ Overriding __len__, returns number of permutations (places in table) """
+
+        return self.__factorials[0] * self.board_type.length
+
+    def rank(self, board):
+        """
+            Method which calculates Lehmer code of packed board: position of its permutation in lexicographic
+            order of all permutations of tiles. Tiles already seen are kept as bit mask, and number of smaller
+            ones is read from table of bit counts, so rank takes one step per position.
+
+            :param board: (int) packed board
+            :return: (int) number in range [0, number of positions!)
+        """
+
+        bits, mask = self.board_type.bits, self.board_type.mask
+        factorials, popcounts = self.__factorials, self.__popcounts
+        seen, rank = 0, 0
+        for i in xrange(self.board_type.length - 1):
+            tile = (board >> (i * bits)) & mask
+            rank += (tile - popcounts[seen & ((1 << tile) - 1)]) * factorials[i]
+            seen |= 1 << tile
+        return rank
+
+    def value(self, board):
+        """
+            Method which returns stored value of packed board.
+
+            :param board: (int) packed board
+            :return: (int) optimal distance modulo 15, or UNREACHABLE
+        """
+
+        rank = self.rank(board)
+        return (ord(self.__data[self.__offset + (rank >> 1)]) >> ((rank & 1) << 2)) & 0xF
+
+    def path(self, state):
+        """
+            Method which finds optimal solution of state by following values which decrease by one.
+
+            :param state: (TableState) state of puzzle
+            :return: (string) moves which lead from state to final state
+
+            :raises: (ValueError) if state has different board type than table, or it can't be solved
+        """
+
+        if state.board_type is not self.board_type:
+            raise ValueError('Distance table built for board ' + str(self.board_type))
+
+        value = self.value(state.board)
+        if value == self.UNREACHABLE:
+            raise ValueError('State can not be reached from goal state')
+
+        state = TableState(state.board, board_type=state.board_type)
+        moves = []
+        while not state.is_final():
+            value = (value - 1) % self.__MODULUS__
+            for next_state in state.generate_next_moves():
+                if self.value(next_state.board) == value:
+                    break
+            state = next_state
+            moves.append(state.last_move)
+        return ''.join(moves)
+
+    @classmethod
+    def build(cls, board_type):
+        """
+            Builds new in-memory table, by breadth-first search from goal state.
+
+            :param board_type: (BoardType) dimensions of board
+            :return: (DistanceTable) built table
+
+            :raises: (ValueError) if board has more than 10 positions (table would have billions of places)
+        """
+
+        if board_type.length > cls.__MAX_LENGTH__:
+            raise ValueError('Distance table can be built only for boards with at most ' + str(cls.__MAX_LENGTH__) +
+                             ' positions')
+
+        table = cls(board_type, '')
+        unseen = 0xFF
+        distances = bytearray([unseen]) * len(table)
+
+        goal = TableState.goal(board_type)
+        distances[table.rank(goal.board)] = 0
+        layer, depth = [goal], 0
+        while layer:
+            depth += 1
+            following = []
+            for state in layer:
+                for next_state in state.generate_next_moves():
+                    rank = table.rank(next_state.board)
+                    if distances[rank] == unseen:
+                        distances[rank] = depth
+                        following.append(next_state)
+            layer = following
+
+        modulus = cls.__MODULUS__
+        packed = bytearray((len(distances) + 1) // 2)
+        for rank, distance in enumerate(distances):
+            value = cls.UNREACHABLE if distance == unseen else distance % modulus
+            packed[rank >> 1] |= value << ((rank & 1) << 2)
+
+        table.__data = str(packed)
+        return table
+
+    def save(self, path):
+        """
+            Writes table to binary file.
+
+            :param path: (string) path of file which will be (over)written
+        """
+
+        with open(path, 'wb') as output:
+            output.write(self.__HEADER__.pack(self.__MAGIC__, self.board_type.rows, self.board_type.columns))
+            output.write(self.__data[self.__offset:self.__offset + (len(self) + 1) // 2])
+
+    @classmethod
+    def load(cls, path):
+        """
+            Loads table from binary file, file is memory-mapped read-only (not read into memory).
+
+            :param path: (string) path of file created by save()
+            :return: (DistanceTable) loaded table
+
+            :raises: (ValueError) if file is not valid distance table
+        """
+
+        with open(path, 'rb') as input_file:
+            data = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = cls.__HEADER__.size
+        table = None
+        if len(data) >= size:
+            magic, rows, columns = cls.__HEADER__.unpack(data[:size])
+            if magic == cls.__MAGIC__ and 2 <= rows and 2 <= columns and rows * columns <= cls.__MAX_LENGTH__:
+                table = cls(BoardType.get(rows, columns), data, size)
+        if table is None or len(data) != size + (len(table) + 1) // 2:
+            data.close()
+            raise ValueError('Invalid distance table file: ' + path)
+
+        table.__mmap = data
+        return table
+
+    @classmethod
+    def get(cls, board_type):
+        """
+            Method which returns shared table of board type: already loaded one, one loaded from file beside
+            tables file (see tables.TABLES_FILE), or built one (which is then saved there).
+
+            :param board_type: (BoardType) dimensions of board
+            :return: (DistanceTable) table
+
+            :raises: (ValueError) if board is too big for distance table
+        """
+
+        if board_type not in cls.__tables:
+            path = None
+            if tables.TABLES_FILE:
+                path = os.path.join(os.path.dirname(tables.TABLES_FILE), 'distances-' + str(board_type) + '.bin')
+
+            table = None
+            if path is not None and os.path.exists(path):
+                try:
+                    table = cls.load(path)
+                except (ValueError, IOError):
+                    table = None
+            if table is None or table.board_type is not board_type:
+                table = cls.build(board_type)
+                if path is not None:
+                    table.__save_atomically(path)
+            cls.__tables[board_type] = table
+        return cls.__tables[board_type]
+
+    def __save_atomically(self, path):
+        """ Helper method which saves table through temporary file, failures (read-only directory) are ignored """
+
+        temporary = path + '.' + str(os.getpid())
+        try:
+            self.save(temporary)
+            os.rename(temporary, path)
+        except (IOError, OSError):
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def close(self):
+        """ Releases memory map, if table was loaded from file """
+
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+
+
+def table_search(initial_state, heuristic=None, budget=None, stats=None, table=None):
+    """
+        Search engine which doesn't search: optimal solution is read from distance table of board type.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) not used, accepted so engine can be called like other engines
+        :param budget: (SearchBudget) limits, one node is spent for every move of solution
+        :param stats: (SearchStats) statistics which engine should update (not collected if not sent)
+        :param table: (DistanceTable) table which is used (default shared table of board type, see get)
+        :return: (Solution) found solution, with bound 1
+
+        :raises: (ValueError) if board is too big for distance table
+    """
+
+    budget = budget or SearchBudget()
+    stats = stats or SearchStats(timing=False)
+    table = table or DistanceTable.get(initial_state.board_type)
+
+    moves = table.path(initial_state)
+    for _ in moves:
+        budget.spend()
+        stats.expand(0, 0)
+    return Solution(initial_state, moves, 1.0)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print 'Usage: python -m application.DistanceTable output_file [board_type]'
+        sys.exit(1)
+
+    DistanceTable.build(BoardType.parse(sys.argv[2]) if len(sys.argv) > 2 else BoardType.get(3)).save(sys.argv[1])
@@ -1,5 +1,7 @@
 __author__ = 'Acko'
 
+import operator
+
 
 class HeapError(Exception):
     """ Exception derived class for heap errors """
@@ -7,59 +9,15 @@ class HeapError(Exception):
     pass
 
 
-class HeapNode(object):
-    """
-        Class which represents wrapper class for each item stored inside heap.
-
-        It contains two properties, key and value. Has methods for comparing it self with
-        other HeapNode instances (overloading operator<() and operator>()). Also has
-        method which returns its content in tuple like form (used for returning data from heap).
-    """
-
-    def __init__(self, key, value):
-        """
-            Constructor of class, sets values sent as parameters to its properties.
-
-            :param key: (object - must have overloaded operator>() and operator<()) key on which items are
-                sorted inside heap
-            :param value: (object) value, any type of object which will be stored inside heap
-        """
-
-        self.__key = key
-        self.__value = value
-
-    def for_return(self):
-        """
-            Method which creates tuple representation of node data.
-
-            :return: (tuple) tuple wrapped instance properties
-        """
-
-        return self.__key, self.__value
-
-    def __lt__(self, other):
-        """ Overloading operator < () """
-
-        return self.__key < other.__key
-
-    def __gt__(self, other):
-        """ Overloading operator > () """
-
-        return self.__key > other.__key
-
-    def __str__(self):
-        """ Overriding __str__ from object """
-
-        return '(' + str(self.__key) + ', ' + str(self.__value) + ')'
-
-
 class Heap(object):
     """
-        Class which represents Heap implemented by balanced, binary tree, represented as a list.
+        Class which represents Heap implemented by balanced, binary tree, represented as lists.
 
-        This class is Heap implementation using balanced, binary tree, which is "default" presentation
-        of heaps. Tree is represented as a list of elements, default 0-th element is None only for simplification
-        of left/right child positioning.
+        This class is indexed Heap implementation using balanced, binary tree, which is "default" presentation
+        of heaps. Tree is stored in two parallel lists (keys and values), children of element on position i
+        are on positions 2 * i + 1 and 2 * i + 2. Position of every value is kept in dictionary, so heap can
+        tell if it contains value and can change key of stored value (values must be hashable and unique).
+        Heap counts its operations (pushes, pops and decreases properties), for search statistics.
     """
 
     """ Enumeration describing direction of heap (min or max key element to top) """
@@ -67,167 +25,287 @@ class Heap(object):
 
     def __init__(self, direction=HEAP_DOWN):
         """
-            Constructor, initializes internal list (tree) and sets __compare__ property to appropriate function
+            Constructor, initializes internal lists (tree) and sets __before property to appropriate comparison
             based on direction parameter.
 
             :param direction: (Heap.HEAP_UP or Heap.HEAP_DOWN) shows direction in which elements should be ordered.
         """
 
-        self.__data = [None]
-        self.__compare__ = lambda a, b: (a < b if direction == self.HEAP_UP else a > b)
+        self.__keys = []
+        self.__values = []
+        self.__positions = {}
+        self.__before = operator.gt if direction == self.HEAP_UP else operator.lt
+        self.pushes = self.pops = self.decreases = 0
 
     def __len__(self):
         """ Overriding __len__ """
 
-        return len(self.__data)
+        return len(self.__keys)
 
     def __str__(self):
         """ Overriding __str__ """
 
         ret_val = ''
-        for el in self.__data:
-            ret_val += str(el) + ', '
+        for key, value in zip(self.__keys, self.__values):
+            ret_val += '(' + str(key) + ', ' + str(value) + '), '
         return ret_val
 
-    def __has_left_child(self, pos):
-        """ Method which tells us if element on current position has left child """
+    def __set(self, pos, key, value):
+        """ Simple helper method, places key, value pair on sent position and remembers that position """
 
-        return pos * 2 < len(self.__data)
+        self.__keys[pos] = key
+        self.__values[pos] = value
+        self.__positions[value] = pos
 
-    def __has_right_child(self, pos):
-        """ Method which tells us if element on current position has right child """
+    def __up_heap(self, pos):
+        """
+            Method for sorting data when element is inserted into structure (or its key is changed).
 
-        return pos * 2 + 1 < len(self.__data)
+            It goes from given position up to top (parent by parent) checking if element should be
+            before parent, and if true, moves parent down, and checks next parent. It stops when finds parent
+            which should be before given element, or when given element becomes root node.
 
-    def __get_left_child(self, pos):
+            :param pos: (int) position of element which should be checked for going "up" on tree
         """
-            Method which returns left child (HeapNode instance) of element on sent position.
 
-            :param pos: (int) position of element whose child we're looking for.
-            :return: (HeapNode) left child (if exists)
+        keys, values, before = self.__keys, self.__values, self.__before
+        key, value = keys[pos], values[pos]
 
-            :raises: (HeapError) if element doesn't have left child
-        """
+        while pos > 0:
+            parent = (pos - 1) // 2
+            if not before(key, keys[parent]):
+                break
+            self.__set(pos, keys[parent], values[parent])
+            pos = parent
 
-        if not self.__has_left_child(pos):
-            raise HeapError('Reaching out of range')
-        return self.__data[pos * 2]
+        self.__set(pos, key, value)
 
-    def __get_right_child(self, pos):
+    def __down_heap(self, pos=0):
         """
-            Method which returns right child (HeapNode instance) of element on sent position.
+            Method for sorting data when element is removed from structure.
 
-            :param pos: (int) position of element whose child we're looking for.
-            :return: (HeapNode) right child (if exists)
+            It goes from position (usually root node), checks for left and right children, picks the one
+            which should go before other one, and if it should go before element from start position, moves
+            it up, and continues from its position. It stops when neither child should go before element.
 
-            :raises: (HeapError) if element doesn't have right child
+            :param pos: (int) position from which to start (default = root node)
         """
 
-        if not self.__has_right_child(pos):
-            raise HeapError('Reaching out of range')
-        return self.__data[pos * 2 + 1]
+        keys, values, before = self.__keys, self.__values, self.__before
+        key, value = keys[pos], values[pos]
+        length = len(keys)
 
-    def __get_parent(self, pos):
-        """
-            Method which returns parent (HeapNode instance) of element on sent position.
+        while True:
+            child = pos * 2 + 1
+            if child >= length:
+                break
+            if child + 1 < length and before(keys[child + 1], keys[child]):
+                child += 1
+            if not before(keys[child], key):
+                break
+            self.__set(pos, keys[child], values[child])
+            pos = child
+
+        self.__set(pos, key, value)
 
-            :param pos: (int) position of element whose parent we're looking for.
-            :return: (HeapNode) parent (if exists)
+    def is_empty(self):
+        """ Checks if heap is empty """
 
-            :raises: (HeapError) if element doesn't have parent (root node)
-        """
+        return not self.__keys
 
-        if pos <= 1:
-            raise HeapError('Reaching out of range')
-        return self.__data[pos // 2]
+    def contains(self, value):
+        """ Checks if value is stored in heap """
 
-    def __swap(self, pos_a, pos_b):
-        """ Simple helper method, swaps two elements, placed on positions sent as parameters """
+        return value in self.__positions
 
-        self.__data[pos_a], self.__data[pos_b] = self.__data[pos_b], self.__data[pos_a]
+    def add(self, key, value):
+        """
+            Public interface, method for adding new key, value pair into heap.
 
-    def __up_heap(self, pos):
+            :param key: (object - must have overloaded operator>() and operator<()) key, based on which objects
+                are sorted.
+            :param value: (object) value, any hashable object type which should be stored in heap
+
+            :raises: (HeapError) if value is already in heap
         """
-            Method for sorting data when new element is inserted into structure.
 
-            It goes from given position up to top (parent by parent) checking if child element should be
-            before parent, and if true, swaps them, and checks next parent. It stops when finds parent
-            which should be before given element, or when given element becomes root node.
+        if value in self.__positions:
+            raise HeapError('Value already in heap!')
 
-            :param pos: (int) position of element which should be checked for going "up" on tree
+        self.pushes += 1
+        self.__keys.append(key)
+        self.__values.append(value)
+        self.__up_heap(len(self.__keys) - 1)
+
+    def decrease_key(self, value, key):
         """
+            Public interface, method which moves already stored value closer to top, by giving it better key.
 
-        while pos > 1 and self.__compare__(self.__get_parent(pos), self.__data[pos]):
-            self.__swap(pos, pos // 2)
-            pos //= 2
+            Sent value replaces stored one (they must be equal), so updated object can be stored.
 
-    def __down_heap(self, pos=1):
+            :param value: (object) value which is already in heap
+            :param key: (object) new key, must not be worse than current one
+
+            :raises: (HeapError) if value is not in heap or key is worse than current
         """
-            Method for sorting data when element is removed from structure.
 
-            It goes from position (usually root node), checks for left and right children, if both exists
-            then checks which should go before other one, and that one swaps with position from where started,
-            if right doesn't exist, then just swaps it with left, and if neither child exists, then it stops.
+        pos = self.__positions.get(value)
+        if pos is None:
+            raise HeapError('Value not in heap!')
+        if self.__before(self.__keys[pos], key):
+            raise HeapError('New key is worse than current!')
 
-            When start position is put down as far as it should go (it will always go to the bottom because
-            its value (key) doesn't matter, it implies that start position should be removed), then it is
-            swapped with last filled position, and after that, last filled position is freed, and up_heap is
-            called with position on which initially node was dropped.
+        self.decreases += 1
+        self.__keys[pos] = key
+        self.__values[pos] = value
+        self.__up_heap(pos)
 
-            :param pos: (int) position from which to start (default = root node)
+    def top(self):
+        """ Returns first key, value pair in heap """
+
+        if self.is_empty():
+            raise HeapError("Heap empty!")
+        return self.__keys[0], self.__values[0]
+
+    def pop(self):
         """
+            Public interface, method which returns first key, value pair in heap, and reorganizes other nodes.
+
+            :return: (tuple (key, value)) first key, value pair in heap.
+        """
+
+        if self.is_empty():
+            raise HeapError("Heap empty!")
+
+        self.pops += 1
+        item = self.__keys[0], self.__values[0]
+        del self.__positions[item[1]]
+
+        key, value = self.__keys.pop(), self.__values.pop()
+        if self.__keys:
+            self.__keys[0], self.__values[0] = key, value
+            self.__down_heap()
+        return item
+
+
+class BucketQueue(object):
+    """
+        Class which represents priority queue with small non-negative integer keys (min key to top).
+
+        Each key has its own list (bucket) of values, and queue remembers smallest key which can have values,
+        so add and pop are constant time (amortized). It has same interface as Heap, so they can be used
+        interchangeably. Values which got better key are left in their old bucket and skipped when reached.
+        Values from same bucket are returned in LIFO order. Operations are counted same way as in Heap.
+    """
+
+    def __init__(self):
+        """ Constructor, initializes buckets and dictionary of current (key, value) entries """
+
+        self.__buckets = []
+        self.__entries = {}
+        self.__minimum = 0
+        self.pushes = self.pops = self.decreases = 0
+
+    def __len__(self):
+        """ Overriding __len__ """
+
+        return len(self.__entries)
+
+    def __str__(self):
+        """ Overriding __str__ """
+
+        ret_val = ''
+        for key, value in sorted(self.__entries.values()):
+            ret_val += '(' + str(key) + ', ' + str(value) + '), '
+        return ret_val
+
+    def __push(self, key, value):
+        """ Helper method, puts value into bucket for sent key """
+
+        if not isinstance(key, (int, long)) or key < 0:
+            raise HeapError('Bucket queue keys must be non-negative integers!')
+
+        while len(self.__buckets) <= key:
+            self.__buckets.append([])
+        self.__buckets[key].append(value)
+        self.__entries[value] = (key, value)
+        self.__minimum = min(self.__minimum, key)
+
+    def __settle(self):
+        """ Helper method, moves minimum to first bucket whose last value is current (not replaced) entry """
 
         while True:
-            left = self.__get_left_child(pos) if self.__has_left_child(pos) else None
-            right = self.__get_right_child(pos) if self.__has_right_child(pos) else None
-
-            if right and left and self.__compare__(left, right):
-                self.__swap(pos, pos * 2 + 1)
-                pos = pos * 2 + 1
-            elif left:
-                self.__swap(pos, pos * 2)
-                pos *= 2
-            else:
-                if pos != len(self.__data) - 1:
-                    self.__swap(pos, len(self.__data) - 1)
-                    self.__up_heap(pos)
-                self.__data.pop()
-                return
+            bucket = self.__buckets[self.__minimum]
+            while bucket:
+                entry = self.__entries.get(bucket[-1])
+                if entry is not None and entry[0] == self.__minimum and entry[1] is bucket[-1]:
+                    return bucket
+                bucket.pop()
+            self.__minimum += 1
 
     def is_empty(self):
-        """ Checks if heap is empty """
+        """ Checks if queue is empty """
+
+        return not self.__entries
 
-        return len(self.__data) == 1
+    def contains(self, value):
+        """ Checks if value is stored in queue """
+
+        return value in self.__entries
 
     def add(self, key, value):
         """
-            Public interface, method for adding new key, value pair into heap.
+            Public interface, method for adding new key, value pair into queue.
 
-            :param key: (object - must have overloaded operator>() and operator<()) key, based on which objects
-                are sorted.
-            :param value: (object) value, any object type which should be stored in heap
+            :param key: (int) non-negative key, based on which objects are sorted.
+            :param value: (object) value, any hashable object type which should be stored in queue
+
+            :raises: (HeapError) if value is already in queue or key is not non-negative integer
+        """
+
+        if value in self.__entries:
+            raise HeapError('Value already in heap!')
+        self.pushes += 1
+        self.__push(key, value)
+
+    def decrease_key(self, value, key):
+        """
+            Public interface, method which gives smaller key to already stored value.
+
+            :param value: (object) value which is already in queue (sent object replaces stored one)
+            :param key: (int) new key, must not be bigger than current one
+
+            :raises: (HeapError) if value is not in queue or key is bigger than current
         """
 
-        self.__data.append(HeapNode(key, value))
-        self.__up_heap(len(self.__data) - 1)
+        entry = self.__entries.get(value)
+        if entry is None:
+            raise HeapError('Value not in heap!')
+        if entry[0] < key:
+            raise HeapError('New key is worse than current!')
+        self.decreases += 1
+        self.__push(key, value)
 
     def top(self):
-        """ Returns first key, value pair in heap """
+        """ Returns first key, value pair in queue """
 
         if self.is_empty():
             raise HeapError("Heap empty!")
-        return self.__data[1].for_return()
+
+        bucket = self.__settle()
+        return self.__minimum, bucket[-1]
 
     def pop(self):
         """
-            Public interface, method which returns first key, value pair in heap, and reorganizes other nodes.
+            Public interface, method which returns first key, value pair in queue and removes it.
 
-            :return: (tuple (key, value)) first key, value pair in heap.
+            :return: (tuple (key, value)) first key, value pair in queue.
         """
 
         if self.is_empty():
             raise HeapError("Heap empty!")
 
-        item, self.__data[1] = self.__data[1], None
-        self.__down_heap()
-        return item.for_return()
\ No newline at end of file
+        self.pops += 1
+        value = self.__settle().pop()
+        del self.__entries[value]
+        return self.__minimum, value
@@ -0,0 +1,176 @@
+__author__ = 'Acko'
+
+from application.heuristics import LINE_HEURISTICS
+
+
+def _remember(generations, key, value, half):
+    """
+        Helper function which puts entry into recent generation. When recent generation is full, it becomes old one,
+        and old one (entries which weren't used since it was recent) is dropped.
+
+        :param generations: (python list) [recent dictionary, old dictionary]
+        :return: (int) number of evicted entries
+    """
+
+    recent = generations[0]
+    recent[key] = value
+    if len(recent) < half:
+        return 0
+
+    evicted = len(generations[1])
+    generations[1], generations[0] = recent, {}
+    return evicted
+
+
+class _Tables(object):
+    """ Helper class, cached values of one board type and layout of its rows and columns """
+
+    def __init__(self, board_type):
+        bits, rows, columns = board_type.bits, board_type.rows, board_type.columns
+        self.values = [{}, {}]
+        self.lines = [{}, {}]
+
+        # (mask of line in packed board, 1 for columns, line index, True for columns, shifts of line positions)
+        self.layout = []
+        for vertical, count, positions in ((False, rows, lambda line: xrange(line * columns, (line + 1) * columns)),
+                                           (True, columns, lambda line: xrange(line, rows * columns, columns))):
+            for line in xrange(count):
+                shifts = tuple(position * bits for position in positions(line))
+                self.layout.append((sum(board_type.mask << shift for shift in shifts), int(vertical), line, vertical,
+                                    shifts))
+
+
+class HeuristicCache(object):
+    """
+        Class which memoizes heuristic values, so states which are evaluated again (in every IDA* iteration, when
+        duplicates are reached, or in other puzzles of same batch) cost one dictionary lookup.
+
+        Values of whole boards are kept by packed board. Additive heuristics (see heuristics.LINE_HEURISTICS) are
+        on miss evaluated as base heuristic plus costs of every row and column, and those partial costs are kept
+        too, by content of line (masked packed board), so they are shared by all boards with that row or column.
+
+        Both tables have size bound, and least recently used entries are evicted in generations: entries live in
+        recent and old dictionary, entry found in old one is moved to recent one, and when recent one holds half of
+        size entries, old one (entries not used since) is dropped. Hit costs one dictionary lookup, exact LRU order
+        (OrderedDict, like in SolutionCache) costs several times more, as much as cost of line itself. Bounds apply
+        to every board type separately. Counters of hits, misses and evictions tell if cache pays for itself.
+    """
+
+    __caches = {}
+
+    def __init__(self, heuristic, size=1 << 18, line_size=1 << 16):
+        """
+            Constructor, makes empty cache.
+
+            :param heuristic: (function) function which returns heuristic value for sent TableState
+            :param size: (int) maximal number of cached board values
+            :param line_size: (int) maximal number of cached line costs (used only for additive heuristics)
+        """
+
+        self.heuristic = heuristic
+        self.size = size
+        self.line_size = line_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.line_hits = 0
+        self.line_misses = 0
+        self.line_evictions = 0
+        self.__base, self.__line_cost = LINE_HEURISTICS.get(heuristic, (None, None))
+        self.__tables = {}
+
+    @classmethod
+    def get(cls, heuristic, size=1 << 18, line_size=1 << 16):
+        """
+            Method which returns cache shared by all searches of this process, which use same heuristic and bounds.
+
+            :param heuristic: (function) function which returns heuristic value for sent TableState
+            :param size: (int) maximal number of cached board values
+            :param line_size: (int) maximal number of cached line costs
+            :return: (HeuristicCache) shared cache
+        """
+
+        key = (heuristic, size, line_size)
+        if key not in cls.__caches:
+            cls.__caches[key] = cls(heuristic, size, line_size)
+        return cls.__caches[key]
+
+    def __call__(self, state):
+        """
+            Overriding __call__, so cache is used as heuristic itself.
+
+            :param state: (TableState) state for which heuristic value is calculated
+            :return: (int) heuristic value
+        """
+
+        tables = self.__tables.get(state.board_type)
+        if tables is None:
+            tables = self.__tables[state.board_type] = _Tables(state.board_type)
+
+        board = state.board
+        value = tables.values[0].get(board)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        value = tables.values[1].pop(board, None)
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            value = self.heuristic(state) if self.__line_cost is None else self.__evaluate(state, tables)
+        self.evictions += _remember(tables.values, board, value, max(1, self.size // 2))
+        return value
+
+    def __evaluate(self, state, tables):
+        """ Helper method which evaluates additive heuristic as base value plus (cached) costs of rows and columns """
+
+        board_type, board = state.board_type, state.board
+        mask, half, lines = board_type.mask, max(1, self.line_size // 2), tables.lines
+        value = self.__base(state)
+        for line_mask, flag, line, vertical, shifts in tables.layout:
+            key = (board & line_mask) << 1 | flag
+            cost = lines[0].get(key)
+            if cost is not None:
+                self.line_hits += 1
+                value += cost
+                continue
+
+            cost = lines[1].pop(key, None)
+            if cost is not None:
+                self.line_hits += 1
+            else:
+                self.line_misses += 1
+                cost = self.__line_cost(board_type, line, tuple((board >> shift) & mask for shift in shifts), vertical)
+            self.line_evictions += _remember(lines, key, cost, half)
+            value += cost
+        return value
+
+    def counters(self):
+        """ Returns (hits, misses, line hits, line misses) tuple, SearchStats.count_cache uses differences of them """
+
+        return self.hits, self.misses, self.line_hits, self.line_misses
+
+    def __len__(self):
+        """ Overriding __len__, returns number of cached board values """
+
+        return sum(len(tables.values[0]) + len(tables.values[1]) for tables in self.__tables.values())
+
+    def clear(self):
+        """ Removes all cached values (counters are kept) """
+
+        self.__tables = {}
+
+    def to_dict(self):
+        """ Returns counters and sizes as dictionary (which can be dumped as JSON) """
+
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'line_entries': sum(len(tables.lines[0]) + len(tables.lines[1]) for tables in self.__tables.values()),
+            'line_hits': self.line_hits,
+            'line_misses': self.line_misses,
+            'line_evictions': self.line_evictions
+        }
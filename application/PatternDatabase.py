@@ -0,0 +1,329 @@
+__author__ = 'Acko'
+
+import mmap
+import os
+import struct
+import sys
+
+from application import tables
+from application.BoardType import BoardType
+from application.TableState import TableState
+
+
+class PatternDatabaseError(Exception):
+    """ Exception derived class for pattern database errors """
+
+    pass
+
+
+class PatternDatabase(object):
+    """
+        Class which represents disjoint additive pattern database heuristic.
+
+        Tiles are split into disjoint groups (patterns). For every placement of one group tiles, database
+        contains minimal number of moves of those tiles (moves of other tiles are free) needed to bring them
+        to their goal positions. Values for different groups can be added, and the sum is still admissible.
+
+        Tables are built by retrograde breadth-first search from the goal state, and can be saved to a binary
+        file. Loaded databases are memory-mapped read-only, so several solver processes share the same pages.
+        Instance is callable with TableState, so it can be sent as heuristic to solve_puzzle.
+
+        File format (little endian): magic, table size, number of patterns, then for each pattern its length
+        and tiles (one byte each), followed by one byte per entry for every pattern table, in the same order.
+
+        Build cost grows with number of placements of group tiles: default 4x4 partition 5-5-5 has three tables
+        of 524160 entries, and building it walks 25M abstract states, which takes about 3.5 minutes and 50 MB in
+        pure Python (6-6-3 partition would walk 92M states, with about 100 MB for distances alone). Use get(),
+        which builds default database only once and saves it beside tables file, so every later process only maps
+        it (in few milliseconds, sharing 1.5 MB of pages with other processes).
+    """
+
+    __MAGIC__ = 'PDB1'
+    __UNSEEN__ = 255
+    __databases = {}
+
+    """ Default partitions of tiles, by table size """
+    DEFAULT_PATTERNS = {
+        3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+        4: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15))
+    }
+
+    def __init__(self, size, patterns, tables):
+        """
+            Constructor, sets properties to data sent to it, use build() or load() for creating instances.
+
+            :param size: (int) table size for which database was built
+            :param patterns: (tuple) tuple of tile tuples, one for every group
+            :param tables: (python list) list of (buffer, offset) pairs, one for every group, where buffer is string
+                or mmap and offset is position of group's first entry inside it
+        """
+
+        self.size = size
+        self.patterns = tuple(tuple(pattern) for pattern in patterns)
+        self.__tables = tables
+        self.__mmap = None
+
+    def __call__(self, state):
+        """
+            Calculates heuristic value for given state, as sum of values of all groups.
+
+            :param state: (TableState) state for which heuristic value is calculated
+            :return: (int) heuristic value
+
+            :raises: (PatternDatabaseError) if state has different board type than database
+        """
+
+        if state.board_type is not BoardType.get(self.size):
+            raise PatternDatabaseError('Database built for table size ' + str(self.size))
+
+        cells = self.size ** 2
+        where = [0] * cells
+        for position, tile in enumerate(state.tiles()):
+            where[tile] = position
+
+        value = 0
+        for pattern, (table, offset) in zip(self.patterns, self.__tables):
+            value += ord(table[offset + self.__rank([where[tile] for tile in pattern], cells)])
+        return value
+
+    @staticmethod
+    def __rank(positions, cells):
+        """
+            Helper method which calculates index of k-permutation (positions of group tiles).
+
+            :param positions: (python list) distinct positions on board
+            :param cells: (int) number of positions on board
+            :return: (int) number in range [0, cells! / (cells - k)!)
+        """
+
+        index = 0
+        for i, position in enumerate(positions):
+            smaller = 0
+            for earlier in positions[:i]:
+                if earlier < position:
+                    smaller += 1
+            index = index * (cells - i) + position - smaller
+        return index
+
+    @staticmethod
+    def __unrank(index, k, cells):
+        """ Helper method, inverse of __rank """
+
+        digits = [0] * k
+        for i in xrange(k - 1, -1, -1):
+            index, digits[i] = divmod(index, cells - i)
+
+        available = range(cells)
+        return [available.pop(digit) for digit in digits]
+
+    @classmethod
+    def __build_table(cls, size, pattern):
+        """
+            Helper method which builds table for one group, using retrograde breadth-first search.
+
+            Search runs over (group tiles positions, blank position) pairs, starting from goal state. Moving
+            tile which is not in group costs nothing, so every layer is first closed under those moves
+            before next layer is started. Value stored for placement of group tiles is minimum over all
+            blank positions.
+
+            :param size: (int) table size
+            :param pattern: (tuple) tiles in group
+            :return: (string) one byte value for each rank of group tiles positions
+        """
+
+        cells = size ** 2
+        k = len(pattern)
+        entries = cls.__entries(size, pattern)
+        neighbours = BoardType.get(size).neighbours[None]
+
+        distances = bytearray([cls.__UNSEEN__]) * (entries * cells)
+        current = [cls.__rank([tile - 1 for tile in pattern], cells) * cells + cells - 1]
+        depth = 0
+
+        while current:
+            following = []
+            while current:
+                state = current.pop()
+                if distances[state] != cls.__UNSEEN__:
+                    continue
+                distances[state] = depth
+
+                rank, blank = divmod(state, cells)
+                positions = cls.__unrank(rank, k, cells)
+
+                for target, _ in neighbours[blank]:
+                    if target in positions:
+                        moved = list(positions)
+                        moved[positions.index(target)] = blank
+                        next_state = cls.__rank(moved, cells) * cells + target
+                        if distances[next_state] == cls.__UNSEEN__:
+                            following.append(next_state)
+                    else:
+                        next_state = rank * cells + target
+                        if distances[next_state] == cls.__UNSEEN__:
+                            current.append(next_state)
+
+            current = following
+            depth += 1
+
+        return str(bytearray(min(distances[rank * cells:(rank + 1) * cells]) for rank in xrange(entries)))
+
+    @classmethod
+    def get(cls, size=None):
+        """
+            Method which returns shared database with default partition: already loaded one, one memory-mapped from
+            file beside tables file (see tables.TABLES_FILE), or built one (which is then saved there and mapped).
+            For 4x4 board building takes few minutes, once.
+
+            :param size: (int) table size (default size of TableState.DEFAULT_BOARD_TYPE)
+            :return: (PatternDatabase) database
+
+            :raises: (PatternDatabaseError) if there is no default partition for given size
+        """
+
+        size = size or TableState.DEFAULT_BOARD_TYPE.rows
+        if size in cls.__databases:
+            return cls.__databases[size]
+
+        patterns = cls.DEFAULT_PATTERNS.get(size)
+        if patterns is None:
+            raise PatternDatabaseError('No default patterns for table size ' + str(size))
+
+        path = None
+        if tables.TABLES_FILE:
+            path = os.path.join(os.path.dirname(tables.TABLES_FILE),
+                                'pattern-database-' + str(BoardType.get(size)) + '.bin')
+
+        database = None
+        if path is not None and os.path.exists(path):
+            try:
+                database = cls.load(path)
+            except (PatternDatabaseError, ValueError, IOError, struct.error):
+                database = None
+        if database is not None and (database.size, database.patterns) != (size, patterns):
+            database.close()
+            database = None
+
+        if database is None:
+            database = cls.build(size, patterns)
+            if path is not None and database.__save_atomically(path):
+                database = cls.load(path)
+        cls.__databases[size] = database
+        return database
+
+    def __save_atomically(self, path):
+        """
+            Helper method which saves database through temporary file, failures (read-only directory) are ignored.
+
+            :return: (bool) True if database is saved
+        """
+
+        temporary = path + '.' + str(os.getpid())
+        try:
+            self.save(temporary)
+            os.rename(temporary, path)
+            return True
+        except (IOError, OSError):
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            return False
+
+    @classmethod
+    def build(cls, size=None, patterns=None):
+        """
+            Builds new in-memory database.
+
+            :param size: (int) table size (default size of TableState.DEFAULT_BOARD_TYPE)
+            :param patterns: (tuple) disjoint groups of tiles (default DEFAULT_PATTERNS for given size)
+            :return: (PatternDatabase) built database
+
+            :raises: (PatternDatabaseError) if groups are not disjoint or contain invalid tiles
+        """
+
+        size = size or TableState.DEFAULT_BOARD_TYPE.rows
+        patterns = patterns or cls.DEFAULT_PATTERNS.get(size)
+
+        tiles = [tile for pattern in patterns or () for tile in pattern]
+        if not tiles or len(tiles) != len(set(tiles)) or not all(0 < tile < size ** 2 for tile in tiles):
+            raise PatternDatabaseError('Patterns must be disjoint groups of tiles')
+
+        return cls(size, patterns, [(cls.__build_table(size, pattern), 0) for pattern in patterns])
+
+    def save(self, path):
+        """
+            Writes database to binary file.
+
+            :param path: (string) path of file which will be (over)written
+        """
+
+        with open(path, 'wb') as output:
+            output.write(self.__MAGIC__ + struct.pack('<BB', self.size, len(self.patterns)))
+            for pattern in self.patterns:
+                output.write(struct.pack('<B', len(pattern)) + str(bytearray(pattern)))
+            for pattern, (table, offset) in zip(self.patterns, self.__tables):
+                output.write(table[offset:offset + self.__entries(self.size, pattern)])
+
+    @classmethod
+    def load(cls, path):
+        """
+            Loads database from binary file, file is memory-mapped read-only (not read into memory).
+
+            :param path: (string) path of file created by save()
+            :return: (PatternDatabase) loaded database
+
+            :raises: (PatternDatabaseError) if file is not valid database
+        """
+
+        with open(path, 'rb') as input_file:
+            data = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if data[:len(cls.__MAGIC__)] != cls.__MAGIC__:
+            data.close()
+            raise PatternDatabaseError('Invalid pattern database file: ' + path)
+
+        offset = len(cls.__MAGIC__)
+        size, count = struct.unpack('<BB', data[offset:offset + 2])
+        offset += 2
+
+        patterns = []
+        for _ in xrange(count):
+            length = ord(data[offset])
+            patterns.append(tuple(bytearray(data[offset + 1:offset + 1 + length])))
+            offset += 1 + length
+
+        tables = []
+        for pattern in patterns:
+            tables.append((data, offset))
+            offset += cls.__entries(size, pattern)
+
+        if offset != len(data):
+            data.close()
+            raise PatternDatabaseError('Invalid pattern database file: ' + path)
+
+        database = cls(size, patterns, tables)
+        database.__mmap = data
+        return database
+
+    def close(self):
+        """ Releases memory map, if database was loaded from file """
+
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+
+    @staticmethod
+    def __entries(size, pattern):
+        """ Helper method which returns number of entries in table for given group """
+
+        entries = 1
+        for i in xrange(len(pattern)):
+            entries *= size ** 2 - i
+        return entries
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print 'Usage: python -m application.PatternDatabase output_file [table_size]'
+        sys.exit(1)
+
+    PatternDatabase.build(int(sys.argv[2]) if len(sys.argv) > 2 else None).save(sys.argv[1])
@@ -0,0 +1,74 @@
+__author__ = 'Acko'
+
+import time
+
+
+class SearchLimitExceeded(Exception):
+    """ Exception derived class, raised when search spends its whole node or time budget """
+
+    pass
+
+
+class SearchCancelled(SearchLimitExceeded):
+    """ Exception derived class, raised when search is cancelled from outside (engines handle it as spent budget) """
+
+    pass
+
+
+class SearchBudget(object):
+    """
+        Class which limits number of nodes search engine can expand and time it can run.
+
+        Engines call spend() once for every expanded node. Clock (and cancellation) is checked only every
+        CHECK_INTERVAL nodes, so budget costs almost nothing when limits are not set.
+    """
+
+    CHECK_INTERVAL = 1024
+
+    def __init__(self, max_nodes=None, timeout=None, deadline=None, cancelled=None):
+        """
+            Constructor, sets limits sent as parameters (None means no limit).
+
+            :param max_nodes: (int) maximal number of expanded nodes
+            :param timeout: (float) maximal number of seconds search can run, counted from creation of budget
+            :param deadline: (float) time (as returned by time.time) when search must stop, if both timeout and
+                deadline are sent, earlier one is used
+            :param cancelled: (function) called without arguments, returns True when search should stop (for
+                example because its result is not needed any more)
+        """
+
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        if timeout is not None:
+            self.deadline = min(time.time() + timeout, deadline or float('inf'))
+        self.cancelled = cancelled
+        self.nodes = 0
+        self.__periodic = self.deadline is not None or cancelled is not None
+
+    def spend(self):
+        """
+            Method which counts one expanded node.
+
+            :raises: (SearchLimitExceeded) if node or time limit is exceeded, (SearchCancelled) if search is cancelled
+        """
+
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchLimitExceeded('Node limit exceeded: ' + str(self.max_nodes))
+        if self.__periodic and self.nodes % self.CHECK_INTERVAL == 0:
+            if self.deadline is not None and time.time() > self.deadline:
+                raise SearchLimitExceeded('Time limit exceeded')
+            if self.cancelled is not None and self.cancelled():
+                raise SearchCancelled('Search cancelled')
+
+    def expired(self):
+        """
+            Method which checks time limit and cancellation right away (node limit is not checked), for work which
+            runs several searches, each with its own budget.
+
+            :return: (boolean) True if deadline has passed or search is cancelled
+        """
+
+        if self.deadline is not None and time.time() > self.deadline:
+            return True
+        return self.cancelled is not None and bool(self.cancelled())
@@ -0,0 +1,184 @@
+__author__ = 'Acko'
+
+import json
+import math
+import time
+
+
+class SearchStats(object):
+    """
+        Class which collects statistics of one search (counters, peak sizes and timings).
+
+        Engines count expanded, generated and skipped (duplicate) nodes, and report sizes of their open and
+        closed sets on every expansion. Heuristic evaluation is timed only if timing is turned on (wrapper
+        around heuristic costs about as much as manhattan distance itself). Optional progress callback is
+        called with this object every progress_interval expanded nodes.
+    """
+
+    def __init__(self, progress=None, progress_interval=10000, timing=True):
+        """
+            Constructor, sets all counters to zero.
+
+            :param progress: (function) called with SearchStats instance every progress_interval expansions
+            :param progress_interval: (int) number of expanded nodes between two progress calls
+            :param timing: (boolean) True if heuristic evaluations should be timed
+        """
+
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.timing = timing
+
+        self.engine = None
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.iterations = 0
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.heap_decreases = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.line_hits = 0
+        self.line_misses = 0
+        self.solution_length = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def begin(self, engine=None):
+        """ Starts measuring time of search """
+
+        self.engine = engine
+        self.started = time.time()
+
+    def end(self, solution=None):
+        """ Stops measuring time of search, and remembers length of found solution """
+
+        if self.started is not None:
+            self.elapsed = time.time() - self.started
+        if solution is not None:
+            self.solution_length = len(solution)
+
+    def timed(self, heuristic):
+        """
+            Method which wraps heuristic, so its evaluations are counted and timed (if timing is turned on).
+
+            :param heuristic: (function) heuristic function
+            :return: (function) wrapped heuristic (or same one, if timing is turned off)
+        """
+
+        if not self.timing:
+            return heuristic
+
+        def measured(state):
+            start = time.time()
+            value = heuristic(state)
+            self.heuristic_time += time.time() - start
+            self.heuristic_calls += 1
+            return value
+        return measured
+
+    def expand(self, open_size, closed_size):
+        """
+            Method which counts one expanded node, and updates peak sizes of open and closed sets.
+
+            :param open_size: (int) number of nodes in open set
+            :param closed_size: (int) number of nodes in closed set
+        """
+
+        self.expanded += 1
+        if open_size > self.peak_open:
+            self.peak_open = open_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+        if self.progress is not None and self.expanded % self.progress_interval == 0:
+            self.progress(self)
+
+    def count_queue(self, queue):
+        """ Method which adds operation counters of priority queue (Heap or BucketQueue) to totals """
+
+        self.heap_pushes += queue.pushes
+        self.heap_pops += queue.pops
+        self.heap_decreases += queue.decreases
+
+    def count_cache(self, cache, start):
+        """
+            Method which adds hits and misses of heuristic cache made since start to totals (cache is shared by
+            many searches, so only its own changes belong to this one).
+
+            :param cache: (HeuristicCache) heuristic cache used by search
+            :param start: (tuple) counters of cache before search started (HeuristicCache.counters result)
+        """
+
+        hits, misses, line_hits, line_misses = [now - before for now, before in zip(cache.counters(), start)]
+        self.cache_hits += hits
+        self.cache_misses += misses
+        self.line_hits += line_hits
+        self.line_misses += line_misses
+
+    def branching_factor(self):
+        """
+            Method which calculates effective branching factor b*: uniform tree of solution depth with branching
+            factor b* would have as many nodes as search generated (N + 1 = 1 + b* + b*^2 + ... + b*^d).
+
+            Sizes of trees are compared as logarithms, because b*^d overflows float for long (greedy) solutions.
+
+            :return: (float) effective branching factor, or None if solution length is not known
+        """
+
+        depth, nodes = self.solution_length, self.generated + 1
+        if not depth:
+            return None
+
+        def log_tree_size(factor):
+            # log((factor^(depth + 1) - 1) / (factor - 1)), without computing factor^(depth + 1)
+            return (depth + 1) * math.log(factor) + math.log1p(-factor ** -(depth + 1)) - math.log(factor - 1)
+
+        log_nodes = math.log(nodes)
+        low, high = 1.0, float(max(nodes, 2))
+        for _ in xrange(100):
+            middle = (low + high) / 2
+            if middle == low:
+                break
+            if log_tree_size(middle) < log_nodes:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def to_dict(self):
+        """ Returns all statistics as dictionary (which can be dumped as JSON) """
+
+        return {
+            'engine': self.engine,
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'peak_open': self.peak_open,
+            'peak_closed': self.peak_closed,
+            'iterations': self.iterations,
+            'heuristic_calls': self.heuristic_calls,
+            'heuristic_time': self.heuristic_time,
+            'heap_pushes': self.heap_pushes,
+            'heap_pops': self.heap_pops,
+            'heap_decreases': self.heap_decreases,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'line_hits': self.line_hits,
+            'line_misses': self.line_misses,
+            'solution_length': self.solution_length,
+            'branching_factor': self.branching_factor(),
+            'elapsed': self.elapsed
+        }
+
+    def dump(self, output):
+        """
+            Writes statistics as one line of JSON.
+
+            :param output: (file) opened file
+        """
+
+        output.write(json.dumps(self.to_dict(), sort_keys=True) + '\n')
@@ -0,0 +1,90 @@
+__author__ = 'Acko'
+
+from application.TableState import TableState
+
+
+class Solution(object):
+    """
+        Class which represents found solution of one puzzle.
+
+        Solution is stored compactly, as initial board and string of moves (one character per move, see
+        TableState.move), so it is cheap to keep, compare and send to other processes. Intermediate boards
+        are made only when asked for, by replaying moves.
+
+        Engines which know how good their solution is set bound: solution is at most bound times longer
+        than optimal one (1 for optimal engines, None when it is not known).
+    """
+
+    def __init__(self, initial_state, moves, bound=None):
+        """
+            Constructor, sets properties to data sent to it.
+
+            :param initial_state: (TableState) state of puzzle which is solved
+            :param moves: (string) moves which lead from initial state to final state
+            :param bound: (float) bound on suboptimality (None if unknown)
+        """
+
+        self.initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+        self.moves = moves
+        self.bound = bound
+
+    def __len__(self):
+        """ Overriding __len__, returns number of moves """
+
+        return len(self.moves)
+
+    def __str__(self):
+        """ Overriding __str__ """
+
+        return self.moves
+
+    def __eq__(self, other):
+        """ Overriding operator==() """
+
+        return self.initial_state == other.initial_state and self.moves == other.moves
+
+    def __ne__(self, other):
+        """ Overriding operator!=() """
+
+        return not self == other
+
+    @staticmethod
+    def backtrack(final_state, visited):
+        """
+            Method which collects moves which lead to final state, by undoing last moves.
+
+            Every state on the way back must be in visited dictionary, whose values are states with last move
+            made on the path (it is how engines store their closed sets).
+
+            :param final_state: (TableState) reached final state
+            :param visited: (dict) maps every state on the path to visited TableState instance
+            :return: (string) moves from initial state to final state
+        """
+
+        moves = []
+        state = final_state
+        while state.last_move is not None:
+            moves.append(state.last_move)
+            state = visited[state.previous()]
+        return ''.join(reversed(moves))
+
+    def states(self):
+        """
+            Generator which replays solution, yielding every state from initial to final one.
+
+            :return: (generator) TableState instances
+        """
+
+        state = self.initial_state
+        yield state
+        for direction in self.moves:
+            state = state.move(direction)
+            yield state
+
+    def final_state(self):
+        """ Returns state after last move """
+
+        state = self.initial_state
+        for direction in self.moves:
+            state = state.move(direction)
+        return state
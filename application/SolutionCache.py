@@ -0,0 +1,167 @@
+__author__ = 'Acko'
+
+import sqlite3
+from collections import OrderedDict
+
+from application.Solution import Solution
+from application.TableState import TableState
+
+
+class SolutionCache(object):
+    """
+        Class which represents two-tier cache of found solutions (move strings, with their bounds on suboptimality).
+
+        First tier is in-process LRU dictionary, second (optional) is SQLite database file, shared between runs
+        and processes. Both tiers have size bound, and least recently used entries are evicted first.
+
+        Key is canonical encoding of initial state: smaller of packed board and packed board of its mirror
+        (TableState.mirrored), so mirrored positions share one entry. Moves of mirrored state are stored
+        with LEFT/UP and RIGHT/DOWN swapped (only for square boards, mirror of rectangular board has other
+        dimensions). Keys also contain board dimensions and namespace (for example engine name), so solutions
+        of different quality are not mixed.
+    """
+
+    __MIRROR__ = {TableState.LEFT: TableState.UP, TableState.UP: TableState.LEFT,
+                  TableState.RIGHT: TableState.DOWN, TableState.DOWN: TableState.RIGHT}
+
+    def __init__(self, path=None, memory_size=1024, disk_size=100000):
+        """
+            Constructor, opens (or creates) database file if path is sent.
+
+            :param path: (string) path of SQLite database file, only in-process tier is used if None
+            :param memory_size: (int) maximal number of entries in in-process tier
+            :param disk_size: (int) maximal number of entries in database file
+        """
+
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.hits = 0
+        self.misses = 0
+        self.__memory = OrderedDict()
+        self.__connection = None
+        self.__clock = 0
+
+        if path is not None:
+            self.__connection = sqlite3.connect(path)
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS solutions '
+                                      '(key TEXT PRIMARY KEY, moves TEXT NOT NULL, used INTEGER NOT NULL, bound REAL)')
+            # files made before bounds were stored get column, their solutions have unknown bound
+            columns = [row[1] for row in self.__connection.execute('PRAGMA table_info(solutions)')]
+            if 'bound' not in columns:
+                with self.__connection:
+                    self.__connection.execute('ALTER TABLE solutions ADD COLUMN bound REAL')
+            self.__clock = self.__connection.execute('SELECT COALESCE(MAX(used), 0) FROM solutions').fetchone()[0]
+
+    @classmethod
+    def __canonical(cls, state, namespace):
+        """
+            Helper method which calculates canonical key of state.
+
+            :return: (tuple) (key, True if key belongs to mirrored state)
+        """
+
+        prefix = str(namespace) + ':' + str(state.board_type) + ':'
+        if state.board_type.rows != state.board_type.columns:
+            return prefix + format(state.board, 'x'), False
+
+        mirrored = state.mirrored().board
+        if mirrored < state.board:
+            return prefix + format(mirrored, 'x'), True
+        return prefix + format(state.board, 'x'), False
+
+    @classmethod
+    def __mirror(cls, moves):
+        """ Helper method which converts moves to moves of mirrored state """
+
+        return ''.join(cls.__MIRROR__[move] for move in moves)
+
+    def __remember(self, key, entry):
+        """ Helper method which puts (moves, bound) entry on top of in-process tier, evicting least recently used """
+
+        self.__memory.pop(key, None)
+        self.__memory[key] = entry
+        while len(self.__memory) > self.memory_size:
+            self.__memory.popitem(last=False)
+
+    def __tick(self):
+        """ Helper method which returns next value of usage clock (used for LRU order in database) """
+
+        self.__clock += 1
+        return self.__clock
+
+    def get(self, state, namespace=''):
+        """
+            Looks up solution of given state.
+
+            :param state: (TableState) initial state
+            :param namespace: (string) namespace in which solution was stored
+            :return: (string) moves which solve state (see TableState.move), or None if state is not in cache
+        """
+
+        solution = self.get_solution(state, namespace)
+        return solution.moves if solution is not None else None
+
+    def get_solution(self, state, namespace=''):
+        """
+            Looks up solution of given state, with bound it was stored with.
+
+            :param state: (TableState) initial state
+            :param namespace: (string) namespace in which solution was stored
+            :return: (Solution) solution of state, or None if state is not in cache
+        """
+
+        key, mirrored = self.__canonical(state, namespace)
+
+        entry = self.__memory.get(key)
+        if entry is None and self.__connection is not None:
+            row = self.__connection.execute('SELECT moves, bound FROM solutions WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                entry = str(row[0]), row[1]
+                with self.__connection:
+                    self.__connection.execute('UPDATE solutions SET used = ? WHERE key = ?', (self.__tick(), key))
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__remember(key, entry)
+        moves, bound = entry
+        return Solution(state, self.__mirror(moves) if mirrored else moves, bound)
+
+    def put(self, state, moves, namespace='', bound=None):
+        """
+            Stores solution of given state in both tiers.
+
+            :param state: (TableState) initial state
+            :param moves: (string) moves which solve state
+            :param namespace: (string) namespace in which solution is stored
+            :param bound: (float) bound on suboptimality of solution (None if unknown)
+        """
+
+        key, mirrored = self.__canonical(state, namespace)
+        moves = self.__mirror(moves) if mirrored else moves
+        self.__remember(key, (moves, bound))
+
+        if self.__connection is not None:
+            with self.__connection:
+                self.__connection.execute('INSERT OR REPLACE INTO solutions (key, moves, used, bound) '
+                                          'VALUES (?, ?, ?, ?)', (key, moves, self.__tick(), bound))
+                excess = self.__connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0] - self.disk_size
+                if excess > 0:
+                    self.__connection.execute('DELETE FROM solutions WHERE key IN '
+                                              '(SELECT key FROM solutions ORDER BY used LIMIT ?)', (excess,))
+
+    def __len__(self):
+        """ Overriding __len__, returns number of entries in database (or in-process tier, without database) """
+
+        if self.__connection is not None:
+            return self.__connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+        return len(self.__memory)
+
+    def close(self):
+        """ Closes database file """
+
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
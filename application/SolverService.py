@@ -0,0 +1,307 @@
+__author__ = 'Acko'
+
+import threading
+import time
+from multiprocessing import Pool, RawArray
+
+from application.SearchBudget import SearchLimitExceeded, SearchCancelled
+from application.Solution import Solution
+from application.TableState import TableState
+from application.functions import solve_puzzle, GREEDY
+
+""" Cancellation flags and deadlines of worker slots, shared with worker processes """
+_cancel_flags = None
+_deadlines = None
+
+
+def _initialize_worker(cancel_flags, deadlines):
+    """ Helper function which remembers shared slot arrays inside worker process """
+
+    global _cancel_flags, _deadlines
+    _cancel_flags, _deadlines = cancel_flags, deadlines
+
+
+def _solve_job(task):
+    """
+        Helper function which solves one puzzle inside worker process, polling cancellation flag and deadline
+        of its slot (both can be changed by service while search runs).
+
+        :param task: (tuple) (slot, packed board, BoardType, solve_puzzle keyword arguments)
+        :return: (tuple) (slot, moves or None, bound or None, exception or None)
+    """
+
+    slot, board, board_type, arguments = task
+
+    def cancelled():
+        return bool(_cancel_flags[slot]) or 0 < _deadlines[slot] < time.time()
+
+    try:
+        if cancelled():
+            raise SearchCancelled('Search cancelled')
+        solution = solve_puzzle(TableState(board, board_type=board_type), cancelled=cancelled, **arguments)
+        return slot, solution.moves, solution.bound, None
+    except Exception as e:
+        # every job must report back, otherwise its requests would wait forever
+        return slot, None, None, e
+
+
+class ServiceBusy(Exception):
+    """ Exception derived class, raised when service already runs as many searches as it is allowed to """
+
+    pass
+
+
+class PendingSolve(object):
+    """
+        Class which represents one request sent to SolverService, handle through which its result is received.
+
+        Several requests for same puzzle (with same options) share one search, but every request has its own
+        deadline and can be cancelled on its own. Search is stopped only when all its requests are gone.
+    """
+
+    def __init__(self, service, state, deadline):
+        """
+            Constructor, used by SolverService.submit.
+
+            :param service: (SolverService) service which runs search
+            :param state: (TableState) puzzle which is solved
+            :param deadline: (float) time (as returned by time.time) after which result is not needed (None if
+                there is no deadline)
+        """
+
+        self.service = service
+        self.state = state
+        self.deadline = deadline
+        self.computation = None
+        self.__event = threading.Event()
+        self.__callbacks = []
+        self.__solution = None
+        self.__error = None
+
+    def done(self):
+        """ Returns True if request is finished (solved, failed or cancelled) """
+
+        return self.__event.is_set()
+
+    def add_callback(self, callback):
+        """
+            Method which registers function called with this request when it is finished (immediately if it is
+            already finished). Callbacks run in service's thread, so they should only hand result over (for
+            example to event loop of caller).
+
+            :param callback: (function) function which receives PendingSolve
+        """
+
+        with self.service.lock:
+            self.__callbacks.append(callback)
+            finished = self.done()
+        if finished:
+            self.__run_callbacks()
+
+    def finish(self, solution=None, error=None):
+        """
+            Method which sets outcome of request and wakes everyone waiting for it (only first outcome is kept).
+
+            :param solution: (Solution) found solution
+            :param error: (Exception) error which will be raised by result
+        """
+
+        with self.service.lock:
+            if self.done():
+                return
+            self.__solution, self.__error = solution, error
+            self.__event.set()
+        self.__run_callbacks()
+
+    def __run_callbacks(self):
+        """ Helper method which calls (and forgets) registered callbacks """
+
+        while True:
+            with self.service.lock:
+                if not self.__callbacks:
+                    return
+                callback = self.__callbacks.pop(0)
+            callback(self)
+
+    def cancel(self):
+        """ Method which cancels request, its search is stopped if no other request waits for it """
+
+        self.service.detach(self)
+        self.finish(error=SearchLimitExceeded('Request cancelled'))
+
+    def wait(self, timeout=None):
+        """
+            Method which waits until request is finished, but not after its deadline (request is cancelled then).
+
+            :param timeout: (float) maximal number of seconds to wait (no limit if None)
+            :return: (boolean) True if request is finished
+        """
+
+        limit = self.deadline
+        if timeout is not None:
+            limit = min(limit or float('inf'), time.time() + timeout)
+
+        while not self.done():
+            if limit is None:
+                self.__event.wait(1)
+                continue
+            left = limit - time.time()
+            if left <= 0:
+                break
+            self.__event.wait(left)
+
+        if not self.done() and self.deadline is not None and time.time() >= self.deadline:
+            self.service.detach(self)
+            self.finish(error=SearchLimitExceeded('Time limit exceeded'))
+        return self.done()
+
+    def result(self, timeout=None):
+        """
+            Method which waits for request and returns its solution.
+
+            :param timeout: (float) maximal number of seconds to wait (no limit if None)
+            :return: (Solution) found solution
+
+            :raises: (SearchLimitExceeded) if deadline passed, limits were exceeded or request was cancelled,
+                (NotSolvablePuzzle) if puzzle can't be solved, (ValueError) if request had invalid options
+        """
+
+        if not self.wait(timeout):
+            raise SearchLimitExceeded('Time limit exceeded')
+        if self.__error is not None:
+            raise self.__error
+        return self.__solution
+
+
+class _Computation(object):
+    """ Helper class which represents one search running in worker process, with requests waiting for it """
+
+    def __init__(self, key, slot):
+        self.key = key
+        self.slot = slot
+        self.requests = []
+
+
+class SolverService(object):
+    """
+        Class which solves puzzles on pool of worker processes without blocking its callers.
+
+        submit returns immediately with PendingSolve handle, so caller (for example thread of web server, or
+        event loop through callbacks) is never blocked by search itself. Requests for same puzzle with same
+        options are coalesced onto one search. At most max_pending different searches run or wait at once, new
+        ones are refused with ServiceBusy (backpressure). Every search polls its cancellation flag and deadline in
+        memory shared with service, so cancelled or expired searches really stop and free their worker.
+    """
+
+    def __init__(self, workers=None, max_pending=64):
+        """
+            Constructor, starts worker processes.
+
+            :param workers: (int) number of worker processes (default number of cores)
+            :param max_pending: (int) maximal number of different searches at once
+        """
+
+        self.lock = threading.RLock()
+        self.max_pending = max_pending
+        self.__cancel_flags = RawArray('b', max_pending)
+        self.__deadlines = RawArray('d', max_pending)
+        self.__free_slots = range(max_pending)
+        self.__slots = {}
+        self.__running = {}
+        self.__pool = Pool(workers, _initialize_worker, (self.__cancel_flags, self.__deadlines))
+
+    def __len__(self):
+        """ Overriding __len__, returns number of searches in progress """
+
+        return len(self.__slots)
+
+    def submit(self, state, engine=GREEDY, heuristic='manhattan', timeout=None, max_nodes=None, **options):
+        """
+            Method which starts solving puzzle (or joins already running search for same puzzle).
+
+            :param state: (TableState) puzzle which should be solved
+            :param engine: (string) key from functions.ENGINES
+            :param heuristic: (string) name of heuristic (must be sent by name, to reach worker process)
+            :param timeout: (float) number of seconds after which result is not needed (no limit if None)
+            :param max_nodes: (int) node limit for search (no limit if None)
+            :param options: (dict) additional engine specific arguments (must be picklable)
+            :return: (PendingSolve) handle of request
+
+            :raises: (ServiceBusy) if max_pending searches are already in progress
+        """
+
+        deadline = time.time() + timeout if timeout is not None else None
+        request = PendingSolve(self, state, deadline)
+        key = (state.board, state.board_type, engine, heuristic, max_nodes, tuple(sorted(options.items())))
+
+        with self.lock:
+            computation = self.__running.get(key)
+            if computation is None:
+                if not self.__free_slots:
+                    raise ServiceBusy('Too many searches in progress: ' + str(self.max_pending))
+                computation = _Computation(key, self.__free_slots.pop())
+                self.__cancel_flags[computation.slot] = 0
+                self.__deadlines[computation.slot] = deadline or 0
+                self.__slots[computation.slot] = computation
+                self.__running[key] = computation
+
+                arguments = dict(options, engine=engine, heuristic=heuristic, max_nodes=max_nodes)
+                self.__pool.apply_async(_solve_job, ((computation.slot, state.board, state.board_type, arguments),),
+                                        callback=self.__finished)
+            elif self.__deadlines[computation.slot]:
+                # search runs until its latest request expires (0 is no deadline)
+                slot = computation.slot
+                self.__deadlines[slot] = max(self.__deadlines[slot], deadline) if deadline is not None else 0
+
+            request.computation = computation
+            computation.requests.append(request)
+        return request
+
+    def solve(self, state, **arguments):
+        """
+            Method which solves puzzle and waits for result (see submit for arguments).
+
+            :return: (Solution) found solution
+        """
+
+        return self.submit(state, **arguments).result()
+
+    def detach(self, request):
+        """
+            Method which removes request from its search, search is cancelled if it was its last request.
+
+            :param request: (PendingSolve) request which doesn't need result any more
+        """
+
+        with self.lock:
+            computation = request.computation
+            if computation is None or request not in computation.requests:
+                return
+            computation.requests.remove(request)
+            if not computation.requests:
+                self.__cancel_flags[computation.slot] = 1
+                if self.__running.get(computation.key) is computation:
+                    del self.__running[computation.key]
+
+    def __finished(self, result):
+        """ Helper method called (in pool's thread) with result of search, passes it to all waiting requests """
+
+        slot, moves, bound, error = result
+        with self.lock:
+            computation = self.__slots.pop(slot)
+            if self.__running.get(computation.key) is computation:
+                del self.__running[computation.key]
+            self.__free_slots.append(slot)
+            requests, computation.requests = computation.requests, []
+
+        for request in requests:
+            request.finish(Solution(request.state, moves, bound) if error is None else None, error)
+
+    def close(self):
+        """ Method which cancels all searches and stops worker processes """
+
+        with self.lock:
+            requests = [request for computation in self.__slots.values() for request in computation.requests]
+        for request in requests:
+            request.cancel()
+        self.__pool.terminate()
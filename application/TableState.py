@@ -2,49 +2,165 @@ __author__ = 'Acko'
 
 import re
 
+from application.BoardType import BoardType
+
 
 class TableState(object):
     """
         Class which represents one Table state.
 
-        It contains information about one (current) table state (move made) in form of
-        list (which should not be changed from outside), and also reference to an parent
-        TableState instance (necessary for backtracking from solution to beginning).
+        It contains information about one (current) table state packed into a single integer (which
+        should not be changed from outside), and also the last move made (direction of empty block, or
+        None for initial state). Search engines backtrack from solution to beginning by undoing last moves,
+        so states don't keep references to their parents (and whole ancestor chains alive).
+
+        Each tile occupies fixed number of bits inside packed integer (4 bits for boards up to 4x4),
+        tile on position i is stored in bits [i * bits, (i + 1) * bits), and empty block is stored as 0.
+        Instances use __slots__, so each search node is only few machine words big.
+
+        Dimensions of board (which can be rectangular) are given by BoardType, which every state points to,
+        so states of different sizes can be used side by side. Children share board type of their parent.
+
+        Manhattan distance and Zobrist hash are calculated once for initial state, and every
+        generated child gets them updated from its parent using only the tile that moved.
     """
 
-    TABLE_SIZE = 4
+    __slots__ = ('__board', '__type', '__blank', '__distance', '__hash', 'last_move')
+
     __EMPTY_BLOCK__ = 'x'
+    __TOKENS__ = re.compile(r'\d+|' + __EMPTY_BLOCK__)
+
+    """ Board type of packed boards sent without one """
+    DEFAULT_BOARD_TYPE = BoardType.get(4)
 
-    def __init__(self, state_list, parent):
+    """ Move codes, direction in which empty block moves """
+    LEFT, UP, RIGHT, DOWN = BoardType.LEFT, BoardType.UP, BoardType.RIGHT, BoardType.DOWN
+    INVERSE = BoardType.INVERSE
+
+    def __init__(self, state_list, last_move=None, board_type=None):
         """
             Base Constructor, sets all properties to data sent to it.
 
-            :param state_list: (python list|string) list of strings which represents one table state
-            :param parent: (TableState *) reference to a parent TableState instance
+            :param state_list: (python list|string|int) list of strings (or ints) which represents one table state,
+                string in format accepted by __parse_string, or already packed board
+            :param last_move: (string) move which lead to this state (None for initial state)
+            :param board_type: (BoardType) dimensions of board, if None square board is assumed (its size is
+                taken from number of tiles, or DEFAULT_BOARD_TYPE for packed board)
+
+            :raises: (ValueError) if number of tiles doesn't match board type (or no square board has it), or tiles
+                aren't all numbers from 1 to number of positions - 1 and one empty block
         """
 
-        self.__state_list = state_list if isinstance(state_list, list) else self.__parse_string(state_list)
-        self.parent = parent
+        if isinstance(state_list, (int, long)):
+            self.__type = board_type or self.DEFAULT_BOARD_TYPE
+            self.__board = state_list
+        else:
+            tiles = state_list if isinstance(state_list, list) else self.__parse_string(state_list)
+            self.__type = board_type or BoardType.for_length(len(tiles))
+            if len(tiles) != self.__type.length:
+                raise ValueError(str(len(tiles)) + ' tiles given for ' + str(self.__type) + ' board')
+            tiles = [0 if tile == self.__EMPTY_BLOCK__ else int(tile) for tile in tiles]
+            if sorted(tiles) != range(self.__type.length):
+                raise ValueError('Every tile (and empty block) must appear exactly once')
+            self.__board = self.__type.pack(tiles)
+
+        tiles = self.tiles()
+        distances, zobrist = self.__type.distances, self.__type.zobrist
+
+        self.__blank = tiles.index(0)
+        self.__distance = 0
+        self.__hash = 0
+        for i, tile in enumerate(tiles):
+            self.__distance += distances[i][tile]
+            self.__hash ^= zobrist[i][tile]
+        self.last_move = last_move
 
     def __str__(self):
         """ Overrides __str__ method from object """
 
+        tiles = self.tiles()
+        columns = self.__type.columns
         ret_val = ''
-        for i in xrange(self.TABLE_SIZE):
-            for j in xrange(self.TABLE_SIZE):
-                ret_val += self.__state_list[i * self.TABLE_SIZE + j] + ' '
+        for i in xrange(self.__type.rows):
+            for j in xrange(columns):
+                tile = tiles[i * columns + j]
+                ret_val += (str(tile) if tile else self.__EMPTY_BLOCK__) + ' '
             ret_val += '\n'
         return ret_val
 
     def __hash__(self):
         """ Overrides __hash__ method from object """
 
-        return hash(str(self))
+        return self.__hash
 
     def __eq__(self, other):
         """ Overriding operator==() """
 
-        return self.__state_list == other.__state_list
+        return self.__board == other.__board and self.__type is other.__type
+
+    def __ne__(self, other):
+        """ Overriding operator!=() """
+
+        return not self == other
+
+    @property
+    def board(self):
+        """ Packed integer representation of current state """
+
+        return self.__board
+
+    @property
+    def blank(self):
+        """ Position of empty block """
+
+        return self.__blank
+
+    @property
+    def board_type(self):
+        """ Dimensions of board (BoardType) """
+
+        return self.__type
+
+    @classmethod
+    def goal(cls, board_type=None):
+        """ Returns new TableState instance representing final (solved) state of given board type """
+
+        board_type = board_type or cls.DEFAULT_BOARD_TYPE
+        return cls(board_type.goal_board, board_type=board_type)
+
+    def tiles(self):
+        """
+            Method which unpacks current state into list of ints.
+
+            :return: (python list) list of tiles, empty block represented as 0
+        """
+
+        return self.__type.unpack(self.__board)
+
+    def __moved(self, target, direction):
+        """
+            Helper method which creates new TableState by moving empty block to target position.
+
+            :param target: (int) position of tile which is swapped with empty block
+            :param direction: (string) direction of that move
+            :return: (TableState) new state, with direction as last move
+        """
+
+        board_type = self.__type
+        bits = board_type.bits
+        blank = self.__blank
+        distances, zobrist = board_type.distances, board_type.zobrist
+
+        tile = (self.__board >> (target * bits)) & board_type.mask
+
+        state = TableState.__new__(TableState)
+        state.__board = self.__board ^ (tile << (target * bits)) ^ (tile << (blank * bits))
+        state.__type = board_type
+        state.__blank = target
+        state.__distance = self.__distance - distances[target][tile] + distances[blank][tile]
+        state.__hash = self.__hash ^ zobrist[target][tile] ^ zobrist[blank][tile]
+        state.last_move = direction
+        return state
 
     def generate_next_moves(self):
         """
@@ -54,37 +170,90 @@ class TableState(object):
             from given state. For each new move which can be made it creates new instance of
             TableState and stores it in list which is then returned.
 
-            :return: (python list) list of TableState instances (all possible next moves)
+            Moves are read from move table of board type (no bounds checks), and move which would undo last
+            move is left out: it only leads back to parent, which every engine has already reached more cheaply.
+
+            :return: (python list) list of TableState instances (all possible next moves, except going back)
         """
 
-        i = self.__state_list.index(self.__EMPTY_BLOCK__)
+        board_type = self.__type
+        bits, mask = board_type.bits, board_type.mask
+        distances, zobrist = board_type.distances, board_type.zobrist
+        board, blank, distance, hash_ = self.__board, self.__blank, self.__distance, self.__hash
+        blank_shift = blank * bits
+        from_blank, to_blank = distances[blank], zobrist[blank]
+
         moves = []
+        for target, direction in board_type.neighbours[self.last_move][blank]:
+            shift = target * bits
+            tile = (board >> shift) & mask
+
+            state = TableState.__new__(TableState)
+            state.__board = board ^ (tile << shift) ^ (tile << blank_shift)
+            state.__type = board_type
+            state.__blank = target
+            state.__distance = distance - distances[target][tile] + from_blank[tile]
+            state.__hash = hash_ ^ zobrist[target][tile] ^ to_blank[tile]
+            state.last_move = direction
+            moves.append(state)
+        return moves
 
-        # move left
-        if i > 0 and i % self.TABLE_SIZE != 0:
-            new_list = list(self.__state_list)
-            new_list[i], new_list[i - 1] = new_list[i - 1], new_list[i]
-            moves.append(TableState(new_list, self))
-
-        # move up
-        if i > self.TABLE_SIZE:
-            new_list = list(self.__state_list)
-            new_list[i], new_list[i - self.TABLE_SIZE] = new_list[i - self.TABLE_SIZE], new_list[i]
-            moves.append(TableState(new_list, self))
-
-        # move right
-        if i < len(self.__state_list) - 1 and i % self.TABLE_SIZE != self.TABLE_SIZE - 1:
-            new_list = list(self.__state_list)
-            new_list[i], new_list[i + 1] = new_list[i + 1], new_list[i]
-            moves.append(TableState(new_list, self))
-
-        # move down
-        if i < len(self.__state_list) - 1 - self.TABLE_SIZE:
-            new_list = list(self.__state_list)
-            new_list[i], new_list[i + self.TABLE_SIZE] = new_list[i + self.TABLE_SIZE], new_list[i]
-            moves.append(TableState(new_list, self))
+    def move(self, direction):
+        """
+            Function which makes one move, in given direction.
 
-        return moves
+            :param direction: (string) one of LEFT, UP, RIGHT, DOWN (direction in which empty block moves)
+            :return: (TableState) new state, with direction as last move
+
+            :raises: (ValueError) if move can't be made from current state
+        """
+
+        target = self.__type.targets[self.__blank].get(direction)
+        if target is None:
+            raise ValueError('Illegal move: ' + str(direction))
+        return self.__moved(target, direction)
+
+    def previous(self):
+        """
+            Function which undoes last move.
+
+            Returned state doesn't know its own last move, engines look it up in their set of visited states.
+
+            :return: (TableState) state from which this one was made, or None for initial state
+        """
+
+        if self.last_move is None:
+            return None
+        state = self.move(self.INVERSE[self.last_move])
+        state.last_move = None
+        return state
+
+    def direction_to(self, other):
+        """ Returns direction of move which leads from current state to other (neighbour) state """
+
+        columns = self.__type.columns
+        return {-1: self.LEFT, -columns: self.UP, 1: self.RIGHT, columns: self.DOWN}[other.__blank - self.__blank]
+
+    def mirrored(self):
+        """
+            Function which returns state reflected over main diagonal, with tiles renamed so final state stays final.
+
+            Solution of mirrored state is solution of this one with LEFT and UP (and RIGHT and DOWN) swapped.
+            Mirrored state of rectangular board has transposed board type.
+
+            :return: (TableState) mirrored state (without last move)
+        """
+
+        rows, columns = self.__type.rows, self.__type.columns
+        transposed = self.__type.transposed()
+        mirrored = [0] * self.__type.length
+        for position, tile in enumerate(self.tiles()):
+            row, column = divmod(position, columns)
+            if tile:
+                goal_row, goal_column = divmod(tile - 1, columns)
+                tile = goal_column * rows + goal_row + 1
+            mirrored[column * rows + row] = tile
+        return TableState(transposed.pack(mirrored), board_type=transposed)
 
     def is_final(self):
         """
@@ -93,72 +262,68 @@ class TableState(object):
             :return: (boolean) True if this TableState is final state, False otherwise
         """
 
-        for index, el in enumerate(self.__state_list):
-            if el == self.__EMPTY_BLOCK__:
-                return index == len(self.__state_list) - 1
-            elif int(el) - 1 != index:
-                return False
-        return True
+        return self.__board == self.__type.goal_board
 
     def is_solvable(self):
         """
             Method which determines if given state is solvable or not.
 
-            It uses following rules:
+            Classic rules count inversions:
                 a) If the grid width is odd, then the number of inversions in a solvable situation is even.
                 b) If the grid width is even, and the blank is on an even row counting from the bottom
                     (second-last, fourth-last etc), then the number of inversions in a solvable situation is odd.
                 c) If the grid width is even, and the blank is on an odd row counting from the bottom
                     (last, third-last, fifth-last etc) then the number of inversions in a solvable situation is even.
 
-            or "mathematically":
-                ( (grid width odd) && (#inversions even) )  ||
-                ( (grid width even) && ((blank on odd row from bottom) == (#inversions even)) )
+            Equivalent check by permutation parity (see BoardType.is_solvable) is used, it runs in linear time.
         """
 
-        inversions = self.__calculate_inversions()
-        empty_tile_row = self.__state_list.index(self.__EMPTY_BLOCK__) // self.TABLE_SIZE
-
-        return (self.TABLE_SIZE % 2 == 1 and inversions % 2 == 1) or\
-            (self.TABLE_SIZE % 2 == 0 and (self.TABLE_SIZE - 1 - empty_tile_row) % 2 == inversions % 2)
+        return self.__type.is_solvable(self.__board)
 
-    def __calculate_inversions(self):
+    def inversions(self):
         """
-            Helper method which calculates number of inversions for a given puzzle state.
+            Method which calculates number of inversions for a given puzzle state (see BoardType.inversions).
 
             :return: (int) number of inversions in current puzzle state
         """
-        inversions = 0
-        for i in xrange(len(self.__state_list) - 1):
-            if self.__state_list[i] == self.__EMPTY_BLOCK__:
-                continue
 
-            for j in xrange(i + 1, len(self.__state_list)):
-                if self.__state_list[j] != self.__EMPTY_BLOCK__ and int(self.__state_list[j]) < int(self.__state_list[i]):
-                    inversions += 1
-        return inversions
+        return self.__type.inversions(self.__board)
 
     def manhattan(self):
         """
             Function that calculates "manhattan" distance for current TableState.
 
-            This function calculates "manhattan" distance for current state, and it can be used
-            as heuristics function when sorting all table states.
+            This function returns "manhattan" distance for current state, and it can be used
+            as heuristics function when sorting all table states. Value is calculated when state
+            is created (incrementally for generated moves), so this call costs nothing.
 
             :return: (int) "Manhattan" distance for current state
         """
 
-        manhattan_distance = 0
-        for i in xrange(len(self.__state_list)):
-            if self.__state_list[i] == self.__EMPTY_BLOCK__:
-                continue
+        return self.__distance
 
-            x1, y1 = i // self.TABLE_SIZE, i % self.TABLE_SIZE
-            x2, y2 = (int(self.__state_list[i]) - 1) // self.TABLE_SIZE, (int(self.__state_list[i]) - 1) % self.TABLE_SIZE
+    def manhattan_to(self, other):
+        """
+            Function that calculates "manhattan" distance from current TableState to any other state.
 
-            manhattan_distance += abs(x2 - x1) + abs(y2 - y1)
+            Unlike manhattan(), which measures distance to final state and is cached, this one is calculated
+            on every call. It is used when searching backwards (from final state towards initial one).
 
-        return manhattan_distance
+            :param other: (TableState) state to which distance is calculated
+            :return: (int) sum of distances of every tile from its position in other state
+        """
+
+        columns = self.__type.columns
+        where = [0] * self.__type.length
+        for position, tile in enumerate(other.tiles()):
+            where[tile] = position
+
+        distance = 0
+        for position, tile in enumerate(self.tiles()):
+            if tile:
+                target = where[tile]
+                distance += abs(position // columns - target // columns) + abs(position % columns - target % columns)
+        return distance
 
     def hamming(self):
         """
@@ -171,11 +336,8 @@ class TableState(object):
         """
 
         hamming = 0
-        for i in xrange(len(self.__state_list)):
-            if self.__state_list[i] == self.__EMPTY_BLOCK__:
-                continue
-
-            if int(self.__state_list[i]) - 1 != i:
+        for i, tile in enumerate(self.tiles()):
+            if tile and tile - 1 != i:
                 hamming += 1
 
         return hamming
@@ -185,4 +347,4 @@ class TableState(object):
 
         if not isinstance(string_, str):
             raise Exception('Invalid data')
-        return re.findall(r'\d+|' + self.__EMPTY_BLOCK__, string_)
\ No newline at end of file
+        return self.__TOKENS__.findall(string_)
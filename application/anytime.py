@@ -0,0 +1,148 @@
+__author__ = 'Acko'
+
+from application.Heap import Heap
+from application.SearchBudget import SearchBudget, SearchLimitExceeded
+from application.SearchStats import SearchStats
+from application.Solution import Solution
+from application.TableState import TableState
+
+
+def ara_star_solutions(initial_state, heuristic=TableState.manhattan, weight=3.0, step=0.5, budget=None,
+                       stats=None):
+    """
+        Anytime repairing A* (ARA*), generator of better and better solutions.
+
+        Every iteration is weighted A* search (f = g + epsilon * h) which doesn't expand any state twice:
+        states whose cost improved after they were expanded are remembered as inconsistent, and they are
+        put back into open set for next iteration, with smaller epsilon. So every iteration reuses work of
+        previous ones. After every iteration which improved solution (or its bound) it is yielded, with bound
+        on its suboptimality: min(epsilon, cost / smallest g + h of open and inconsistent states). Search ends
+        when bound is 1.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) admissible heuristic (bounds are valid only for admissible heuristics)
+        :param weight: (float) epsilon used in first iteration
+        :param step: (float) epsilon is decreased by step after every iteration (but not under 1)
+        :param budget: (SearchBudget) limits for search, unlimited if not sent
+        :param stats: (SearchStats) statistics which engine should update (not collected if not sent)
+        :return: (generator) yields Solution instances, with bound set
+
+        :raises: (SearchLimitExceeded) if budget is spent (solutions yielded before are still valid)
+    """
+
+    budget = budget or SearchBudget()
+    stats = stats or SearchStats(timing=False)
+    heuristic = stats.timed(heuristic)
+    initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+    goal = TableState.goal(initial_state.board_type)
+
+    cost = {initial_state: 0}
+    nodes = {initial_state: initial_state}
+    estimates = {initial_state: heuristic(initial_state)}
+    open_states = [initial_state]
+    epsilon = max(1.0, weight)
+    published = None
+
+    while True:
+        stats.iterations += 1
+        priority_queue = Heap(Heap.HEAP_DOWN)
+        for state in open_states:
+            priority_queue.add(cost[state] + epsilon * estimates[state], state)
+        already_checked = {}
+        inconsistent = {}
+
+        try:
+            while not priority_queue.is_empty() and cost.get(goal, float('inf')) > priority_queue.top()[0]:
+                current_state = priority_queue.pop()[1]
+                already_checked[current_state] = True
+                budget.spend()
+                stats.expand(len(priority_queue), len(already_checked))
+
+                next_cost = cost[current_state] + 1
+                for next_state in current_state.generate_next_moves():
+                    stats.generated += 1
+                    if cost.get(next_state, next_cost + 1) <= next_cost:
+                        stats.duplicates += 1
+                        continue
+
+                    cost[next_state] = next_cost
+                    nodes[next_state] = next_state
+                    if next_state not in estimates:
+                        estimates[next_state] = heuristic(next_state)
+
+                    if next_state in already_checked:
+                        inconsistent[next_state] = True
+                    elif priority_queue.contains(next_state):
+                        priority_queue.decrease_key(next_state, next_cost + epsilon * estimates[next_state])
+                    else:
+                        priority_queue.add(next_cost + epsilon * estimates[next_state], next_state)
+
+            if goal not in cost:
+                return
+
+            open_states = inconsistent.keys()
+            while not priority_queue.is_empty():
+                open_states.append(priority_queue.pop()[1])
+        finally:
+            stats.count_queue(priority_queue)
+        lower = min([cost[state] + estimates[state] for state in open_states] or [cost[goal]])
+        bound = max(1.0, min(epsilon, float(cost[goal]) / lower)) if lower else 1.0
+
+        if published != (cost[goal], bound):
+            published = (cost[goal], bound)
+            yield Solution(initial_state, Solution.backtrack(nodes[goal], nodes), bound)
+        if bound <= 1.0:
+            return
+        epsilon = max(1.0, epsilon - step)
+
+
+def weighted_a_star_search(initial_state, heuristic=TableState.manhattan, weight=2.0, budget=None, stats=None):
+    """
+        Weighted A* search, nodes are ordered by f = g + weight * h.
+
+        Bigger weight makes search greedier (faster, with longer solutions). With admissible heuristic returned
+        solution is at most weight times longer than optimal one (reported bound is often tighter).
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+        :param weight: (float) weight of heuristic, not smaller than 1
+        :param budget: (SearchBudget) limits for search, unlimited if not sent
+        :param stats: (SearchStats) statistics which engine should update (not collected if not sent)
+        :return: (Solution) found solution, with bound on suboptimality
+
+        :raises: (SearchLimitExceeded) if budget is spent before solution is found
+    """
+
+    return next(ara_star_solutions(initial_state, heuristic, weight, budget=budget, stats=stats), None)
+
+
+def ara_star_search(initial_state, heuristic=TableState.manhattan, weight=3.0, step=0.5, budget=None,
+                    on_solution=None, stats=None):
+    """
+        Anytime search, ARA* which returns best solution found before budget is spent (see ara_star_solutions).
+
+        Use timeout (or deadline) of budget as latency limit: first solution is found quickly, and it is
+        improved while there is time left.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+        :param weight: (float) weight of heuristic in first iteration
+        :param step: (float) weight is decreased by step after every iteration
+        :param budget: (SearchBudget) limits for search, unlimited if not sent (then solution is optimal)
+        :param on_solution: (function) called with every found Solution (each better than previous one)
+        :param stats: (SearchStats) statistics which engine should update (not collected if not sent)
+        :return: (Solution) best found solution, its bound tells how far from optimal it can be
+
+        :raises: (SearchLimitExceeded) if budget is spent before first solution is found
+    """
+
+    best = None
+    try:
+        for solution in ara_star_solutions(initial_state, heuristic, weight, step, budget, stats):
+            best = solution
+            if on_solution is not None:
+                on_solution(solution)
+    except SearchLimitExceeded:
+        if best is None:
+            raise
+    return best
@@ -0,0 +1,180 @@
+__author__ = 'Acko'
+
+from application.TableState import TableState
+from application.heuristics import longest_increasing
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+""" Linear conflict costs of every encoded line content, by line width """
+_line_tables = {}
+
+
+def _require_numpy():
+    """ Helper function which fails early if NumPy is not installed (it is optional dependency) """
+
+    if numpy is None:
+        raise ImportError('NumPy is required for batch evaluation')
+
+
+def to_array(states, board_type=None):
+    """
+        Function which converts many boards into two-dimensional array, one board per row.
+
+        Boards which fit in 64 bits are unpacked with vectorized shifts, bigger ones one by one.
+
+        :param states: (iterable) TableState instances or packed boards (all of same board type)
+        :param board_type: (BoardType) type of boards (default type of first TableState, or
+            TableState.DEFAULT_BOARD_TYPE for packed boards)
+        :return: (numpy.ndarray) array of shape (number of boards, board length) with tiles (blank is 0)
+    """
+
+    _require_numpy()
+    states = list(states)
+    if board_type is None:
+        board_type = states[0].board_type if states and isinstance(states[0], TableState) \
+            else TableState.DEFAULT_BOARD_TYPE
+    boards = [state.board if isinstance(state, TableState) else state for state in states]
+
+    if board_type.bits * board_type.length > 64:
+        return numpy.array([board_type.unpack(board) for board in boards], dtype=numpy.uint8) \
+            .reshape(len(boards), board_type.length)
+
+    packed = numpy.fromiter(boards, dtype=numpy.uint64, count=len(boards))
+    shifts = numpy.arange(board_type.length, dtype=numpy.uint64) * numpy.uint64(board_type.bits)
+    return ((packed[:, None] >> shifts) & numpy.uint64(board_type.mask)).astype(numpy.uint8)
+
+
+def to_states(tiles, board_type):
+    """
+        Function which converts array made by to_array (or expand) back to TableState instances.
+
+        :param tiles: (numpy.ndarray) array of shape (number of boards, board length)
+        :param board_type: (BoardType) type of boards
+        :return: (python list) list of TableState instances
+    """
+
+    return [TableState(board_type.pack(row), board_type=board_type) for row in tiles.tolist()]
+
+
+def manhattan(tiles, board_type):
+    """
+        Function which calculates manhattan distance of every board in array.
+
+        :param tiles: (numpy.ndarray) array made by to_array
+        :param board_type: (BoardType) type of boards
+        :return: (numpy.ndarray) one distance per board
+    """
+
+    _require_numpy()
+    distances = numpy.array(board_type.distances, dtype=numpy.int32)
+    return distances[numpy.arange(board_type.length), tiles].sum(axis=1)
+
+
+def _line_table(width):
+    """
+        Helper function which returns linear conflict costs of all possible contents of line with given width.
+
+        Content of line is encoded as number in base (width + 1): digit on place i is 0 if tile on position i
+        doesn't belong to this line, otherwise it is goal position of that tile inside line plus one.
+
+        :param width: (int) number of tiles in line
+        :return: (numpy.ndarray) cost of every encoded content
+    """
+
+    if width not in _line_tables:
+        table = numpy.zeros((width + 1) ** width, dtype=numpy.int32)
+        for code in xrange(len(table)):
+            goals, rest = [], code
+            for _ in xrange(width):
+                rest, digit = divmod(rest, width + 1)
+                if digit:
+                    goals.append(digit - 1)
+            table[code] = 2 * (len(goals) - longest_increasing(goals))
+        _line_tables[width] = table
+    return _line_tables[width]
+
+
+def linear_conflict(tiles, board_type):
+    """
+        Function which calculates manhattan distance increased by linear conflicts, for every board in array.
+
+        Every row (and column) is encoded as one number (see _line_table), and its cost is looked up, so
+        values are same as ones calculated by heuristics.linear_conflict.
+
+        :param tiles: (numpy.ndarray) array made by to_array
+        :param board_type: (BoardType) type of boards
+        :return: (numpy.ndarray) one heuristic value per board
+    """
+
+    _require_numpy()
+    rows, columns = board_type.rows, board_type.columns
+    grid = tiles.astype(numpy.int32).reshape(-1, rows, columns)
+    present = grid > 0
+    goal_rows, goal_columns = (grid - 1) // columns, (grid - 1) % columns
+
+    row_digits = numpy.where(present & (goal_rows == numpy.arange(rows)[:, None]), goal_columns + 1, 0)
+    row_codes = (row_digits * (columns + 1) ** numpy.arange(columns)).sum(axis=2)
+    column_digits = numpy.where(present & (goal_columns == numpy.arange(columns)), goal_rows + 1, 0)
+    column_codes = (column_digits * (rows + 1) ** numpy.arange(rows)[:, None]).sum(axis=1)
+
+    return manhattan(tiles, board_type) + _line_table(columns)[row_codes].sum(axis=1) + \
+        _line_table(rows)[column_codes].sum(axis=1)
+
+
+def solvable(tiles, board_type):
+    """
+        Function which checks solvability of every board in array (same rules as TableState.is_solvable).
+
+        Inversions are counted by comparing every position with all positions after it, at once for all boards.
+
+        :param tiles: (numpy.ndarray) array made by to_array
+        :param board_type: (BoardType) type of boards
+        :return: (numpy.ndarray) boolean array, True for solvable boards
+    """
+
+    _require_numpy()
+    inversions = numpy.zeros(len(tiles), dtype=numpy.int64)
+    for i in xrange(board_type.length - 1):
+        later = tiles[:, i + 1:]
+        inversions += ((tiles[:, i:i + 1] > later) & (later > 0)).sum(axis=1)
+
+    if board_type.columns % 2 == 1:
+        return inversions % 2 == 0
+    blank_rows = numpy.argmax(tiles == 0, axis=1) // board_type.columns
+    return (board_type.rows - 1 - blank_rows) % 2 == inversions % 2
+
+
+def expand(tiles, board_type):
+    """
+        Function which generates children of every board in array (one frontier expansion step).
+
+        :param tiles: (numpy.ndarray) array made by to_array
+        :param board_type: (BoardType) type of boards
+        :return: (tuple) (children array, index of parent of every child, move of every child)
+    """
+
+    _require_numpy()
+    columns = board_type.columns
+    blanks = numpy.argmax(tiles == 0, axis=1)
+    blank_rows, blank_columns = divmod(blanks, columns)
+
+    children, parents, moves = [], [], []
+    for direction, offset, valid in ((TableState.LEFT, -1, blank_columns > 0),
+                                     (TableState.UP, -columns, blank_rows > 0),
+                                     (TableState.RIGHT, 1, blank_columns < columns - 1),
+                                     (TableState.DOWN, columns, blank_rows < board_type.rows - 1)):
+        index = numpy.nonzero(valid)[0]
+        child = tiles[index]
+        lines, blank = numpy.arange(len(index)), blanks[index]
+        child[lines, blank] = child[lines, blank + offset]
+        child[lines, blank + offset] = 0
+
+        children.append(child)
+        parents.append(index)
+        moves.append(numpy.repeat(numpy.array(direction), len(index)))
+
+    return numpy.concatenate(children), numpy.concatenate(parents), numpy.concatenate(moves)
@@ -0,0 +1,294 @@
+__author__ = 'Acko'
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import time
+from multiprocessing import Pool
+
+from application.BoardType import BoardType
+from application.Heap import Heap, BucketQueue
+from application.SearchBudget import SearchLimitExceeded
+from application.SearchStats import SearchStats
+from application.TableState import TableState
+from application.functions import solve_puzzle, A_STAR
+
+""" Priority queues which can be benchmarked with A*, by name """
+QUEUES = {'heap': Heap, 'bucket': BucketQueue}
+
+""" Metrics compared against baseline, True if bigger value is better """
+METRICS = {'time': False, 'expanded': False, 'moves': False, 'peak_rss': False, 'nodes_per_second': True}
+
+""" Configurations benchmarked when none are given """
+DEFAULT_CONFIGURATIONS = ['greedy:manhattan', 'astar:manhattan', 'astar:linear_conflict:bucket',
+                          'idastar:linear_conflict', 'wastar:linear_conflict']
+
+""" Korf's 100 4x4 instances (number, tiles in Korf's notation, optimal solution length), shipped with package """
+KORF_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'korf100.txt')
+
+""" Defaults of command line: length of walks which generate boards, and time limit for one puzzle (seconds) """
+DEFAULT_DEPTH = 40
+DEFAULT_TIMEOUT = 10.0
+
+
+def random_corpus(count, board_type=None, seed=0):
+    """
+        Function which generates seeded corpus of random solvable boards (uniform over all solvable boards).
+
+        Random permutations are generated, and unsolvable ones are skipped (TableState.is_solvable).
+
+        :param count: (int) number of boards
+        :param board_type: (BoardType) dimensions of boards (default TableState.DEFAULT_BOARD_TYPE)
+        :param seed: (int) seed of random generator, same seed gives same corpus
+        :return: (python list) list of TableState instances
+    """
+
+    board_type = board_type or TableState.DEFAULT_BOARD_TYPE
+    rand = random.Random(seed)
+    corpus = []
+    while len(corpus) < count:
+        tiles = range(board_type.length)
+        rand.shuffle(tiles)
+        state = TableState(tiles, board_type=board_type)
+        if state.is_solvable():
+            corpus.append(state)
+    return corpus
+
+
+def walk_corpus(count, depth, board_type=None, seed=0):
+    """
+        Function which generates seeded corpus of boards made by random walks from goal, for controlled difficulty.
+
+        Walk never undoes its previous move, so optimal solution of every board has at most depth moves (and
+        usually close to it for small depths).
+
+        :param count: (int) number of boards
+        :param depth: (int) number of moves in every walk
+        :param board_type: (BoardType) dimensions of boards (default TableState.DEFAULT_BOARD_TYPE)
+        :param seed: (int) seed of random generator, same seed gives same corpus
+        :return: (python list) list of TableState instances
+    """
+
+    rand = random.Random(seed)
+    corpus = []
+    for _ in xrange(count):
+        state = TableState.goal(board_type)
+        for _ in xrange(depth):
+            # move which undoes last one is never generated, so walk doesn't step straight back
+            state = rand.choice(state.generate_next_moves())
+        corpus.append(TableState(state.board, board_type=state.board_type))
+    return corpus
+
+
+def from_korf(tiles):
+    """
+        Function which converts 4x4 board from Korf's notation (blank is 0, goal has blank in top left corner,
+        tiles 1 to 15 after it) to board of this application.
+
+        Board is rotated by 180 degrees and every tile t is renamed to 16 - t. Both are symmetries of puzzle,
+        so optimal solution length (published with instances) stays same.
+
+        :param tiles: (python list) sixteen ints, in Korf's notation
+        :return: (TableState) same instance, in this application's notation
+    """
+
+    length = len(tiles)
+    return TableState([length - tile if tile else 0 for tile in reversed(tiles)],
+                      board_type=BoardType.for_length(length))
+
+
+def load_korf(path=KORF_FILE):
+    """
+        Function which loads instances in format in which Korf's 100 4x4 instances are usually distributed: one per
+        line, optional instance number, sixteen tiles in Korf's notation, then optional optimal solution length.
+
+        :param path: (string) path to file with instances (default Korf's 100 instances, see KORF_FILE)
+        :return: (python list) list of TableState instances
+    """
+
+    corpus = []
+    with open(path) as input_file:
+        for line in input_file:
+            numbers = [int(number) for number in line.split()]
+            if not numbers:
+                continue
+            if len(numbers) > 16:
+                numbers = numbers[1:17]
+            corpus.append(from_korf(numbers))
+    return corpus
+
+
+def parse_configuration(configuration):
+    """
+        Function which makes solve_puzzle keyword arguments from configuration name.
+
+        Name has format engine:heuristic, or engine:heuristic:queue (queue can be selected only for A*).
+
+        :param configuration: (string) configuration name, for example astar:linear_conflict:bucket
+        :return: (dict) keyword arguments for solve_puzzle
+
+        :raises: (ValueError) if configuration name isn't valid
+    """
+
+    parts = configuration.split(':')
+    if len(parts) not in (2, 3) or (len(parts) == 3 and (parts[0] != A_STAR or parts[2] not in QUEUES)):
+        raise ValueError('Invalid configuration: ' + configuration)
+
+    arguments = {'engine': parts[0], 'heuristic': parts[1]}
+    if len(parts) == 3:
+        arguments['queue'] = QUEUES[parts[2]]
+    return arguments
+
+
+def _run_configuration(task):
+    """
+        Helper function which solves whole corpus with one configuration (inside fresh worker process, so peak
+        resident memory belongs only to this configuration).
+
+        :param task: (tuple) (configuration name, list of (packed board, BoardType), max_nodes, timeout)
+        :return: (dict) measured results
+    """
+
+    configuration, boards, max_nodes, timeout = task
+    arguments = parse_configuration(configuration)
+    result = {'puzzles': len(boards), 'solved': 0, 'failed': 0, 'moves': 0, 'expanded': 0, 'generated': 0}
+
+    start = time.time()
+    for board, board_type in boards:
+        stats = SearchStats(timing=False)
+        try:
+            solution = solve_puzzle(TableState(board, board_type=board_type), max_nodes=max_nodes, timeout=timeout,
+                                    stats=stats, **arguments)
+            result['solved'] += 1
+            result['moves'] += len(solution)
+        except SearchLimitExceeded:
+            result['failed'] += 1
+        result['expanded'] += stats.expanded
+        result['generated'] += stats.generated
+    result['time'] = time.time() - start
+
+    result['nodes_per_second'] = result['expanded'] / result['time'] if result['time'] else 0.0
+    result['peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def run_benchmark(corpus, configurations=DEFAULT_CONFIGURATIONS, max_nodes=None, timeout=None):
+    """
+        Function which benchmarks every configuration on whole corpus.
+
+        Every configuration runs in its own fresh process, one after another (so they don't compete for cores).
+
+        :param corpus: (python list) TableState instances
+        :param configurations: (python list) configuration names (see parse_configuration)
+        :param max_nodes: (int) node limit for one puzzle (no limit if None)
+        :param timeout: (float) time limit for one puzzle, in seconds (no limit if None)
+        :return: (dict) results by configuration name: puzzles, solved, failed, moves (sum of solution lengths),
+            expanded, generated, time (seconds), nodes_per_second and peak_rss (kilobytes)
+
+        :raises: (ValueError) if some configuration name isn't valid
+    """
+
+    for configuration in configurations:
+        parse_configuration(configuration)
+
+    boards = [(state.board, state.board_type) for state in corpus]
+    results = {}
+    for configuration in configurations:
+        pool = Pool(1, maxtasksperchild=1)
+        try:
+            results[configuration] = pool.apply(_run_configuration, ((configuration, boards, max_nodes, timeout),))
+        finally:
+            pool.terminate()
+    return results
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+        Function which compares benchmark results with baseline, and finds regressions.
+
+        Configurations which aren't in both results are skipped, as are metrics of configurations which didn't
+        solve same number of puzzles (their sums aren't comparable, solved count itself is reported instead).
+
+        :param results: (dict) results of run_benchmark
+        :param baseline: (dict) earlier results of run_benchmark
+        :param tolerance: (float) allowed relative change in worse direction (0.1 is 10%)
+        :return: (python list) (configuration, metric, baseline value, current value) tuples, one per regression
+    """
+
+    regressions = []
+    for configuration in sorted(set(results) & set(baseline)):
+        current, previous = results[configuration], baseline[configuration]
+        if current['solved'] != previous['solved']:
+            if current['solved'] < previous['solved']:
+                regressions.append((configuration, 'solved', previous['solved'], current['solved']))
+            continue
+
+        for metric in sorted(METRICS):
+            if metric not in current or metric not in previous:
+                continue
+            if METRICS[metric]:
+                worse = current[metric] < previous[metric] * (1 - tolerance)
+            else:
+                worse = current[metric] > previous[metric] * (1 + tolerance)
+            if worse:
+                regressions.append((configuration, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def parse_arguments():
+    """ Function which parses command line arguments """
+
+    parser = argparse.ArgumentParser(description='15-puzzle solver benchmark')
+    parser.add_argument('configurations', nargs='*', default=DEFAULT_CONFIGURATIONS,
+                        help='configurations to benchmark, engine:heuristic or astar:heuristic:queue')
+    parser.add_argument('--count', type=int, default=20, help='number of generated boards')
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH,
+                        help='length of random walk which generates every board (default ' + str(DEFAULT_DEPTH) + ')')
+    parser.add_argument('--random', action='store_true',
+                        help='benchmark uniformly random boards instead of random walks (too hard for A* in '
+                             'reasonable time and memory, use --timeout or --max-nodes)')
+    parser.add_argument('--board', type=BoardType.parse, default=None, help='board dimensions (default 4x4)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of corpus generator')
+    parser.add_argument('--korf', nargs='?', const=KORF_FILE, default=None,
+                        help='benchmark Korf\'s 100 instances instead of generated corpus (or instances from given '
+                             'file, in same format)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='time limit for one puzzle, in seconds (default ' + str(DEFAULT_TIMEOUT) + ', 0 for no '
+                             'limit)')
+    parser.add_argument('--max-nodes', type=int, default=None, help='node limit for one puzzle')
+    parser.add_argument('--output', default=None, help='file to which results are written (JSON)')
+    parser.add_argument('--baseline', default=None, help='file with earlier results, to which results are compared')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='allowed relative regression (default 0.1)')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_arguments()
+
+    if args.korf:
+        benchmark_corpus = load_korf(args.korf)
+    elif args.random:
+        benchmark_corpus = random_corpus(args.count, args.board, args.seed)
+    else:
+        benchmark_corpus = walk_corpus(args.count, args.depth, args.board, args.seed)
+
+    benchmark_results = run_benchmark(benchmark_corpus, args.configurations, args.max_nodes, args.timeout or None)
+    for name in sorted(benchmark_results):
+        measured = benchmark_results[name]
+        print name + ': ' + str(measured['solved']) + '/' + str(measured['puzzles']) + ' solved, ' + \
+            str(measured['moves']) + ' moves, ' + format(measured['time'], '.2f') + ' s, ' + \
+            format(measured['nodes_per_second'], '.0f') + ' nodes/s, ' + str(measured['peak_rss']) + ' KB'
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(benchmark_results, output_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            found = compare(benchmark_results, json.load(baseline_file), args.tolerance)
+        for name, metric, before, after in found:
+            print 'Regression in ' + name + ': ' + metric + ' ' + str(before) + ' -> ' + str(after)
+        sys.exit(1 if found else 0)
@@ -0,0 +1,325 @@
+__author__ = 'Acko'
+
+import ctypes
+import traceback
+from multiprocessing import Event, Pipe, Process, RawArray, Value
+
+from application.Heap import Heap
+from application.SearchBudget import SearchBudget, SearchLimitExceeded
+from application.SearchStats import SearchStats
+from application.Solution import Solution
+from application.TableState import TableState
+
+
+class Frontier(object):
+    """
+        Class which represents one direction of bidirectional search (A* open and closed sets).
+
+        It remembers best known cost (g) for every reached state, and TableState instance which reached it
+        with that cost (so path back to root of this direction can be followed by undoing last moves).
+    """
+
+    def __init__(self, root, heuristic, stats=None):
+        """
+            Constructor, puts root state into open set.
+
+            :param root: (TableState) state from which this direction starts
+            :param heuristic: (function) estimate of distance from sent state to other direction's root
+            :param stats: (SearchStats) statistics in which generated and duplicate nodes are counted
+        """
+
+        root = TableState(root.board, board_type=root.board_type)
+        self.heuristic = heuristic
+        self.stats = stats or SearchStats(timing=False)
+        self.cost = {root: 0}
+        self.nodes = {root: root}
+        self.__open = Heap(Heap.HEAP_DOWN)
+        self.__open.add(heuristic(root), root)
+        self.__closed = {}
+
+    def __len__(self):
+        """ Overriding __len__, returns size of open set """
+
+        return len(self.__open)
+
+    def min_f(self):
+        """ Returns smallest f value in open set (infinity if open set is empty) """
+
+        return float('inf') if self.__open.is_empty() else self.__open.top()[0]
+
+    def pop(self):
+        """ Removes state with smallest f value from open set, and moves it to closed set """
+
+        state = self.__open.pop()[1]
+        self.__closed[state] = True
+        return state
+
+    def expand(self, state):
+        """
+            Generates children of sent (closed) state, and yields those which got better cost.
+
+            :param state: (TableState) state returned by pop()
+            :return: (generator) yields (TableState, int) pairs, child and its new cost
+        """
+
+        next_cost = self.cost[state] + 1
+        for next_state in state.generate_next_moves():
+            self.stats.generated += 1
+            if self.__closed.get(next_state) or self.cost.get(next_state, next_cost + 1) <= next_cost:
+                self.stats.duplicates += 1
+                continue
+
+            self.cost[next_state] = next_cost
+            self.nodes[next_state] = next_state
+            if self.__open.contains(next_state):
+                self.__open.decrease_key(next_state, next_cost + self.heuristic(next_state))
+            else:
+                self.__open.add(next_cost + self.heuristic(next_state), next_state)
+            yield next_state, next_cost
+
+    def path(self, state):
+        """ Returns moves which lead from root of this direction to sent state """
+
+        return Solution.backtrack(self.nodes[state], self.nodes)
+
+    def close(self):
+        """ Adds operation counters of open set to statistics """
+
+        self.stats.count_queue(self.__open)
+
+
+def _join(initial_state, forward_moves, backward_moves):
+    """
+        Helper function which joins two halves of solution into one.
+
+        :param initial_state: (TableState) state of puzzle which is solved
+        :param forward_moves: (string) moves from initial state to meeting state
+        :param backward_moves: (string) moves from final state to meeting state
+        :return: (Solution) whole solution (optimal, bound 1)
+    """
+
+    return_moves = ''.join(TableState.INVERSE[move] for move in reversed(backward_moves))
+    return Solution(initial_state, forward_moves + return_moves, 1.0)
+
+
+def _sequential_search(initial_state, heuristic, budget, stats):
+    """ Bidirectional A* in one process, direction with smaller open set is expanded first """
+
+    forward = Frontier(initial_state, stats.timed(heuristic), stats)
+    backward = Frontier(TableState.goal(initial_state.board_type),
+                        stats.timed(lambda state: state.manhattan_to(initial_state)), stats)
+
+    best, meeting = float('inf'), None
+    try:
+        while len(forward) and len(backward) and best > max(forward.min_f(), backward.min_f()):
+            frontier, other = (forward, backward) if len(forward) <= len(backward) else (backward, forward)
+
+            budget.spend()
+            stats.expand(len(forward) + len(backward), len(forward.cost) + len(backward.cost))
+            for next_state, cost in frontier.expand(frontier.pop()):
+                other_cost = other.cost.get(next_state)
+                if other_cost is not None and cost + other_cost < best:
+                    best, meeting = cost + other_cost, next_state
+    finally:
+        forward.close()
+        backward.close()
+
+    if meeting is None:
+        return None
+    return _join(initial_state, forward.path(meeting), backward.path(meeting))
+
+
+class SharedStateSet(object):
+    """
+        Class which represents hash set of packed boards (with their costs) in shared memory.
+
+        Set uses open addressing with linear probing over two arrays (keys and costs), home slot is taken from
+        high bits of 64-bit product of board and golden ratio constant (Fibonacci hashing, so every tile changes
+        it). Only one process writes to the set, others just read it, so it needs no locks: cost is always written
+        before key, so reader which finds key also finds its cost. Reader reads every key only once, because
+        writer can fill empty slot between two reads. Empty slot is marked with 0 (board can't be 0).
+    """
+
+    __MAX_LOAD__ = 0.9
+
+    def __init__(self, bits):
+        """
+            Constructor, allocates shared arrays.
+
+            :param bits: (int) set has 2 ** bits slots
+        """
+
+        self.__mask = (1 << bits) - 1
+        self.__shift = 64 - bits
+        self.__keys = RawArray(ctypes.c_uint64, 1 << bits)
+        self.__costs = RawArray(ctypes.c_uint16, 1 << bits)
+        self.__size = 0
+
+    def __slot(self, board):
+        """ Helper method which returns slot where board is, or should be, stored """
+
+        keys, mask = self.__keys, self.__mask
+        slot = ((board * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self.__shift
+        while keys[slot] and keys[slot] != board:
+            slot = (slot + 1) & mask
+        return slot
+
+    def put(self, board, cost):
+        """
+            Stores board with its cost (or updates cost of already stored board).
+
+            :raises: (SearchLimitExceeded) if set is full
+        """
+
+        slot = self.__slot(board)
+        if not self.__keys[slot]:
+            self.__size += 1
+            if self.__size > self.__MAX_LOAD__ * (self.__mask + 1):
+                raise SearchLimitExceeded('Shared state set is full')
+        self.__costs[slot] = cost
+        self.__keys[slot] = board
+
+    def get(self, board):
+        """ Returns cost of stored board, or None if board is not in set (called by processes which don't write) """
+
+        keys, mask = self.__keys, self.__mask
+        slot = ((board * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self.__shift
+        while True:
+            key = keys[slot]
+            if not key:
+                return None
+            if key == board:
+                return self.__costs[slot]
+            slot = (slot + 1) & mask
+
+
+def _direction_worker(direction, root, heuristic, budget, sets, bounds, best, meeting, stop, connection):
+    """
+        Function which runs one direction of parallel bidirectional search, inside its own process.
+
+        Reached states are published in own shared set, and looked up in set of other direction. Process stops
+        when best meeting cost is not bigger than largest of two published minimal f values. Then it reports
+        to parent process, waits for final meeting state and sends its half of the path. Exception raised on the
+        way is sent to parent process instead (RuntimeError with its traceback, if it can't be pickled).
+    """
+
+    own, other = sets[direction], sets[1 - direction]
+
+    def meet(state, cost):
+        other_cost = other.get(state.board)
+        if other_cost is not None:
+            with best.get_lock():
+                if cost + other_cost < best.value:
+                    best.value, meeting.value = cost + other_cost, state.board
+
+    try:
+        frontier = Frontier(root, heuristic)
+        own.put(root.board, 0)
+        meet(root, 0)
+        while not stop.is_set():
+            bounds[direction] = frontier.min_f()
+            if best.value <= max(bounds[0], bounds[1]):
+                break
+
+            budget.spend()
+            state = frontier.pop()
+            meet(state, frontier.cost[state])
+            for next_state, cost in frontier.expand(state):
+                own.put(next_state.board, cost)
+                meet(next_state, cost)
+
+        stop.set()
+        connection.send(None)
+        connection.send(frontier.path(TableState(connection.recv(), board_type=root.board_type)))
+    except Exception as e:
+        stop.set()
+        message = traceback.format_exc()
+        try:
+            connection.send(e)
+        except Exception:
+            connection.send(RuntimeError(message))
+
+
+def _parallel_search(initial_state, heuristic, budget, table_bits):
+    """ Bidirectional A* where every direction runs in its own process, meeting through shared state sets """
+
+    board_type = initial_state.board_type
+    if board_type.bits * board_type.length > 64:
+        raise ValueError('Parallel bidirectional search supports only boards which fit in 64 bits')
+
+    sets = [SharedStateSet(table_bits), SharedStateSet(table_bits)]
+    bounds = RawArray(ctypes.c_double, [0.0, 0.0])
+    best, meeting, stop = Value(ctypes.c_double, float('inf')), Value(ctypes.c_uint64, 0, lock=False), Event()
+
+    roots = [(initial_state, heuristic), (TableState.goal(board_type), lambda state: state.manhattan_to(initial_state))]
+    connections, processes = [], []
+    for direction, (root, direction_heuristic) in enumerate(roots):
+        parent_end, child_end = Pipe()
+        process = Process(target=_direction_worker, args=(direction, root, direction_heuristic, budget, sets,
+                                                          bounds, best, meeting, stop, child_end))
+        process.daemon = True
+        process.start()
+        child_end.close()
+        connections.append(parent_end)
+        processes.append(process)
+
+    def receive_all():
+        results = []
+        for connection in connections:
+            try:
+                results.append(connection.recv())
+            except EOFError:
+                results.append(RuntimeError('Worker process stopped unexpectedly'))
+        # crash of one worker is reported even if other one only stopped because of it
+        errors = sorted((result for result in results if isinstance(result, Exception)),
+                        key=lambda error: isinstance(error, SearchLimitExceeded))
+        if errors:
+            raise errors[0]
+        return results
+
+    try:
+        receive_all()
+        for connection in connections:
+            connection.send(meeting.value)
+        forward_moves, backward_moves = receive_all()
+    finally:
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+
+    return _join(initial_state, forward_moves, backward_moves)
+
+
+def bidirectional_search(initial_state, heuristic=TableState.manhattan, budget=None, parallel=False, table_bits=22,
+                         stats=None):
+    """
+        Front-to-end bidirectional A* search.
+
+        One A* runs forward from initial state (using sent heuristic), and other one backwards from final state
+        (using manhattan distance to initial state). Every reached state is checked against other direction,
+        best meeting cost is remembered, and search stops when it is not bigger than largest of two minimal
+        f values in open sets. With consistent heuristic returned solution is optimal.
+
+        In parallel mode every direction runs in its own process, and reached states are shared through
+        hash sets in shared memory.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+        :param budget: (SearchBudget) limits for search (in parallel mode applied to every direction separately)
+        :param parallel: (boolean) True if directions should run in separate processes
+        :param table_bits: (int) in parallel mode, every shared set has 2 ** table_bits slots
+        :param stats: (SearchStats) statistics which engine should update (collected only in sequential mode,
+            closed set size is number of states reached by both directions)
+        :return: (Solution) found solution
+
+        :raises: (SearchLimitExceeded) if budget is spent (or shared set is full) before solution is found, with
+            parallel=True error of worker process is raised again (RuntimeError if worker exits unexpectedly)
+    """
+
+    budget = budget or SearchBudget()
+    if initial_state.is_final():
+        return Solution(initial_state, '', 1.0)
+    if parallel:
+        return _parallel_search(initial_state, heuristic, budget, table_bits)
+    return _sequential_search(initial_state, heuristic, budget, stats or SearchStats(timing=False))
@@ -0,0 +1,222 @@
+__author__ = 'Acko'
+
+import heapq
+import os
+import shutil
+import tempfile
+
+from application.SearchBudget import SearchBudget
+from application.SearchStats import SearchStats
+from application.Solution import Solution
+from application.TableState import TableState
+
+
+def _encode(board, width):
+    """ Helper function which makes fixed width big endian record of packed board (records sort like boards) """
+
+    return ('%0*x' % (2 * width, board)).decode('hex')
+
+
+def _decode(record):
+    """ Helper function, inverse of _encode """
+
+    return int(record.encode('hex'), 16)
+
+
+def _records(path, width, buffer_size):
+    """ Helper function which reads records of file sequentially, in big blocks (generator of strings) """
+
+    block_size = max(width, buffer_size - buffer_size % width)
+    with open(path, 'rb') as input_file:
+        for block in iter(lambda: input_file.read(block_size), ''):
+            for i in xrange(0, len(block), width):
+                yield block[i:i + width]
+
+
+def _write_run(path, boards, width, buffer_size):
+    """
+        Helper function which writes boards to file as sorted records, without duplicates.
+
+        :return: (int) number of written records
+    """
+
+    records = sorted(set(_encode(board, width) for board in boards))
+    with open(path, 'wb', buffer_size) as output:
+        for i in xrange(0, len(records), buffer_size // width or 1):
+            output.write(''.join(records[i:i + (buffer_size // width or 1)]))
+    return len(records)
+
+
+def _merge_layer(runs, previous, path, width, buffer_size):
+    """
+        Helper function which merges sorted runs into one layer file (delayed duplicate detection).
+
+        Runs and previous layer are all sorted, so records are streamed: duplicates inside new layer are next to
+        each other after merge, and previous layer is walked once, side by side with merged records. Every move
+        of sliding puzzle changes parity of distance from root, so children of layer can't be in any layer
+        before previous one, and only previous layer must be subtracted.
+
+        :param runs: (python list) paths of sorted run files
+        :param previous: (string) path of previous layer (None for first layer)
+        :param path: (string) path of new layer file
+        :param width: (int) size of one record, in bytes
+        :param buffer_size: (int) size of read and write buffers, in bytes
+        :return: (tuple) (number of records in layer, number of removed duplicates)
+    """
+
+    older = _records(previous, width, buffer_size) if previous else iter(())
+    old = next(older, None)
+    count, duplicates, last = 0, 0, None
+
+    with open(path, 'wb', buffer_size) as output:
+        for record in heapq.merge(*[_records(run, width, buffer_size) for run in runs]):
+            if record == last:
+                duplicates += 1
+                continue
+            last = record
+
+            while old is not None and old < record:
+                old = next(older, None)
+            if record == old:
+                duplicates += 1
+                continue
+
+            output.write(record)
+            count += 1
+    return count, duplicates
+
+
+def _contains(path, record):
+    """ Helper function which checks if sorted layer file contains record, by binary search over file """
+
+    width = len(record)
+    with open(path, 'rb') as input_file:
+        low, high = 0, os.path.getsize(path) // width
+        while low < high:
+            middle = (low + high) // 2
+            input_file.seek(middle * width)
+            stored = input_file.read(width)
+            if stored == record:
+                return True
+            if stored < record:
+                low = middle + 1
+            else:
+                high = middle
+    return False
+
+
+def _trace(layers, goal, width):
+    """
+        Helper function which finds path from root to goal, going back through layers: in every layer there is
+        neighbour of current state (found by binary search in layer file).
+
+        :param layers: (python list) paths of layer files, root layer first (goal is one layer after last one)
+        :param goal: (TableState) reached final state
+        :param width: (int) size of one record, in bytes
+        :return: (string) moves from root to goal
+    """
+
+    moves = []
+    state = goal
+    for layer in reversed(layers):
+        fresh = TableState(state.board, board_type=state.board_type)
+        for previous_state in fresh.generate_next_moves():
+            if _contains(layer, _encode(previous_state.board, width)):
+                moves.append(TableState.INVERSE[previous_state.last_move])
+                state = previous_state
+                break
+    return ''.join(reversed(moves))
+
+
+def external_search(initial_state, heuristic=TableState.manhattan, budget=None, directory=None, chunk_size=1 << 20,
+                    buffer_size=1 << 20, stats=None):
+    """
+        Breadth-first heuristic search in external memory, for searches whose states don't fit in memory.
+
+        Search runs breadth-first, layer by layer, and every layer is file of sorted packed boards. Layer is
+        read sequentially, and children whose f value is within bound are collected in memory until there are
+        chunk_size of them, then they are sorted and written as run file. Runs are merged into next layer, and
+        duplicates (also those in previous layer) are removed during merge, so nothing but one chunk is ever held
+        in memory. When layer can't reach goal within bound, search starts again with smallest f value which was
+        cut off (like IDA*). With consistent heuristic every state is stored in layer of its distance, and
+        returned solution is optimal. Path is traced back through layer files, which are removed at the end.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) consistent heuristic (lambda state: 0 makes plain breadth-first search)
+        :param budget: (SearchBudget) limits for search
+        :param directory: (string) directory in which layer files are made (default system temporary directory)
+        :param chunk_size: (int) number of boards sorted in memory at once
+        :param buffer_size: (int) size of read and write buffers, in bytes
+        :param stats: (SearchStats) statistics which engine should update (open set is layer being expanded,
+            closed set is all records on disk)
+        :return: (Solution) found solution, with bound 1
+
+        :raises: (SearchLimitExceeded) if budget is spent before solution is found
+    """
+
+    budget = budget or SearchBudget()
+    stats = stats or SearchStats(timing=False)
+    heuristic = stats.timed(heuristic)
+    initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+    if initial_state.is_final():
+        return Solution(initial_state, '', 1.0)
+
+    board_type = initial_state.board_type
+    width = (board_type.bits * board_type.length + 7) // 8
+    work = tempfile.mkdtemp(prefix='puzzle-layers-', dir=directory)
+
+    try:
+        bound = heuristic(initial_state)
+        while bound != float('inf'):
+            stats.iterations += 1
+            layers = [os.path.join(work, 'layer-0')]
+            size = stored = _write_run(layers[0], [initial_state.board], width, buffer_size)
+            next_bound, goal = float('inf'), None
+
+            while size and goal is None:
+                depth = len(layers) - 1
+                runs, chunk = [], []
+                for record in _records(layers[depth], width, buffer_size):
+                    state = TableState(_decode(record), board_type=board_type)
+                    budget.spend()
+                    stats.expand(size, stored)
+
+                    for next_state in state.generate_next_moves():
+                        stats.generated += 1
+                        f = depth + 1 + heuristic(next_state)
+                        if f > bound:
+                            next_bound = min(next_bound, f)
+                            continue
+                        if next_state.is_final():
+                            goal = next_state
+                            break
+                        chunk.append(next_state.board)
+
+                    if goal is not None:
+                        break
+                    if len(chunk) >= chunk_size:
+                        runs.append(os.path.join(work, 'run-' + str(len(runs))))
+                        stats.duplicates += len(chunk) - _write_run(runs[-1], chunk, width, buffer_size)
+                        chunk = []
+
+                if goal is None:
+                    if chunk:
+                        runs.append(os.path.join(work, 'run-' + str(len(runs))))
+                        stats.duplicates += len(chunk) - _write_run(runs[-1], chunk, width, buffer_size)
+                    layers.append(os.path.join(work, 'layer-' + str(depth + 1)))
+                    size, duplicates = _merge_layer(runs, layers[depth - 1] if depth else None, layers[-1], width,
+                                                    buffer_size)
+                    stats.duplicates += duplicates
+                    stored += size
+                for run in runs:
+                    os.remove(run)
+
+            if goal is not None:
+                return Solution(initial_state, _trace(layers, goal, width), 1.0)
+            for layer in layers:
+                os.remove(layer)
+            bound = next_bound
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    return None
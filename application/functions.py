@@ -1,6 +1,16 @@
 __author__ = 'Acko'
 
+from importlib import import_module
+from threading import Semaphore
+
+from application.ClosedSet import DictionaryClosedSet
 from application.Heap import Heap
+from application.HeuristicCache import HeuristicCache
+from application.SearchBudget import SearchBudget, SearchLimitExceeded
+from application.SearchStats import SearchStats
+from application.Solution import Solution
+from application.TableState import TableState
+from application.heuristics import HEURISTICS, get_heuristic
 
 
 class NotSolvablePuzzle(Exception):
@@ -9,56 +19,588 @@ class NotSolvablePuzzle(Exception):
     pass
 
 
-def solve_puzzle(initial_state):
+def greedy_search(initial_state, heuristic=TableState.manhattan, budget=None, closed_set=DictionaryClosedSet,
+                  stats=None):
+    """
+        Greedy best-first search, nodes are ordered only by their heuristic value.
+
+        It is fastest engine, but ignores path cost, so returned solution can be far from optimal.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+        :param budget: (SearchBudget) limits for search, unlimited if not sent
+        :param closed_set: (class) closed set class (or factory called with board type), from ClosedSet module
+        :param stats: (SearchStats) statistics which engine should update (not collected if not sent)
+        :return: (Solution) found solution
+
+        :raises: (SearchLimitExceeded) if budget is spent (or closed set is full) before solution is found
+    """
+
+    budget = budget or SearchBudget()
+    stats = stats or SearchStats(timing=False)
+    heuristic = stats.timed(heuristic)
+    initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+    priority_queue = Heap(Heap.HEAP_DOWN)
+    priority_queue.add(heuristic(initial_state), initial_state)
+
+    already_checked = closed_set(initial_state.board_type)
+    try:
+        while not priority_queue.is_empty():
+            current_state = priority_queue.pop()[1]
+
+            if current_state.is_final():
+                return Solution(initial_state, already_checked.path(initial_state, current_state))
+
+            already_checked.add(current_state)
+            budget.spend()
+            stats.expand(len(priority_queue), len(already_checked))
+
+            for next_state in current_state.generate_next_moves():
+                stats.generated += 1
+                if next_state in already_checked or priority_queue.contains(next_state):
+                    stats.duplicates += 1
+                    continue
+                priority_queue.add(heuristic(next_state), next_state)
+    finally:
+        already_checked.close()
+        stats.count_queue(priority_queue)
+
+    return None
+
+
+def a_star_search(initial_state, heuristic=TableState.manhattan, queue=Heap, budget=None,
+                  closed_set=DictionaryClosedSet, stats=None):
+    """
+        A* search, nodes are ordered by f = g + h, where g is number of moves made from initial state.
+
+        When state which is still in priority queue is reached with better g than before, its entry is
+        replaced (it gets better key and new last move). With admissible heuristic returned solution is optimal.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+        :param queue: (class) priority queue class used for open set, Heap or BucketQueue
+        :param budget: (SearchBudget) limits for search, unlimited if not sent
+        :param closed_set: (class) closed set class (or factory called with board type), from ClosedSet module,
+            approximate (BloomClosedSet) one breaks optimality
+        :param stats: (SearchStats) statistics which engine should update (not collected if not sent)
+        :return: (Solution) found solution, with bound 1
+
+        :raises: (SearchLimitExceeded) if budget is spent (or closed set is full) before solution is found
+    """
+
+    budget = budget or SearchBudget()
+    stats = stats or SearchStats(timing=False)
+    heuristic = stats.timed(heuristic)
+    initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+    priority_queue = queue()
+    priority_queue.add(heuristic(initial_state), initial_state)
+
+    best_cost = {initial_state: 0}
+    already_checked = closed_set(initial_state.board_type)
+    try:
+        while not priority_queue.is_empty():
+            current_state = priority_queue.pop()[1]
+
+            if current_state.is_final():
+                return Solution(initial_state, already_checked.path(initial_state, current_state), 1.0)
+
+            already_checked.add(current_state)
+            budget.spend()
+            stats.expand(len(priority_queue), len(already_checked))
+
+            next_cost = best_cost[current_state] + 1
+            for next_state in current_state.generate_next_moves():
+                stats.generated += 1
+                if next_state in already_checked or best_cost.get(next_state, next_cost + 1) <= next_cost:
+                    stats.duplicates += 1
+                    continue
+
+                best_cost[next_state] = next_cost
+                if priority_queue.contains(next_state):
+                    priority_queue.decrease_key(next_state, next_cost + heuristic(next_state))
+                else:
+                    priority_queue.add(next_cost + heuristic(next_state), next_state)
+    finally:
+        already_checked.close()
+        stats.count_queue(priority_queue)
+
+    return None
+
+
+def ida_star_search(initial_state, heuristic=TableState.manhattan, budget=None, stats=None):
+    """
+        Iterative deepening A* search.
+
+        Runs depth first searches bounded by f = g + h threshold, every next iteration uses smallest f value
+        which exceeded previous threshold. Only current path is kept in memory, so memory used is
+        proportional to solution length (open set size in statistics is current depth). With admissible
+        heuristic returned solution is optimal.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+        :param budget: (SearchBudget) limits for search, unlimited if not sent
+        :param stats: (SearchStats) statistics which engine should update (not collected if not sent)
+        :return: (Solution) found solution, with bound 1
+
+        :raises: (SearchLimitExceeded) if budget is spent before solution is found
+    """
+
+    budget = budget or SearchBudget()
+    stats = stats or SearchStats(timing=False)
+    heuristic = stats.timed(heuristic)
+    initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+
+    def search(state, cost, threshold, on_path, moves):
+        f = cost + heuristic(state)
+        if f > threshold:
+            return False, f
+        if state.is_final():
+            return True, f
+
+        budget.spend()
+        stats.expand(cost, len(on_path))
+        next_threshold = float('inf')
+        on_path[state] = True
+        for next_state in state.generate_next_moves():
+            stats.generated += 1
+            if on_path.get(next_state):
+                stats.duplicates += 1
+                continue
+            moves.append(next_state.last_move)
+            found, bound = search(next_state, cost + 1, threshold, on_path, moves)
+            if found:
+                return True, bound
+            moves.pop()
+            next_threshold = min(next_threshold, bound)
+        del on_path[state]
+
+        return False, next_threshold
+
+    threshold = heuristic(initial_state)
+    while threshold != float('inf'):
+        stats.iterations += 1
+        moves = []
+        found, threshold = search(initial_state, 0, threshold, {}, moves)
+        if found:
+            return Solution(initial_state, ''.join(moves), 1.0)
+
+    return None
+
+
+def _remove_cycles(initial_state, moves):
+    """
+        Helper function which removes cycles from path: when state repeats, moves made since its first visit are
+        dropped. States on kept path are indexed by their packed boards, so it takes one pass.
+
+        :param initial_state: (TableState) state from which path starts
+        :param moves: (string) moves of path
+        :return: (string) moves of path without cycles
+    """
+
+    boards, kept = [initial_state.board], []
+    index = {initial_state.board: 0}
+    state = initial_state
+    for direction in moves:
+        state = state.move(direction)
+        position = index.get(state.board)
+        if position is None:
+            index[state.board] = len(boards)
+            boards.append(state.board)
+            kept.append(direction)
+            continue
+
+        for board in boards[position + 1:]:
+            del index[board]
+        del boards[position + 1:]
+        del kept[position:]
+    return ''.join(kept)
+
+
+def _local_path(start, target, limit, budget):
+    """
+        Helper function which finds optimal path between two states of same board, if it is shorter than limit.
+
+        It is IDA* over packed boards, with manhattan distance to target updated incrementally from tile which
+        moved, and moves read from move tables of board type (move which undoes last one is not made).
+
+        :param start: (TableState) state from which path starts
+        :param target: (TableState) state where path ends
+        :param limit: (int) length of known path, only shorter paths are searched for
+        :param budget: (SearchBudget) limits for search
+        :return: (string) moves of optimal path, or None if there is no path shorter than limit
+
+        :raises: (SearchLimitExceeded) if budget is spent before search is finished
+    """
+
+    board_type = start.board_type
+    bits, mask, columns, neighbours = board_type.bits, board_type.mask, board_type.columns, board_type.neighbours
+    where = [0] * board_type.length
+    for position, tile in enumerate(target.tiles()):
+        where[tile] = position
+    costs = [[abs(position // columns - where[tile] // columns) + abs(position % columns - where[tile] % columns)
+              if tile else 0 for tile in xrange(board_type.length)] for position in xrange(board_type.length)]
+    target_board = target.board
+    moves = []
+
+    def search(board, blank, cost, estimate, last_move, threshold):
+        if cost + estimate > threshold:
+            return cost + estimate
+        if board == target_board:
+            return -1
+
+        budget.spend()
+        next_threshold = float('inf')
+        for position, direction in neighbours[last_move][blank]:
+            shift = position * bits
+            tile = (board >> shift) & mask
+            moves.append(direction)
+            bound = search(board ^ (tile << shift) ^ (tile << (blank * bits)), position, cost + 1,
+                           estimate - costs[position][tile] + costs[blank][tile], direction, threshold)
+            if bound < 0:
+                return bound
+            moves.pop()
+            next_threshold = min(next_threshold, bound)
+        return next_threshold
+
+    estimate = sum(costs[position][tile] for position, tile in enumerate(start.tiles()))
+    threshold = estimate
+    while threshold < limit:
+        threshold = search(start.board, start.blank, 0, estimate, None, threshold)
+        if threshold < 0:
+            return ''.join(moves)
+    return None
+
+
+def shorten_solution(solution, window=16, max_nodes=2000, passes=10, budget=None):
     """
-        Function which finds 15-puzzle solution, based on A* algorithm.
+        Function which shortens solution found by non-optimal engine (for example greedy one).
 
-        Each move is represented with TableState instance, priority_queue used for A* algorithm is actually heap,
+        First cycles are removed (path which returns to already visited state), then path is split into windows of
+        given number of moves, and every window is replaced with optimal path between its first and last state,
+        found by bounded local IDA* (window whose search exceeds max_nodes is kept). Every other pass shifts windows
+        by half of their length, so improvements across their borders are found too. Passes stop when one of them
+        shortens nothing (and windows of its shift were already tried), so cost is only few small searches per
+        window, while solutions get much closer to optimal ones.
+
+        Deadline and cancellation of caller's budget are checked before every window (and during its search), when
+        they expire remaining windows are kept as they are, and path shortened so far is returned.
+
+        :param solution: (Solution) found solution
+        :param window: (int) number of moves in one window
+        :param max_nodes: (int) node limit of search in one window
+        :param passes: (int) maximal number of passes over whole path
+        :param budget: (SearchBudget) budget of search which found solution (its node limit is not used)
+        :return: (Solution) shortened solution (with same bound, as it can only get shorter)
+    """
+
+    deadline, cancelled = (budget.deadline, budget.cancelled) if budget is not None else (None, None)
+    initial_state = solution.initial_state
+    moves = _remove_cycles(initial_state, solution.moves)
+    unchanged = 0
+    expired = False
+    for pass_number in xrange(passes):
+        states = list(Solution(initial_state, moves).states())
+        offset = (pass_number % 2) * (window // 2)
+        borders = sorted(set([0, len(moves)] + range(offset or window, len(moves), window)))
+
+        parts = []
+        for start, end in zip(borders, borders[1:]):
+            shorter = None
+            expired = expired or (budget is not None and budget.expired())
+            if end - start > 1 and not expired:
+                try:
+                    shorter = _local_path(states[start], states[end], end - start,
+                                          SearchBudget(max_nodes, deadline=deadline, cancelled=cancelled))
+                except SearchLimitExceeded:
+                    pass
+            parts.append(moves[start:end] if shorter is None else shorter)
+
+        shortened = _remove_cycles(initial_state, ''.join(parts))
+        unchanged = unchanged + 1 if len(shortened) == len(moves) else 0
+        moves = shortened
+        if unchanged == 2 or expired:
+            break
+
+    return Solution(initial_state, moves, solution.bound)
+
+
+""" Available search engines, one of these keys can be sent to solve_puzzle """
+GREEDY, A_STAR, IDA_STAR, BIDIRECTIONAL = 'greedy', 'astar', 'idastar', 'bidirectional'
+WEIGHTED_A_STAR, ARA_STAR = 'wastar', 'arastar'
+DISTANCE_TABLE, HDA_STAR, EXTERNAL = 'table', 'hdastar', 'external'
+
+""" Engines whose solutions are optimal with every admissible heuristic (and don't depend on engine options) """
+OPTIMAL_ENGINES = frozenset([A_STAR, IDA_STAR, BIDIRECTIONAL, DISTANCE_TABLE, HDA_STAR, EXTERNAL])
+
+
+def _lazy_engine(module, name):
+    """
+        Helper function which returns engine whose module is imported only when engine is first used, so short-lived
+        processes don't pay for modules (and multiprocessing machinery) they don't need.
+
+        :param module: (string) name of module which contains engine
+        :param name: (string) name of engine function in that module
+        :return: (function) function which calls engine
+    """
+
+    def engine(*arguments, **options):
+        return getattr(import_module(module), name)(*arguments, **options)
+
+    engine.__name__ = name
+    return engine
+
+
+ENGINES = {
+    GREEDY: greedy_search,
+    A_STAR: a_star_search,
+    IDA_STAR: ida_star_search,
+    BIDIRECTIONAL: _lazy_engine('application.bidirectional', 'bidirectional_search'),
+    WEIGHTED_A_STAR: _lazy_engine('application.anytime', 'weighted_a_star_search'),
+    ARA_STAR: _lazy_engine('application.anytime', 'ara_star_search'),
+    DISTANCE_TABLE: _lazy_engine('application.DistanceTable', 'table_search'),
+    HDA_STAR: _lazy_engine('application.parallel', 'hda_star_search'),
+    EXTERNAL: _lazy_engine('application.external', 'external_search')
+}
+
+
+def _cache_namespace(engine, heuristic, shorten_window, options):
+    """
+        Helper function which returns namespace of solve_puzzle in SolutionCache.
+
+        Solutions of optimal engines are interchangeable, so engine name is enough. Solutions of other engines
+        depend on heuristic, weight and step too, so those are part of namespace, and solutions of heuristic which
+        has no name (is not in heuristics.HEURISTICS) are not cached at all.
+
+        :param engine: (string) key from ENGINES
+        :param heuristic: (function|string) heuristic sent to solve_puzzle
+        :param shorten_window: (int) window of shorten_solution (None if solutions are not shortened)
+        :param options: (dict) engine specific arguments sent to solve_puzzle
+        :return: (string) namespace, or None if solution must not be cached
+    """
+
+    if engine in OPTIMAL_ENGINES:
+        return engine
+
+    if not isinstance(heuristic, basestring):
+        names = [name for name, function in HEURISTICS.items() if function == heuristic]
+        if len(names) != 1:
+            return None
+        heuristic = names[0]
+
+    namespace = engine + ':' + heuristic
+    for option in ('weight', 'step'):
+        if option in options:
+            namespace += ':' + option + '=' + repr(float(options[option]))
+    # shortened solutions are cached apart, so they are never mixed with raw ones
+    if shorten_window:
+        namespace += ':shortened=' + str(shorten_window)
+    return namespace
+
+
+def solve_puzzle(initial_state, engine=GREEDY, heuristic=TableState.manhattan, max_nodes=None, timeout=None,
+                 cache=None, deadline=None, stats=None, cancelled=None, shorten_window=None, heuristic_cache=None,
+                 **options):
+    """
+        Function which finds 15-puzzle solution, using one of the search engines from ENGINES.
+
+        Each move is represented with TableState instance, priority_queue used by engines is actually heap,
         and list of already checked nodes (moves) is actually dictionary (can do this because of overloaded __hash__
-        method in TableState).
+        method in TableState). Found solution is returned as compact string of moves (Solution instance).
 
         :param initial_state: (TableState) state of puzzle which should be solved
-        :return: (TableState) state of solved puzzle (with parent information which can lead to starting point)
+        :param engine: (string) key from ENGINES, GREEDY (fast, not optimal), A_STAR, IDA_STAR, BIDIRECTIONAL,
+            HDA_STAR (optimal, parallel A* over all cores), EXTERNAL (optimal, layers kept on disk), WEIGHTED_A_STAR
+            (bounded suboptimal), ARA_STAR (anytime, returns best solution found before limits are exceeded) or
+            DISTANCE_TABLE (optimal, read from table of all states of small board)
+        :param heuristic: (function|string) function which returns heuristic value for sent TableState (for example
+            loaded PatternDatabase instance), or name of one from heuristics.HEURISTICS
+        :param max_nodes: (int) maximal number of nodes engine can expand (no limit if None)
+        :param timeout: (float) maximal number of seconds engine can run (no limit if None)
+        :param cache: (SolutionCache) cache of solutions, when initial state (or its mirror) is found in it, stored
+            moves are replayed without search, otherwise found solution is stored in it (namespace is engine name,
+            with heuristic and options of engines which are not optimal, see _cache_namespace)
+        :param deadline: (float) time (as returned by time.time) when engine must stop (no limit if None)
+        :param stats: (SearchStats) statistics of search, filled by engine (nothing is counted for cached solutions)
+        :param cancelled: (function) polled during search, search stops when it returns True (see SearchBudget)
+        :param shorten_window: (int) if sent, solutions of engines which are not optimal are shortened by
+            shorten_solution, with windows of this many moves (within same timeout, deadline and cancellation)
+        :param heuristic_cache: (int) if sent, heuristic values are memoized in HeuristicCache of this size, shared
+            by all searches of this process (its hits and misses are counted in stats)
+        :param options: (dict) additional engine specific arguments (for example queue for A_STAR, parallel
+            for BIDIRECTIONAL, workers for HDA_STAR, or directory for EXTERNAL)
+        :return: (Solution) found solution (its bound tells how far from optimal it can be, if it is known)
+
+        :raises: (NotSolvablePuzzle) if puzzle can't be solved, (ValueError) if engine or heuristic is unknown,
+            (SearchLimitExceeded) if limits are exceeded before solution is found
     """
 
+    if engine not in ENGINES:
+        raise ValueError('Unknown search engine: ' + str(engine))
+    namespace = _cache_namespace(engine, heuristic, shorten_window, options) if cache is not None else None
+    heuristic = get_heuristic(heuristic)
+
     if not initial_state.is_solvable():
         raise NotSolvablePuzzle("Puzzle not solvable!")
 
-    priority_queue = Heap(Heap.HEAP_DOWN)
-    priority_queue.add(initial_state.manhattan(), initial_state)
+    counters = None
+    if heuristic_cache:
+        heuristic = HeuristicCache.get(heuristic, heuristic_cache)
+        counters = heuristic.counters()
 
-    already_checked = {}
+    if stats is not None:
+        stats.begin(engine)
+        options['stats'] = stats
 
-    current_state = None
-    while not priority_queue.is_empty():
-        current_state = priority_queue.pop()[1]
+    solution = None
+    try:
+        if namespace is not None:
+            solution = cache.get_solution(initial_state, namespace)
+            if solution is not None:
+                return solution
 
-        if current_state.is_final():
-            break
+        budget = SearchBudget(max_nodes, timeout, deadline, cancelled)
+        solution = ENGINES[engine](initial_state, heuristic, budget=budget, **options)
+        if shorten_window and solution is not None and solution.bound != 1:
+            solution = shorten_solution(solution, shorten_window, budget=budget)
+            # solution shortened only partly (limits expired) could be improved by later call, so it is not cached
+            if budget.expired():
+                namespace = None
+    finally:
+        if stats is not None:
+            if counters is not None:
+                stats.count_cache(heuristic, counters)
+            stats.end(solution)
 
-        already_checked[current_state] = True
+    # anytime search stopped by limits returns solution which later (longer) search could improve
+    if namespace is not None and solution is not None and not (engine == ARA_STAR and solution.bound > 1):
+        cache.put(initial_state, solution.moves, namespace, solution.bound)
+    return solution
 
-        for next_state in current_state.generate_next_moves():
-            if already_checked.get(next_state):
-                continue
-            priority_queue.add(next_state.manhattan(), next_state)
 
-    return current_state
+def filter_solvable(states, board_type=None):
+    """
+        Function which screens many puzzles and yields only solvable ones (lazily, so input can be bigger than
+        memory). Packed boards are checked without making TableState instances.
+
+        :param states: (iterable) TableState instances, or packed boards
+        :param board_type: (BoardType) type of packed boards (default TableState.DEFAULT_BOARD_TYPE)
+        :return: (generator) yields solvable items, as they were sent
+    """
+
+    board_type = board_type or TableState.DEFAULT_BOARD_TYPE
+    for state in states:
+        if isinstance(state, TableState):
+            if state.is_solvable():
+                yield state
+        elif board_type.is_solvable(state):
+            yield state
+
+
+def _solve_one(task):
+    """
+        Helper function which solves one puzzle inside worker process.
 
+        Puzzles are sent between processes as packed boards (with their board types), and solutions as
+        strings of moves (with their bounds). Puzzles rejected before solving are sent only to keep their
+        place in stream of results, with error message instead of board.
 
-def print_results(final_state):
+        :param task: (tuple) (index, packed board or error message, BoardType or None, solve_puzzle keyword
+            arguments, True if statistics should be collected)
+        :return: (tuple) (index, moves or None, bound or None, error message or None, statistics dictionary or None)
     """
-        Method created only to print results, based on final puzzle state (TableState instance)
 
-        :param final_state: (TableState) state of solved puzzle (with parent information which lead to beginning)
+    index, board, board_type, arguments, collect_stats = task
+    if board_type is None:
+        return index, None, None, board, None
+
+    stats = SearchStats() if collect_stats else None
+    try:
+        solution = solve_puzzle(TableState(board, board_type=board_type), stats=stats, **arguments)
+        return index, solution.moves, solution.bound, None, stats and stats.to_dict()
+    except (NotSolvablePuzzle, SearchLimitExceeded) as e:
+        return index, None, None, str(e), stats and stats.to_dict()
+
+
+def solve_many(states, workers=None, chunk_size=1, on_stats=None, window=None, **arguments):
     """
+        Function which solves many puzzles on pool of worker processes.
+
+        Puzzles are sent to workers in chunks of chunk_size, and results are yielded as soon as they are
+        ready (in completion order, not input order), together with index of puzzle in sent sequence.
+        Use timeout and max_nodes arguments so one hard puzzle can't stall whole batch. Heuristic must
+        be sent by name (or as module level function), because it has to be sent to other processes.
+
+        States are read lazily, and at most window puzzles are sent to workers but not yet yielded, so
+        memory use doesn't depend on number of puzzles (states can be generator over huge file).
+
+        :param states: (iterable) TableState instances which should be solved (boards can have different sizes),
+            or exceptions (of puzzles rejected by earlier validation), which are yielded as errors in their place
+        :param workers: (int) number of worker processes (default number of cores), 1 solves in this process
+        :param chunk_size: (int) number of puzzles sent to worker at once
+        :param on_stats: (function) called with index of puzzle and its statistics (SearchStats.to_dict result,
+            collected in worker) before its result is yielded, statistics are not collected if None
+        :param window: (int) maximal number of puzzles in flight (default 4 * workers * chunk_size)
+        :param arguments: (dict) keyword arguments for solve_puzzle (engine, heuristic, timeout, max_nodes...)
+        :return: (generator) yields (index, Solution or None, error message or None) tuples
+    """
+
+    pending = {}
+    collect_stats = on_stats is not None
+
+    def tasks(slots=None):
+        for index, state in enumerate(states):
+            if slots is not None:
+                slots.acquire()
+                if stopped:
+                    return
+            pending[index] = state
+            if isinstance(state, Exception):
+                yield index, str(state), None, arguments, collect_stats
+            else:
+                yield index, state.board, state.board_type, arguments, collect_stats
+
+    stopped = False
+    if workers == 1:
+        results = (_solve_one(task) for task in tasks())
+        pool = slots = None
+    else:
+        from multiprocessing import Pool, cpu_count
+        pool = Pool(workers)
+        slots = Semaphore(window or 4 * (workers or cpu_count()) * chunk_size)
+        results = pool.imap_unordered(_solve_one, tasks(slots), chunk_size)
+
+    try:
+        for index, moves, bound, error, stats in results:
+            state = pending.pop(index)
+            if slots is not None:
+                slots.release()
+            if on_stats is not None and stats is not None:
+                on_stats(index, stats)
+            yield index, (Solution(state, moves, bound) if moves is not None else None), error
+    finally:
+        if pool is not None:
+            # task generator can wait for free slot inside pool's thread, it must be let out before termination
+            stopped = True
+            slots.release()
+            pool.terminate()
+
+
+def print_results(solution):
+    """
+        Method created only to print results, replays solution and prints every state on the way
+
+        :param solution: (Solution) found solution
+    """
+
+    for state in solution.states():
+        print state
+
+    print 'Solved in ' + str(len(solution)) + ' moves' + bound_note(solution)
 
-    result_path = []
-    while final_state is not None:
-        result_path.append(final_state)
-        final_state = final_state.parent
 
-    for i in xrange(len(result_path) - 1, -1, -1):
-        print result_path[i]
+def bound_note(solution):
+    """ Function which returns note about suboptimality of solution, for printing (empty for optimal solutions) """
 
-    print 'Solved in ' + str(len(result_path)) + ' moves'
\ No newline at end of file
+    if solution.bound is None or solution.bound <= 1:
+        return ''
+    return ' (at most ' + format(solution.bound, '.2f') + ' times optimal)'
@@ -0,0 +1,241 @@
+__author__ = 'Acko'
+
+from collections import deque
+
+from application.PatternDatabase import PatternDatabase
+from application.TableState import TableState
+from application.tables import load_table
+
+
+""" Lookup tables: line conflict costs by board type (keyed by line index and content), walking distances by shape """
+_line_conflicts = {}
+_walking_distances = {}
+
+
+def longest_increasing(values):
+    """
+        Function which returns length of longest strictly increasing subsequence. Tiles of line which are not in it
+        must leave line to let others pass, so linear conflict cost of line is twice number of those tiles (see
+        linear_conflict, and batch module which builds same costs for arrays of boards).
+
+        :param values: (python list) numbers (goal positions of tiles in line)
+        :return: (int) length of subsequence
+    """
+
+    best = []
+    for i, value in enumerate(values):
+        best.append(1 + max([best[j] for j in xrange(i) if values[j] < value] or [0]))
+    return max(best or [0])
+
+
+def _line_conflict(columns, line, content, vertical):
+    """
+        Helper function which calculates linear conflict cost for one row (or column).
+
+        Tiles which are in their goal line, but in wrong order, must leave the line to let others pass. Minimal
+        number of such tiles is number of tiles in line minus longest subsequence already in right order,
+        and each of them costs two additional moves above their manhattan distance.
+
+        :param columns: (int) number of columns of board
+        :param line: (int) index of row (or column)
+        :param content: (tuple) tiles in that line, in order
+        :param vertical: (boolean) True if line is column, False if it is row
+        :return: (int) additional moves needed because of conflicts in the line
+    """
+
+    goals = []
+    for tile in content:
+        if not tile:
+            continue
+        goal_row, goal_column = divmod(tile - 1, columns)
+        if (goal_column if vertical else goal_row) == line:
+            goals.append(goal_row if vertical else goal_column)
+    return 2 * (len(goals) - longest_increasing(goals))
+
+
+def linear_conflict(state):
+    """
+        Function that calculates manhattan distance increased by linear conflicts.
+
+        Costs of lines are calculated once for every (line, content) pair and kept in lookup table,
+        so evaluation is one table lookup per row and per column.
+
+        :param state: (TableState) state for which heuristic value is calculated
+        :return: (int) heuristic value
+    """
+
+    rows, columns = state.board_type.rows, state.board_type.columns
+    table = _line_conflicts.setdefault(state.board_type, {})
+    tiles = state.tiles()
+
+    value = state.manhattan()
+    keys = [(line, tuple(tiles[line * columns:(line + 1) * columns]), False) for line in xrange(rows)] + \
+        [(line, tuple(tiles[line::columns]), True) for line in xrange(columns)]
+    for key in keys:
+        cost = table.get(key)
+        if cost is None:
+            cost = table[key] = _line_conflict(columns, *key)
+        value += cost
+    return value
+
+
+def _linear_conflict_line(board_type, line, content, vertical):
+    """ Helper function which returns linear conflict cost of one line, as part of additive linear_conflict """
+
+    return _line_conflict(board_type.columns, line, content, vertical)
+
+
+def _walking_distance_table(size, width):
+    """
+        Helper function which builds walking distance table for board with given number of rows and columns.
+
+        Abstract state is matrix where element [row][goal_row] is number of tiles in row whose goal is
+        goal_row, together with row of blank. Table contains distances of all such states from goal, found
+        by breadth-first search where blank swaps places with one tile from neighbour row. Columns use
+        same kind of table, built for transposed board.
+
+        State is encoded as one int: sum of matrix elements multiplied by their weights (powers of width + 1,
+        see _walking_distance_powers) plus blank row, so table is small and loads fast from tables file.
+
+        :param size: (int) number of rows
+        :param width: (int) number of columns (tiles in one row)
+        :return: (dict) maps encoded state to number of moves
+    """
+
+    powers = _walking_distance_powers(size, width)
+    start = sum(powers[row * size + row] * width for row in xrange(size)) - powers[-1] + size - 1
+    table = {start: 0}
+    queue = deque([start])
+
+    while queue:
+        state = queue.popleft()
+        blank_row = state % size
+        for next_row in (blank_row - 1, blank_row + 1):
+            if not 0 <= next_row < size:
+                continue
+            for goal_row in xrange(size):
+                source = powers[next_row * size + goal_row]
+                if not state // source % (width + 1):
+                    continue
+                next_state = state - source + powers[blank_row * size + goal_row] - blank_row + next_row
+                if next_state not in table:
+                    table[next_state] = table[state] + 1
+                    queue.append(next_state)
+
+    return table
+
+
+def _walking_distance_powers(size, width):
+    """ Helper function which returns weight of every matrix element in encoded walking distance state """
+
+    return [(width + 1) ** i * size for i in xrange(size * size)]
+
+
+def walking_distance(state):
+    """
+        Function that calculates walking distance for current TableState.
+
+        It is sum of vertical distance (moves needed to bring every tile to its goal row, when tiles in
+        same row are not distinguished) and horizontal distance (same for columns). Both parts are looked
+        up in precomputed tables, because columns are just rows of transposed board (for square boards
+        it is the same table). Tables are kept in tables file, so they are built only once.
+
+        :param state: (TableState) state for which heuristic value is calculated
+        :return: (int) heuristic value
+    """
+
+    size, width = state.board_type.rows, state.board_type.columns
+    for shape in ((size, width), (width, size)):
+        if shape not in _walking_distances:
+            name = 'walking_distance_' + str(shape[0]) + 'x' + str(shape[1])
+            _walking_distances[shape] = load_table(name, _walking_distance_table, *shape), \
+                _walking_distance_powers(*shape)
+
+    row_table, row_powers = _walking_distances[(size, width)]
+    column_table, column_powers = _walking_distances[(width, size)]
+    row_key = column_key = 0
+    for position, tile in enumerate(state.tiles()):
+        if not tile:
+            continue
+        row, column = divmod(position, width)
+        goal_row, goal_column = divmod(tile - 1, width)
+        row_key += row_powers[row * size + goal_row]
+        column_key += column_powers[column * width + goal_column]
+
+    row, column = divmod(state.blank, width)
+    return row_table[row_key + row] + column_table[column_key + column]
+
+
+def pattern_database(state):
+    """
+        Heuristic which returns value of disjoint additive pattern database with default partition of state's board
+        (see PatternDatabase.get). Database is mapped (or built, once) only when this heuristic is first used.
+
+        :param state: (TableState) state for which heuristic value is calculated
+        :return: (int) heuristic value
+
+        :raises: (PatternDatabaseError) if there is no default partition for state's board
+    """
+
+    return PatternDatabase.get(state.board_type.rows)(state)
+
+
+def combine_max(*heuristics):
+    """
+        Function which combines several heuristics into one, returning their maximum.
+
+        Maximum of admissible heuristics is admissible too, and it is at least as strong as each of them.
+
+        :param heuristics: (functions) heuristics (or their names from HEURISTICS)
+        :return: (function) combined heuristic
+    """
+
+    functions = [get_heuristic(heuristic) for heuristic in heuristics]
+    return lambda state: max(function(state) for function in functions)
+
+
+""" Registry of available heuristics, by name """
+HEURISTICS = {
+    'manhattan': TableState.manhattan,
+    'hamming': TableState.hamming,
+    'linear_conflict': linear_conflict,
+    'walking_distance': walking_distance,
+    'pdb': pattern_database
+}
+
+
+"""
+    Additive heuristics, by function: base heuristic and cost of one line (called with board type, line index, tiles
+    of line and True for columns), heuristic value is base value plus costs of all rows and columns (see HeuristicCache)
+"""
+LINE_HEURISTICS = {
+    linear_conflict: (TableState.manhattan, _linear_conflict_line)
+}
+
+
+def register_heuristic(name, heuristic):
+    """
+        Function which adds heuristic to registry, so it can be selected by name (for example loaded PatternDatabase).
+
+        :param name: (string) name of heuristic
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+    """
+
+    HEURISTICS[name] = heuristic
+
+
+def get_heuristic(heuristic):
+    """
+        Function which returns heuristic function for given name (functions are returned as they are).
+
+        :param heuristic: (string|function) name from HEURISTICS or heuristic function
+        :return: (function) heuristic function
+
+        :raises: (ValueError) if there is no heuristic with given name
+    """
+
+    if callable(heuristic):
+        return heuristic
+    if heuristic not in HEURISTICS:
+        raise ValueError('Unknown heuristic: ' + str(heuristic))
+    return HEURISTICS[heuristic]
@@ -1,20 +1,197 @@
 __author__ = 'Acko'
 
-from datetime import datetime
+import argparse
+import json
+import sys
+import time
+from functools import partial
 
+from application.BoardType import BoardType
+from application.ClosedSet import CLOSED_SETS
+from application.SearchStats import SearchStats
 from application.TableState import TableState
-from application.functions import solve_puzzle, print_results
+from application.functions import solve_puzzle, print_results, ENGINES, GREEDY, A_STAR, WEIGHTED_A_STAR, ARA_STAR, \
+    HDA_STAR, EXTERNAL
+from application.pipeline import read_puzzles, validate, solve_stream, WRITERS
 
 
-if __name__ == '__main__':
-    TableState.TABLE_SIZE = 4
-    TableState.__EMPTY_BLOCK__ = 'x'
+def parse_arguments(argv=None):
+    """ Function which parses command line arguments (of this process, if argv is not sent) """
+
+    parser = argparse.ArgumentParser(description='15-puzzle solver')
+    parser.add_argument('puzzles', nargs='?',
+                        help='file with one puzzle per line (- for standard input), solves many puzzles in parallel')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='text', help='format of results of many puzzles')
+    parser.add_argument('--output', default=None, help='file to which results of many puzzles are written '
+                                                       '(default standard output)')
+    parser.add_argument('--puzzle', default='13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15',
+                        help='puzzle solved when no file is given, tiles separated by spaces with x as empty block')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes, for many puzzles or for hdastar engine (default all cores)')
+    parser.add_argument('--chunk-size', type=int, default=1, help='number of puzzles sent to worker at once')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=GREEDY, help='search engine')
+    parser.add_argument('--heuristic', default='manhattan',
+                        help='heuristic name (manhattan, hamming, linear_conflict, walking_distance or pdb)')
+    parser.add_argument('--timeout', type=float, default=None, help='time limit for one puzzle, in seconds')
+    parser.add_argument('--max-nodes', type=int, default=None, help='node limit for one puzzle')
+    parser.add_argument('--board', type=BoardType.parse, default=None,
+                        help='board dimensions, for example 3x4 (default square board, size taken from puzzle)')
+    parser.add_argument('--shorten', type=int, default=None, metavar='WINDOW',
+                        help='shorten solutions of engines which are not optimal (greedy, wastar, arastar), by '
+                             'replacing every WINDOW moves with optimal path')
+    parser.add_argument('--heuristic-cache', type=int, default=None, metavar='SIZE',
+                        help='memoize up to SIZE heuristic values (and row and column costs of linear_conflict), '
+                             'shared by all puzzles solved by one process')
+    parser.add_argument('--weight', type=float, default=None,
+                        help='heuristic weight for weighted A* (and first iteration of ARA*)')
+    parser.add_argument('--closed-set', choices=sorted(CLOSED_SETS), default='dict',
+                        help='closed set used by greedy and A* engines (bloom is approximate)')
+    parser.add_argument('--max-memory', type=int, default=None, help='closed set memory ceiling, in megabytes')
+    parser.add_argument('--spill-directory', default=None,
+                        help='directory where packed closed set is moved when it reaches memory ceiling, and where '
+                             'external engine keeps its layer files')
+    parser.add_argument('--stats', default=None,
+                        help='file to which search statistics are appended, one JSON line per puzzle (- for standard '
+                             'output)')
+    parser.add_argument('--progress', type=int, default=None,
+                        help='print search progress to standard error every N expanded nodes (single puzzle only)')
+    return parser.parse_args(argv)
+
+
+def engine_options(arguments):
+    """
+        Function which makes engine specific keyword arguments for solve_puzzle from command line arguments.
+
+        :param arguments: (argparse.Namespace) parsed command line arguments
+        :return: (dict) keyword arguments
+    """
+
+    if arguments.engine in (WEIGHTED_A_STAR, ARA_STAR):
+        return {'weight': arguments.weight} if arguments.weight is not None else {}
+    if arguments.engine == EXTERNAL:
+        return {'directory': arguments.spill_directory} if arguments.spill_directory else {}
+    if arguments.engine not in (GREEDY, A_STAR):
+        return {}
+
+    options = {}
+    if arguments.max_memory is not None:
+        options['max_memory'] = arguments.max_memory * 2 ** 20
+    if arguments.closed_set == 'packed' and arguments.spill_directory:
+        options['spill_directory'] = arguments.spill_directory
+    return {'closed_set': partial(CLOSED_SETS[arguments.closed_set], **options)}
+
+
+def open_stats(arguments):
+    """ Function which opens file for statistics (None if they are not requested) """
+
+    if arguments.stats is None:
+        return None
+    return sys.stdout if arguments.stats == '-' else open(arguments.stats, 'a')
+
+
+def print_progress(stats):
+    """ Function which prints progress of running search to standard error """
+
+    sys.stderr.write('expanded ' + str(stats.expanded) + ', generated ' + str(stats.generated) + ', open ' +
+                     str(stats.peak_open) + ', closed ' + str(stats.peak_closed) + '\n')
+
+
+def solve_single(arguments, initial_state):
+    """
+        Function which solves one puzzle and prints its solution (and statistics, if requested).
+
+        :param arguments: (argparse.Namespace) parsed command line arguments
+        :param initial_state: (TableState) state of puzzle which should be solved
+    """
+
+    stats_file = open_stats(arguments)
+    stats = None
+    if stats_file is not None or arguments.progress:
+        stats = SearchStats(print_progress if arguments.progress else None, arguments.progress or 10000)
+
+    options = engine_options(arguments)
+    if arguments.engine == HDA_STAR:
+        options['workers'] = arguments.workers
 
-    initial_state = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+    try:
+        print_results(solve_puzzle(initial_state, arguments.engine, arguments.heuristic, arguments.max_nodes,
+                                   arguments.timeout, stats=stats, shorten_window=arguments.shorten,
+                                   heuristic_cache=arguments.heuristic_cache, **options))
+    finally:
+        if stats_file is not None:
+            stats.dump(stats_file)
+            if stats_file is not sys.stdout:
+                stats_file.close()
+
+
+def solve_batch(arguments):
+    """
+        Function which solves all puzzles from input file, and writes one record for each of them (in chosen format).
+
+        Puzzles are streamed: they are read, validated and solved lazily, and every result is written as soon as
+        it is ready, so memory use doesn't grow with size of input. Records are marked with line numbers of
+        puzzles. Statistics (if requested) are collected by workers, and written with line number as index.
+
+        :param arguments: (argparse.Namespace) parsed command line arguments
+
+        :raises: (ValueError) if engine is HDA_STAR (it splits one puzzle between processes, while batch already
+            solves one puzzle per process)
+    """
+
+    if arguments.engine == HDA_STAR:
+        raise ValueError('Engine ' + HDA_STAR + ' solves one puzzle on many processes, it can not solve many puzzles')
+
+    input_file = sys.stdin if arguments.puzzles == '-' else open(arguments.puzzles)
+    output = open(arguments.output, 'wb' if arguments.format == 'binary' else 'w') if arguments.output else sys.stdout
+    write = WRITERS[arguments.format]
+
+    stats_file = open_stats(arguments)
+    on_stats = None
+    if stats_file is not None:
+        def on_stats(number, stats):
+            stats['index'] = number
+            stats_file.write(json.dumps(stats, sort_keys=True) + '\n')
 
+    records = validate(read_puzzles(input_file), arguments.board)
+    results = solve_stream(records, arguments.workers, arguments.chunk_size, on_stats, engine=arguments.engine,
+                           heuristic=arguments.heuristic, timeout=arguments.timeout, max_nodes=arguments.max_nodes,
+                           shorten_window=arguments.shorten, heuristic_cache=arguments.heuristic_cache,
+                           **engine_options(arguments))
     try:
-        start = datetime.now()
-        print_results(solve_puzzle(initial_state))
-        print 'Puzzle solved in: ' + str((datetime.now() - start))
+        for number, solution, error, rejected in results:
+            write(output, number, solution, error, rejected)
+            if output is sys.stdout:
+                output.flush()
+    finally:
+        for opened in (input_file, output, stats_file):
+            if opened is not None and opened not in (sys.stdin, sys.stdout):
+                opened.close()
+
+
+def main(argv=None):
+    """
+        Function which runs solver with given command line arguments (used directly and by warm worker).
+
+        :param argv: (python list) command line arguments, without program name (default ones of this process)
+        :return: (int) exit status, 0 if everything was solved without errors
+    """
+
+    args = parse_arguments(argv)
+
+    try:
+        start = time.time()
+        if args.puzzles:
+            solve_batch(args)
+            # standard output can carry records, so summary goes to standard error
+            sys.stderr.write('Puzzles solved in: ' + format(time.time() - start, '.3f') + ' s\n')
+        else:
+            solve_single(args, TableState(args.puzzle, board_type=args.board))
+            print 'Puzzle solved in: ' + format(time.time() - start, '.3f') + ' s'
     except Exception as e:
-        print e
\ No newline at end of file
+        print e
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+__author__ = 'Acko'
+
+import ctypes
+import time
+import traceback
+from multiprocessing import Event, Lock, Pipe, Process, Queue, RawArray, Value, cpu_count
+from Queue import Empty
+
+from application.Heap import Heap
+from application.SearchBudget import SearchBudget, SearchLimitExceeded
+from application.SearchStats import SearchStats
+from application.Solution import Solution
+from application.TableState import TableState
+
+""" Counters shared by all workers: batches sent but not yet received, and batches received so far """
+_PENDING, _PROCESSED = 0, 1
+
+""" Tags of messages which workers send when search is finished: statistics counters, limit error, or crash """
+_STATS, _LIMIT, _ERROR = 'stats', 'limit', 'error'
+
+""" Message of worker which exited without sending anything (or while path was traced) """
+_STOPPED = 'Worker process stopped unexpectedly'
+
+""" Statistics counters which workers send back, and which are added to statistics of search """
+_COUNTERS = ('expanded', 'generated', 'duplicates', 'peak_open', 'peak_closed', 'heuristic_calls', 'heuristic_time',
+             'heap_pushes', 'heap_pops', 'heap_decreases')
+
+
+def _owner(state, workers):
+    """ Helper function which returns index of worker which owns state (chosen by high bits of Zobrist hash) """
+
+    return (hash(state) >> 20) % workers
+
+
+def _terminated(counters, lock, busy):
+    """
+        Helper function which checks if parallel search is finished: no worker has node worth expanding, and no
+        batch is on its way. Workers become busy only by receiving batch, so if number of received batches is same
+        before and after idle flags are read, no worker woke up in between.
+    """
+
+    with lock:
+        pending, processed = counters[_PENDING], counters[_PROCESSED]
+    if pending or any(busy):
+        return False
+    with lock:
+        return not counters[_PENDING] and counters[_PROCESSED] == processed
+
+
+def _hda_worker(index, board_type, heuristic, budget, queues, counters, lock, busy, incumbent, stop, connection,
+                batch_size, timing):
+    """
+        Function which runs one partition of hash-distributed A*, inside its own process.
+
+        Worker keeps open set (Heap) and best known costs only for states it owns. Children owned by other workers
+        are collected into batches (board, cost, last move) which are sent to their owners' queues, when batch is
+        full, after every batch_size expansions, and before worker goes idle. States can be reached with better cost
+        after they were expanded (workers don't expand in same order), so they are then opened again.
+
+        When search is finished (or stopped) worker sends tagged message to parent process: its statistics counters,
+        message of exceeded limit, or traceback of any other exception. Then it answers with last move of every
+        owned board parent sends, until it sends None.
+    """
+
+    workers = len(queues)
+    stats = SearchStats(timing=timing)
+    heuristic = stats.timed(heuristic)
+    inbox = queues[index]
+    for queue in queues:
+        # batches left after stop are never read, they must not keep process alive
+        queue.cancel_join_thread()
+
+    open_set = Heap(Heap.HEAP_DOWN)
+    reached = {}
+    outboxes = [[] for _ in xrange(workers)]
+
+    def insert(state, cost):
+        known = reached.get(state.board)
+        if known is not None and known[0] <= cost:
+            stats.duplicates += 1
+            return
+        reached[state.board] = (cost, state.last_move)
+
+        if state.is_final():
+            with incumbent.get_lock():
+                if cost < incumbent.value:
+                    incumbent.value = cost
+            return
+
+        f = cost + heuristic(state)
+        if f >= incumbent.value:
+            return
+        if open_set.contains(state):
+            open_set.decrease_key(state, f)
+        else:
+            open_set.add(f, state)
+
+    def receive(batch):
+        busy[index] = 1
+        for board, cost, last_move in batch:
+            insert(TableState(board, last_move, board_type), cost)
+        with lock:
+            counters[_PENDING] -= 1
+            counters[_PROCESSED] += 1
+
+    def send(owner):
+        batch, outboxes[owner] = outboxes[owner], []
+        with lock:
+            counters[_PENDING] += 1
+        queues[owner].put(batch)
+
+    def flush():
+        for owner in xrange(workers):
+            if outboxes[owner]:
+                send(owner)
+        try:
+            while True:
+                receive(inbox.get_nowait())
+        except Empty:
+            pass
+
+    try:
+        expansions = 0
+        while not stop.is_set():
+            if open_set.is_empty() or open_set.top()[0] >= incumbent.value:
+                flush()
+                if open_set.is_empty() or open_set.top()[0] >= incumbent.value:
+                    busy[index] = 0
+                    try:
+                        receive(inbox.get(timeout=0.01))
+                    except Empty:
+                        pass
+                continue
+
+            state = open_set.pop()[1]
+            next_cost = reached[state.board][0] + 1
+            budget.spend()
+            stats.expand(len(open_set), len(reached))
+
+            for next_state in state.generate_next_moves():
+                stats.generated += 1
+                owner = _owner(next_state, workers)
+                if owner == index:
+                    insert(next_state, next_cost)
+                    continue
+                outboxes[owner].append((next_state.board, next_cost, next_state.last_move))
+                if len(outboxes[owner]) >= batch_size:
+                    send(owner)
+
+            expansions += 1
+            if expansions % batch_size == 0:
+                flush()
+
+        stats.count_queue(open_set)
+        counters = tuple(getattr(stats, name) for name in _COUNTERS)
+    except SearchLimitExceeded as e:
+        stop.set()
+        connection.send((_LIMIT, str(e)))
+        return
+    except Exception:
+        stop.set()
+        connection.send((_ERROR, traceback.format_exc()))
+        return
+
+    connection.send((_STATS, counters))
+    for board in iter(connection.recv, None):
+        connection.send(reached[board][1])
+
+
+def hda_star_search(initial_state, heuristic=TableState.manhattan, budget=None, workers=None, batch_size=64,
+                    stats=None):
+    """
+        Hash-distributed parallel A* search (HDA*).
+
+        Every worker process owns states whose Zobrist hash falls into its partition, and runs A* over them with
+        its own open and closed sets. Generated children are sent to their owners in batches. First goal found
+        sets incumbent cost, which is then improved while any worker has node with smaller f value. Search is
+        finished when no worker has such node and no batch is on its way, so with admissible heuristic returned
+        solution is optimal. Path is then traced back from goal state, asking owner of every state for its
+        last move.
+
+        :param initial_state: (TableState) state of puzzle which should be solved
+        :param heuristic: (function) function which returns heuristic value for sent TableState
+        :param budget: (SearchBudget) limits for search (applied to every worker separately)
+        :param workers: (int) number of worker processes (default number of cores)
+        :param batch_size: (int) number of children sent to other worker at once
+        :param stats: (SearchStats) statistics which engine should update (counters of all workers are added,
+            peak sizes are sums of peak sizes of workers)
+        :return: (Solution) found solution, with bound 1
+
+        :raises: (SearchLimitExceeded) if budget of any worker is spent before solution is found, (RuntimeError) if
+            any worker fails with other error (message contains its traceback) or exits unexpectedly
+    """
+
+    budget = budget or SearchBudget()
+    stats = stats or SearchStats(timing=False)
+    initial_state = TableState(initial_state.board, board_type=initial_state.board_type)
+    if initial_state.is_final():
+        return Solution(initial_state, '', 1.0)
+
+    board_type = initial_state.board_type
+    workers = max(1, workers or cpu_count())
+    queues = [Queue() for _ in xrange(workers)]
+    counters, lock, busy = RawArray(ctypes.c_long, 2), Lock(), RawArray(ctypes.c_byte, workers)
+    incumbent, stop = Value(ctypes.c_double, float('inf')), Event()
+
+    connections, processes = [], []
+    for index in xrange(workers):
+        parent_end, child_end = Pipe()
+        process = Process(target=_hda_worker, args=(index, board_type, heuristic, budget, queues, counters, lock,
+                                                    busy, incumbent, stop, child_end, batch_size, stats.timing))
+        process.daemon = True
+        process.start()
+        child_end.close()
+        connections.append(parent_end)
+        processes.append(process)
+
+    # root is sent only after workers are forked, so no queue is inherited in the middle of put
+    counters[_PENDING] = 1
+    queues[_owner(initial_state, workers)].put([(initial_state.board, 0, None)])
+
+    try:
+        while not stop.is_set() and not _terminated(counters, lock, busy):
+            if not all(process.is_alive() for process in processes):
+                break
+            time.sleep(0.001)
+        stop.set()
+
+        results = []
+        for connection in connections:
+            try:
+                results.append(connection.recv())
+            except EOFError:
+                results.append((_ERROR, _STOPPED))
+        # crash of any worker is reported even if other workers only stopped because of it
+        for tag, error in ((_ERROR, RuntimeError), (_LIMIT, SearchLimitExceeded)):
+            messages = [message for result_tag, message in results if result_tag == tag]
+            if messages:
+                raise error(messages[0])
+
+        for name, values in zip(_COUNTERS, zip(*[counters for _, counters in results])):
+            setattr(stats, name, getattr(stats, name) + sum(values))
+        if incumbent.value == float('inf'):
+            return None
+
+        moves = []
+        state = TableState.goal(board_type)
+        while state != initial_state:
+            connection = connections[_owner(state, workers)]
+            connection.send(state.board)
+            try:
+                moves.append(connection.recv())
+            except EOFError:
+                raise RuntimeError(_STOPPED)
+            state = state.move(TableState.INVERSE[moves[-1]])
+    finally:
+        for connection in connections:
+            try:
+                connection.send(None)
+            except IOError:
+                # worker which stopped search with error has already exited
+                pass
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+
+    return Solution(initial_state, ''.join(reversed(moves)), 1.0)
@@ -0,0 +1,160 @@
+__author__ = 'Acko'
+
+import json
+import struct
+
+from application.TableState import TableState
+from application.functions import solve_many, bound_note, NotSolvablePuzzle
+
+""" Status codes of binary records """
+SOLVED, REJECTED, FAILED = 0, 1, 2
+
+""" Binary record header: line number, status, number of moves, bound (NaN if unknown), then packed moves """
+_HEADER = struct.Struct('<IBIf')
+_MOVE_CODES = {TableState.LEFT: 0, TableState.UP: 1, TableState.RIGHT: 2, TableState.DOWN: 3}
+_MOVES = (TableState.LEFT, TableState.UP, TableState.RIGHT, TableState.DOWN)
+
+
+def read_puzzles(input_file):
+    """
+        Function which reads puzzles lazily, one per line (empty lines and lines starting with # are skipped).
+
+        :param input_file: (file) opened file (or any iterable of lines)
+        :return: (generator) yields (line number, line) tuples
+    """
+
+    for number, line in enumerate(input_file, 1):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield number, line
+
+
+def validate(puzzles, board_type=None):
+    """
+        Function which parses and parity checks puzzles, invalid and unsolvable ones are passed on as exceptions.
+
+        :param puzzles: (iterable) (line number, line) tuples, as yielded by read_puzzles
+        :param board_type: (BoardType) dimensions of boards (default square board, size taken from puzzle)
+        :return: (generator) yields (line number, TableState or exception) tuples
+    """
+
+    for number, line in puzzles:
+        try:
+            state = TableState(line, board_type=board_type)
+        except ValueError as e:
+            yield number, e
+            continue
+
+        if state.is_solvable():
+            yield number, state
+        else:
+            yield number, NotSolvablePuzzle('Puzzle not solvable!')
+
+
+def solve_stream(records, workers=None, chunk_size=1, on_stats=None, **arguments):
+    """
+        Function which solves validated puzzles on pool of worker processes, keeping memory use flat.
+
+        Puzzles are read only as workers need them (see solve_many), so input can be bigger than memory.
+
+        :param records: (iterable) (line number, TableState or exception) tuples, as yielded by validate
+        :param workers: (int) number of worker processes (default number of cores)
+        :param chunk_size: (int) number of puzzles sent to worker at once
+        :param on_stats: (function) called with line number and statistics of its search (see solve_many)
+        :param arguments: (dict) keyword arguments for solve_puzzle (engine, heuristic, timeout, max_nodes...)
+        :return: (generator) yields (line number, Solution or None, error message or None, True if puzzle was
+            rejected by validation) tuples, in completion order
+    """
+
+    numbers = {}
+
+    def states():
+        for index, (number, state) in enumerate(records):
+            numbers[index] = number, isinstance(state, Exception)
+            yield state
+
+    if on_stats is not None:
+        stats_callback = lambda index, stats: on_stats(numbers[index][0], stats)
+    else:
+        stats_callback = None
+
+    for index, solution, error in solve_many(states(), workers, chunk_size, stats_callback, **arguments):
+        number, rejected = numbers.pop(index)
+        yield number, solution, error, rejected
+
+
+def write_text(output, number, solution, error, rejected):
+    """ Function which writes one result as line of text """
+
+    if error:
+        output.write(str(number) + ': ' + error + '\n')
+    else:
+        output.write(str(number) + ': solved in ' + str(len(solution)) + ' moves' + bound_note(solution) + ': ' +
+                     str(solution) + '\n')
+
+
+def write_json(output, number, solution, error, rejected):
+    """ Function which writes one result as line of JSON """
+
+    if error:
+        record = {'line': number, 'error': error, 'rejected': rejected}
+    else:
+        record = {'line': number, 'length': len(solution), 'moves': solution.moves}
+        if solution.bound is not None:
+            record['bound'] = solution.bound
+    output.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def write_binary(output, number, solution, error, rejected):
+    """
+        Function which writes one result as binary record: header (see _HEADER), then moves packed by four in
+        byte (two bits per move, first move in lowest bits). Error messages aren't written, only status.
+    """
+
+    if error:
+        output.write(_HEADER.pack(number, REJECTED if rejected else FAILED, 0, float('nan')))
+        return
+
+    moves = solution.moves
+    packed = bytearray((len(moves) + 3) // 4)
+    for i, move in enumerate(moves):
+        packed[i // 4] |= _MOVE_CODES[move] << (2 * (i % 4))
+    bound = solution.bound if solution.bound is not None else float('nan')
+    output.write(_HEADER.pack(number, SOLVED, len(moves), bound) + str(packed))
+
+
+def read_binary(input_file):
+    """
+        Function which reads records written by write_binary.
+
+        :param input_file: (file) file opened in binary mode
+        :return: (generator) yields (line number, status, moves or None, bound or None) tuples
+
+        :raises: (ValueError) if file ends in middle of record
+    """
+
+    while True:
+        header = input_file.read(_HEADER.size)
+        if not header:
+            return
+        if len(header) < _HEADER.size:
+            raise ValueError('Truncated record header')
+
+        number, status, length, bound = _HEADER.unpack(header)
+        bound = None if bound != bound else bound
+        if status != SOLVED:
+            yield number, status, None, bound
+            continue
+
+        packed = bytearray(input_file.read((length + 3) // 4))
+        if len(packed) < (length + 3) // 4:
+            raise ValueError('Truncated record moves')
+        yield number, status, ''.join(_MOVES[(packed[i // 4] >> (2 * (i % 4))) & 3] for i in xrange(length)), bound
+
+
+""" Available output formats, by name """
+WRITERS = {
+    'text': write_text,
+    'jsonl': write_json,
+    'binary': write_binary
+}
@@ -0,0 +1,107 @@
+__author__ = 'Acko'
+
+import argparse
+import json
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+from application.BoardType import BoardType
+from application.SearchBudget import SearchLimitExceeded
+from application.SolverService import SolverService, ServiceBusy
+from application.TableState import TableState
+from application.functions import NotSolvablePuzzle, ENGINES, GREEDY
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    """ HTTP server which handles every connection in its own thread """
+
+    daemon_threads = True
+
+
+def make_server(service, host='127.0.0.1', port=8080, max_timeout=60.0):
+    """
+        Function which makes HTTP front end of solver service.
+
+        Only request is POST /solve with JSON object: board (string, required), board_type (for example '3x4',
+        default square board), engine, heuristic, timeout (seconds, capped by max_timeout) and max_nodes.
+        Response is JSON object with moves, length and bound (status 200), or with error and status 400 (invalid
+        request), 422 (not solvable puzzle), 503 (service busy) or 504 (limits exceeded). Connection threads only
+        wait for results, searches run in service's worker processes.
+
+        :param service: (SolverService) service which solves puzzles
+        :param host: (string) address on which server listens
+        :param port: (int) port on which server listens (0 for any free port)
+        :param max_timeout: (float) maximal (and default) time limit of one request, in seconds
+        :return: (HTTPServer) server, call serve_forever to run it
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            if self.path != '/solve':
+                return self.__respond(404, {'error': 'Not found'})
+
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.getheader('content-length') or 0)))
+                board_type = BoardType.parse(request['board_type']) if request.get('board_type') else None
+                state = TableState(str(request['board']), board_type=board_type)
+                engine = request.get('engine', GREEDY)
+                if engine not in ENGINES:
+                    raise ValueError('Unknown search engine: ' + str(engine))
+                timeout = min(float(request.get('timeout', max_timeout)), max_timeout)
+                pending = service.submit(state, engine, str(request.get('heuristic', 'manhattan')), timeout,
+                                         request.get('max_nodes'))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                return self.__respond(400, {'error': 'Invalid request: ' + str(e)})
+            except ServiceBusy as e:
+                return self.__respond(503, {'error': str(e)})
+
+            try:
+                solution = pending.result()
+            except NotSolvablePuzzle as e:
+                return self.__respond(422, {'error': str(e)})
+            except SearchLimitExceeded as e:
+                return self.__respond(504, {'error': str(e)})
+            except ValueError as e:
+                return self.__respond(400, {'error': str(e)})
+            self.__respond(200, {'moves': solution.moves, 'length': len(solution), 'bound': solution.bound})
+
+        def __respond(self, status, body):
+            content = json.dumps(body, sort_keys=True)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *arguments):
+            pass
+
+    return _ThreadingServer((host, port), Handler)
+
+
+def parse_arguments():
+    """ Function which parses command line arguments """
+
+    parser = argparse.ArgumentParser(description='15-puzzle solver HTTP service')
+    parser.add_argument('--host', default='127.0.0.1', help='address on which service listens')
+    parser.add_argument('--port', type=int, default=8080, help='port on which service listens')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default all cores)')
+    parser.add_argument('--max-pending', type=int, default=64,
+                        help='maximal number of different searches at once, more are refused with status 503')
+    parser.add_argument('--max-timeout', type=float, default=60.0, help='maximal time limit of one request')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_arguments()
+
+    solver_service = SolverService(args.workers, args.max_pending)
+    server = make_server(solver_service, args.host, args.port, args.max_timeout)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        solver_service.close()
@@ -0,0 +1,118 @@
+__author__ = 'Acko'
+
+import marshal
+import os
+import sys
+
+""" Version of tables file, increase it whenever any table builder changes its result """
+TABLES_VERSION = 1
+
+""" Path of tables file, beside package (PUZZLE_TABLES environment variable can move it, empty string disables it) """
+TABLES_FILE = os.environ.get('PUZZLE_TABLES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables.bin'))
+
+""" Tables loaded (or built) by this process, by name """
+_tables = {}
+
+
+def _header():
+    """ Helper function which returns header of tables file (marshal format can change between Python versions) """
+
+    return ('puzzle-tables', TABLES_VERSION, marshal.version, sys.version_info[:2])
+
+
+def _read_index(path):
+    """
+        Helper function which reads index of tables file.
+
+        File is marshalled header and index (name -> offset and length of marshalled table), followed by tables.
+
+        :return: (tuple) (index, position of first table), or (empty index, None) if file is missing or stale
+    """
+
+    try:
+        with open(path, 'rb') as input_file:
+            header, index = marshal.load(input_file)
+            if header == _header():
+                return index, input_file.tell()
+    except (IOError, EOFError, ValueError, TypeError):
+        pass
+    return {}, None
+
+
+def _read_table(path, name):
+    """ Helper function which reads one table from tables file (None if it is not there) """
+
+    index, start = _read_index(path)
+    if name not in index:
+        return None
+    offset, length = index[name]
+    try:
+        with open(path, 'rb') as input_file:
+            input_file.seek(start + offset)
+            return marshal.loads(input_file.read(length))
+    except (IOError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_table(path, name, table):
+    """
+        Helper function which adds table to tables file. File is rewritten into temporary file which then replaces
+        it, so readers never see half written file. Failures (for example read-only package directory) are ignored,
+        table is then only kept in memory.
+    """
+
+    index, start = _read_index(path)
+    blobs = []
+    try:
+        if index:
+            with open(path, 'rb') as input_file:
+                for old_name, (offset, length) in sorted(index.items(), key=lambda item: item[1][0]):
+                    input_file.seek(start + offset)
+                    blobs.append((old_name, input_file.read(length)))
+    except IOError:
+        blobs = []
+    blobs = [(old_name, blob) for old_name, blob in blobs if old_name != name] + [(name, marshal.dumps(table))]
+
+    new_index, offset = {}, 0
+    for blob_name, blob in blobs:
+        new_index[blob_name] = (offset, len(blob))
+        offset += len(blob)
+
+    # imported only here, short-lived processes which find their tables don't pay for it
+    import tempfile
+
+    temporary = None
+    try:
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or '.')
+        with os.fdopen(handle, 'wb') as output:
+            marshal.dump((_header(), new_index), output)
+            for _, blob in blobs:
+                output.write(blob)
+        os.chmod(temporary, 0o644)
+        os.rename(temporary, path)
+    except (IOError, OSError):
+        if temporary is not None and os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def load_table(name, builder, *arguments):
+    """
+        Function which returns precomputed lookup table: from memory, from tables file, or built (and saved).
+
+        Tables must consist of types marshal can store (ints, strings, tuples, lists, dictionaries), so loading
+        them is much faster than building them again in every short-lived process.
+
+        :param name: (string) unique name of table, it should contain all arguments of builder
+        :param builder: (function) function which builds table when it is not saved yet
+        :param arguments: (list) arguments of builder
+        :return: table
+    """
+
+    if name not in _tables:
+        table = _read_table(TABLES_FILE, name) if TABLES_FILE else None
+        if table is None:
+            table = builder(*arguments)
+            if TABLES_FILE:
+                _write_table(TABLES_FILE, name, table)
+        _tables[name] = table
+    return _tables[name]
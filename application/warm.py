@@ -0,0 +1,279 @@
+__author__ = 'Acko'
+
+import marshal
+import os
+import socket
+import struct
+import sys
+
+""" Path of worker's Unix socket (PUZZLE_SOLVER_SOCKET environment variable can change it) """
+SOCKET_PATH = os.environ.get('PUZZLE_SOLVER_SOCKET',
+                             os.path.join(os.environ.get('TMPDIR', '/tmp'), 'puzzle-solver-' + str(os.getuid())))
+
+""" Frame kinds sent by worker: standard output, standard error and exit status """
+STDOUT, STDERR, EXIT = 'o', 'e', 'x'
+
+_FRAME = struct.Struct('<cI')
+
+
+def _read_exactly(reader, size):
+    """ Helper function which reads exactly size bytes (less only if connection is closed) """
+
+    data = reader.read(size)
+    while data and len(data) < size:
+        chunk = reader.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+class _FrameWriter(object):
+    """ Helper class, file-like object which sends everything written to it as frames of one kind """
+
+    __BUFFER_SIZE__ = 1 << 16
+
+    def __init__(self, connection, kind, buffered=True):
+        self.connection = connection
+        self.kind = kind
+        self.buffered = buffered
+        self.softspace = 0
+        self.__parts = []
+        self.__size = 0
+
+    def write(self, data):
+        self.__parts.append(str(data))
+        self.__size += len(self.__parts[-1])
+        if not self.buffered or self.__size >= self.__BUFFER_SIZE__:
+            self.flush()
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self.__size:
+            data = ''.join(self.__parts)
+            self.connection.sendall(_FRAME.pack(self.kind, len(data)) + data)
+        self.__parts, self.__size = [], 0
+
+    def isatty(self):
+        return False
+
+
+def _reads_stdin(argv):
+    """
+        Helper function which checks if solver will read puzzles from standard input (puzzles argument is -). Solver's
+        own parser decides it, because - can also be value of option (--stats -), it is imported only when argv
+        contains - at all, so other requests don't pay for it.
+    """
+
+    if '-' not in argv:
+        return False
+    from application.main import parse_arguments
+    return parse_arguments(list(argv)).puzzles == '-'
+
+
+def _warm_up():
+    """
+        Helper function which imports all engines and loads (or builds) lookup tables of common board sizes.
+        Pattern database is left to first request which uses it (4x4 one takes minutes to build, then milliseconds
+        to map, see PatternDatabase.get).
+    """
+
+    # modules imported by worker are already loaded in every forked request
+    import multiprocessing.pool
+    from application import anytime, bidirectional, main
+    from application.BoardType import BoardType
+    from application.DistanceTable import DistanceTable
+    from application.TableState import TableState
+    from application.heuristics import HEURISTICS, pattern_database
+
+    for size in (3, 4):
+        goal = TableState.goal(BoardType.get(size))
+        for heuristic in HEURISTICS.values():
+            if heuristic is not pattern_database:
+                heuristic(goal)
+    DistanceTable.get(BoardType.get(3))
+    return main
+
+
+def _handle(connection, solver):
+    """
+        Helper function which runs one request inside forked child of worker.
+
+        Request is length of marshalled (arguments, working directory), that data, and then standard input of
+        client (if it is forwarded). Everything solver writes is sent back as frames, and exit status is last frame.
+
+        :param connection: (socket) connection to client
+        :param solver: (module) application.main module
+        :return: (int) exit status
+    """
+
+    reader = connection.makefile('rb')
+    header = _read_exactly(reader, 4)
+    if len(header) < 4:
+        return 1
+    argv, directory = marshal.loads(_read_exactly(reader, struct.unpack('<I', header)[0]))
+
+    sys.stdin = reader
+    sys.stdout = _FrameWriter(connection, STDOUT)
+    sys.stderr = _FrameWriter(connection, STDERR, buffered=False)
+    try:
+        os.chdir(directory)
+        status = solver.main(argv)
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception as e:
+        sys.stderr.write(str(e) + '\n')
+        status = 1
+    finally:
+        sys.stdout.flush()
+
+    connection.sendall(_FRAME.pack(EXIT, 4) + struct.pack('<i', status or 0))
+    return status or 0
+
+
+def _worker_running(path):
+    """ Helper function which checks if some worker accepts connections on socket (and is not only its stale file) """
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        return True
+    except socket.error:
+        return False
+    finally:
+        connection.close()
+
+
+def serve(path=SOCKET_PATH):
+    """
+        Function which runs warm worker: imports solver and loads tables once, then serves requests on Unix socket.
+
+        Every request runs in forked child, which starts with everything already imported and built (pages are
+        shared with worker), so requests are independent and can run in parallel.
+
+        :param path: (string) path of Unix socket
+
+        :raises: (RuntimeError) if other worker is already running on that socket
+    """
+
+    import signal
+
+    if os.path.exists(path):
+        if _worker_running(path):
+            raise RuntimeError('Warm worker is already running on ' + path)
+        os.remove(path)
+
+    solver = _warm_up()
+    # terminated worker removes its socket (finally block below)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # socket is created with owner-only permissions, so other users can't connect before chmod
+    mask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(mask)
+    os.chmod(path, 0o600)
+    server.listen(64)
+    # socket file is removed at exit only if it is still this worker's (not replaced by other worker's socket)
+    inode = os.stat(path).st_ino
+
+    try:
+        while True:
+            connection, _ = server.accept()
+            if not os.fork():
+                server.close()
+                status = 1
+                try:
+                    status = _handle(connection, solver)
+                finally:
+                    os._exit(status)
+            connection.close()
+
+            # reap finished children
+            try:
+                while os.waitpid(-1, os.WNOHANG)[0]:
+                    pass
+            except OSError:
+                pass
+    finally:
+        server.close()
+        try:
+            if os.stat(path).st_ino == inode:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def run_client(argv, path=SOCKET_PATH):
+    """
+        Function which runs solver in warm worker, and copies its output to output of this process.
+
+        Standard input is forwarded only if solver will read it (puzzles argument is -, see _reads_stdin).
+
+        :param argv: (python list) arguments for application.main
+        :param path: (string) path of worker's Unix socket
+        :return: (int) exit status of solver, None if worker is not running
+    """
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except socket.error:
+        connection.close()
+        return None
+
+    request = marshal.dumps((list(argv), os.getcwd()))
+    connection.sendall(struct.pack('<I', len(request)) + request)
+    if _reads_stdin(argv):
+        import threading
+
+        def forward():
+            for data in iter(lambda: os.read(sys.stdin.fileno(), 1 << 16), ''):
+                connection.sendall(data)
+            connection.shutdown(socket.SHUT_WR)
+
+        sender = threading.Thread(target=forward)
+        sender.daemon = True
+        sender.start()
+    else:
+        connection.shutdown(socket.SHUT_WR)
+
+    reader = connection.makefile('rb')
+    outputs = {STDOUT: sys.stdout, STDERR: sys.stderr}
+    try:
+        while True:
+            header = _read_exactly(reader, _FRAME.size)
+            if len(header) < _FRAME.size:
+                return 1
+            kind, length = _FRAME.unpack(header)
+            data = _read_exactly(reader, length)
+            if kind == EXIT:
+                return struct.unpack('<i', data)[0]
+            outputs[kind].write(data)
+            outputs[kind].flush()
+    finally:
+        connection.close()
+
+
+# python -m application.warm --serve [socket] starts worker, python -m application.warm [main.py arguments] runs
+# solver in worker (or in this process, if worker isn't running), this module imports only built-in modules itself
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    if arguments[:1] == ['--serve']:
+        try:
+            serve(arguments[1] if len(arguments) > 1 else SOCKET_PATH)
+        except RuntimeError as e:
+            sys.stderr.write(str(e) + '\n')
+            sys.exit(1)
+        sys.exit(0)
+
+    exit_status = run_client(arguments)
+    if exit_status is None:
+        from application.main import main as solve
+        exit_status = solve(arguments)
+    sys.exit(exit_status)
@@ -0,0 +1,77 @@
+__author__ = 'Acko'
+
+import time
+import unittest
+from application.TableState import TableState
+from application.SearchBudget import SearchBudget, SearchLimitExceeded
+from application.heuristics import linear_conflict
+from application.anytime import *
+from application.functions import solve_puzzle, A_STAR, WEIGHTED_A_STAR, ARA_STAR
+
+
+class AnytimeTest(unittest.TestCase):
+
+    def test_weighted(self):
+
+        # preparation
+        puzzle = TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None)
+        optimal = solve_puzzle(puzzle, A_STAR)
+
+        # do work
+        for weight in (1.0, 1.5, 3.0):
+            solution = solve_puzzle(puzzle, WEIGHTED_A_STAR, weight=weight)
+
+            # test
+            self.assertTrue(solution.final_state().is_final())
+            self.assertLessEqual(solution.bound, weight)
+            self.assertLessEqual(len(solution), solution.bound * len(optimal))
+        self.assertEqual(len(solve_puzzle(puzzle, WEIGHTED_A_STAR, weight=1.0)), len(optimal))
+
+    def test_anytime_improves(self):
+
+        # preparation
+        puzzle = TableState('2 3 4 8 1 6 7 x 5 9 10 12 13 14 11 15', None)
+        optimal = solve_puzzle(puzzle, A_STAR, linear_conflict)
+
+        # do work
+        solutions = list(ara_star_solutions(puzzle, linear_conflict, weight=4.0, step=1.0))
+
+        # test
+        self.assertEqual(len(solutions[-1]), len(optimal))
+        self.assertEqual(solutions[-1].bound, 1.0)
+        for previous, solution in zip(solutions, solutions[1:]):
+            self.assertLessEqual(len(solution), len(previous))
+            self.assertLessEqual(solution.bound, previous.bound)
+        for solution in solutions:
+            self.assertTrue(solution.final_state().is_final())
+            self.assertLessEqual(len(solution), solution.bound * len(optimal))
+
+    def test_budget(self):
+
+        # preparation
+        puzzle = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+        found = []
+
+        # do work
+        solution = solve_puzzle(puzzle, ARA_STAR, linear_conflict, deadline=time.time() + 0.5, on_solution=found.append)
+
+        # test
+        self.assertIs(solution, found[-1])
+        self.assertTrue(solution.final_state().is_final())
+        self.assertGreater(solution.bound, 1.0)
+        with self.assertRaises(SearchLimitExceeded):
+            ara_star_search(puzzle, linear_conflict, budget=SearchBudget(max_nodes=10))
+
+    def test_deadline(self):
+
+        # preparation
+        now = time.time()
+
+        # do work and test
+        self.assertEqual(SearchBudget(deadline=now + 5).deadline, now + 5)
+        self.assertLessEqual(SearchBudget(timeout=1, deadline=now + 5).deadline, now + 2)
+        self.assertEqual(SearchBudget(timeout=10, deadline=now + 5).deadline, now + 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
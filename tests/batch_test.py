@@ -0,0 +1,81 @@
+__author__ = 'Acko'
+
+import random
+import unittest
+from application.BoardType import BoardType
+from application.TableState import TableState
+from application.heuristics import linear_conflict
+from application import batch
+
+
+def random_states(board_type, count, seed=15):
+    """ Helper which makes random (solvable and unsolvable) states of given board type """
+
+    generator = random.Random(seed)
+    states = []
+    for _ in xrange(count):
+        tiles = range(board_type.length)
+        generator.shuffle(tiles)
+        states.append(TableState(board_type.pack(tiles), board_type=board_type))
+    return states
+
+
+@unittest.skipIf(batch.numpy is None, 'NumPy is not installed')
+class BatchTest(unittest.TestCase):
+
+    BOARD_TYPES = [BoardType.get(3), BoardType.get(4), BoardType.get(5), BoardType.get(3, 4), BoardType.get(4, 3)]
+
+    def test_to_array(self):
+
+        for board_type in self.BOARD_TYPES:
+
+            # preparation
+            states = random_states(board_type, 50)
+
+            # do work
+            tiles = batch.to_array(states)
+
+            # test
+            self.assertEqual(tiles.shape, (50, board_type.length))
+            self.assertEqual(tiles.tolist(), [state.tiles() for state in states])
+            self.assertEqual(batch.to_states(tiles, board_type), states)
+
+    def test_heuristics(self):
+
+        for board_type in self.BOARD_TYPES:
+
+            # preparation
+            states = random_states(board_type, 200)
+            tiles = batch.to_array(states)
+
+            # do work
+            manhattan = batch.manhattan(tiles, board_type)
+            conflicts = batch.linear_conflict(tiles, board_type)
+            solvable = batch.solvable(tiles, board_type)
+
+            # test
+            self.assertEqual(manhattan.tolist(), [state.manhattan() for state in states])
+            self.assertEqual(conflicts.tolist(), [linear_conflict(state) for state in states])
+            self.assertEqual(solvable.tolist(), [state.is_solvable() for state in states])
+
+    def test_expand(self):
+
+        for board_type in self.BOARD_TYPES:
+
+            # preparation
+            states = random_states(board_type, 30)
+
+            # do work
+            children, parents, moves = batch.expand(batch.to_array(states), board_type)
+
+            # test
+            expected = sorted((index, state.board) for index, parent in enumerate(states)
+                              for state in parent.generate_next_moves())
+            self.assertEqual(sorted(zip(parents.tolist(), [state.board for state in
+                                                          batch.to_states(children, board_type)])), expected)
+            for child, parent, move in zip(batch.to_states(children, board_type), parents, moves):
+                self.assertEqual(states[parent].move(move), child)
+
+
+if __name__ == '__main__':
+    unittest.main()
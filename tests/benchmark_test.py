@@ -0,0 +1,105 @@
+__author__ = 'Acko'
+
+import os
+import tempfile
+import unittest
+
+from application.BoardType import BoardType
+from application.Heap import BucketQueue
+from application.TableState import TableState
+from application.benchmark import random_corpus, walk_corpus, from_korf, load_korf, parse_configuration, compare, \
+    KORF_FILE
+from application.functions import ida_star_search
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def test_random_corpus(self):
+
+        # do work
+        corpus = random_corpus(20, seed=3)
+
+        # test
+        self.assertEqual(len(corpus), 20)
+        self.assertTrue(all(state.is_solvable() for state in corpus))
+        self.assertEqual(corpus, random_corpus(20, seed=3))
+        self.assertNotEqual(corpus, random_corpus(20, seed=4))
+
+    def test_walk_corpus(self):
+
+        # do work
+        corpus = walk_corpus(5, 8, BoardType.get(3), seed=1)
+
+        # test
+        self.assertEqual(corpus, walk_corpus(5, 8, BoardType.get(3), seed=1))
+        for state in corpus:
+            self.assertEqual(state.board_type, BoardType.get(3))
+            self.assertIsNone(state.last_move)
+            self.assertTrue(len(ida_star_search(state)) <= 8)
+
+    def test_from_korf(self):
+
+        # do work and test
+        self.assertEqual(from_korf(range(16)), TableState.goal())
+        self.assertEqual(from_korf([1, 0] + range(2, 16)), TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15'))
+
+    def test_load_korf(self):
+
+        # preparation
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, 'w') as output:
+            output.write('1 14 13 15 7 11 12 9 5 6 0 2 1 4 8 10 3 57\n\n')
+            output.write('0 1 2 3 4 5 6 7 8 9 10 11 12 13 14 15\n')
+
+        # do work
+        try:
+            corpus = load_korf(path)
+        finally:
+            os.remove(path)
+
+        # test
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(corpus[0], from_korf([14, 13, 15, 7, 11, 12, 9, 5, 6, 0, 2, 1, 4, 8, 10, 3]))
+        self.assertTrue(corpus[0].is_solvable())
+        self.assertEqual(corpus[1], TableState.goal())
+
+    def test_korf_instances(self):
+
+        # do work
+        corpus = load_korf()
+        with open(KORF_FILE) as input_file:
+            lengths = [int(line.split()[17]) for line in input_file]
+
+        # test
+        self.assertEqual(len(corpus), 100)
+        self.assertEqual(corpus[0], from_korf([14, 13, 15, 7, 11, 12, 9, 5, 6, 0, 2, 1, 4, 8, 10, 3]))
+        self.assertEqual(sum(lengths), 5305)
+        for state, length in zip(corpus, lengths):
+            self.assertTrue(state.is_solvable())
+            self.assertTrue(state.manhattan() <= length)
+            self.assertEqual((length - state.manhattan()) % 2, 0)
+
+    def test_parse_configuration(self):
+
+        # do work and test
+        self.assertEqual(parse_configuration('greedy:manhattan'), {'engine': 'greedy', 'heuristic': 'manhattan'})
+        self.assertEqual(parse_configuration('astar:hamming:bucket')['queue'], BucketQueue)
+        self.assertRaises(ValueError, parse_configuration, 'astar')
+        self.assertRaises(ValueError, parse_configuration, 'idastar:manhattan:bucket')
+
+    def test_compare(self):
+
+        # preparation
+        baseline = {'a': {'solved': 5, 'time': 1.0, 'nodes_per_second': 1000.0, 'moves': 100},
+                    'b': {'solved': 5, 'time': 1.0},
+                    'c': {'solved': 5, 'time': 1.0}}
+        results = {'a': {'solved': 5, 'time': 1.05, 'nodes_per_second': 800.0, 'moves': 120},
+                   'b': {'solved': 4, 'time': 0.5},
+                   'd': {'solved': 5, 'time': 1.0}}
+
+        # do work
+        regressions = compare(results, baseline, 0.1)
+
+        # test
+        self.assertEqual(regressions, [('a', 'moves', 100, 120), ('a', 'nodes_per_second', 1000.0, 800.0),
+                                       ('b', 'solved', 5, 4)])
@@ -0,0 +1,100 @@
+__author__ = 'Acko'
+
+import unittest
+from application.TableState import TableState
+from application.SearchBudget import SearchLimitExceeded
+from application.bidirectional import *
+from application.functions import solve_puzzle, A_STAR, BIDIRECTIONAL
+
+
+class BidirectionalTest(unittest.TestCase):
+
+    PUZZLES = [
+        '5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15',
+        '5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15',
+        '1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15',
+        '2 3 4 8 1 6 7 x 5 9 10 12 13 14 11 15'
+    ]
+
+    def test_optimal(self):
+
+        for puzzle in self.PUZZLES:
+
+            # preparation
+            initial_state = TableState(puzzle, None)
+
+            # do work
+            a_star = solve_puzzle(initial_state, A_STAR)
+            sequential = solve_puzzle(initial_state, BIDIRECTIONAL)
+            parallel = solve_puzzle(initial_state, BIDIRECTIONAL, parallel=True, table_bits=16)
+
+            # test
+            for solution in (sequential, parallel):
+                self.assertEqual(len(solution), len(a_star))
+
+                states = list(solution.states())
+                self.assertEqual(states[0], initial_state)
+                self.assertTrue(states[-1].is_final())
+                for previous_state, state in zip(states, states[1:]):
+                    self.assertIn(state, previous_state.generate_next_moves())
+
+    def test_final_state(self):
+
+        # preparation
+        initial_state = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+
+        # do work and test
+        self.assertEqual(len(bidirectional_search(initial_state)), 0)
+        self.assertEqual(len(bidirectional_search(initial_state, parallel=True)), 0)
+
+    def test_limits(self):
+
+        # preparation
+        initial_state = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+
+        # do work and test
+        with self.assertRaises(SearchLimitExceeded):
+            solve_puzzle(initial_state, BIDIRECTIONAL, max_nodes=50)
+        with self.assertRaises(SearchLimitExceeded):
+            solve_puzzle(initial_state, BIDIRECTIONAL, max_nodes=50, parallel=True, table_bits=10)
+
+    def test_shared_state_set(self):
+
+        # preparation
+        states = SharedStateSet(4)
+
+        # do work
+        for board in xrange(1, 12):
+            states.put(board << 40, board)
+        states.put(5 << 40, 1)
+
+        # test
+        self.assertEqual(states.get(3 << 40), 3)
+        self.assertEqual(states.get(5 << 40), 1)
+        self.assertIsNone(states.get(13 << 40))
+        with self.assertRaises(SearchLimitExceeded):
+            for board in xrange(12, 17):
+                states.put(board << 40, board)
+
+    def test_worker_error(self):
+
+        # preparation
+        initial_state = TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None)
+
+        def broken(state):
+            raise ValueError('Broken heuristic')
+
+        def unpicklable(state):
+            raise ValueError(lambda: state)
+
+        # do work and test
+        with self.assertRaises(ValueError):
+            bidirectional_search(initial_state, broken, parallel=True, table_bits=10)
+        # error which can't be sent to parent is sent as its traceback, it is not reported as spent budget
+        with self.assertRaises(RuntimeError) as context:
+            bidirectional_search(initial_state, unpicklable, parallel=True, table_bits=10)
+        self.assertIn('ValueError', str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
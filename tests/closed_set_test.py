@@ -0,0 +1,106 @@
+__author__ = 'Acko'
+
+import random
+import tempfile
+import unittest
+from functools import partial
+from application.BoardType import BoardType
+from application.TableState import TableState
+from application.SearchBudget import SearchLimitExceeded
+from application.ClosedSet import *
+from application.functions import solve_puzzle, GREEDY, A_STAR
+
+
+def random_walk(board_type, length, seed=15):
+    """ Helper which returns states visited by random walk from final state """
+
+    generator = random.Random(seed)
+    states = [TableState.goal(board_type)]
+    for _ in xrange(length):
+        states.append(generator.choice(states[-1].generate_next_moves()))
+    return states
+
+
+class ClosedSetTest(unittest.TestCase):
+
+    def test_exact_sets(self):
+
+        for board_type in (BoardType.get(4), BoardType.get(5), BoardType.get(3, 4)):
+            for closed_set in (DictionaryClosedSet(board_type), PackedClosedSet(board_type, capacity=4)):
+
+                # preparation
+                states = random_walk(board_type, 500)
+
+                # do work
+                for state in states[:250]:
+                    closed_set.add(state)
+
+                # test
+                self.assertEqual(len(closed_set), len(set(states[:250])))
+                for state in states[:250]:
+                    self.assertIn(state, closed_set)
+                    self.assertEqual(closed_set[state], state)
+                for state in set(states[250:]) - set(states[:250]):
+                    self.assertNotIn(state, closed_set)
+                self.assertGreater(closed_set.memory(), 0)
+                closed_set.close()
+
+    def test_packed_last_move(self):
+
+        # preparation
+        closed_set = PackedClosedSet(BoardType.get(4))
+        puzzle = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+        moved = puzzle.move(TableState.LEFT)
+
+        # do work
+        closed_set.add(puzzle)
+        closed_set.add(moved)
+
+        # test
+        self.assertIsNone(closed_set[puzzle].last_move)
+        self.assertEqual(closed_set[moved].last_move, TableState.LEFT)
+        self.assertEqual(closed_set.path(puzzle, moved.move(TableState.UP)), 'LU')
+        with self.assertRaises(KeyError):
+            closed_set[moved.move(TableState.UP)]
+
+    def test_memory_limit(self):
+
+        # preparation
+        puzzle = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+        directory = tempfile.gettempdir()
+
+        # do work and test
+        for closed_set in (partial(DictionaryClosedSet, max_memory=2 ** 16),
+                           partial(PackedClosedSet, max_memory=2 ** 14)):
+            with self.assertRaises(SearchLimitExceeded):
+                solve_puzzle(puzzle, A_STAR, closed_set=closed_set)
+
+        closed_set = PackedClosedSet(BoardType.get(4), max_memory=2 ** 14, spill_directory=directory)
+        states = random_walk(BoardType.get(4), 5000)
+        for state in states:
+            closed_set.add(state)
+        self.assertTrue(closed_set.spilled)
+        self.assertTrue(all(state in closed_set for state in states))
+        closed_set.close()
+
+        bloom = BloomClosedSet(BoardType.get(4), max_memory=1024)
+        self.assertEqual(bloom.memory(), 1024)
+
+    def test_engines(self):
+
+        # preparation
+        puzzle = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+        optimal = TableState('5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15', None)
+
+        # do work
+        greedy = [solve_puzzle(puzzle, GREEDY, closed_set=closed_set) for closed_set in CLOSED_SETS.values()]
+        a_star = [solve_puzzle(optimal, A_STAR, closed_set=closed_set) for closed_set in CLOSED_SETS.values()]
+
+        # test
+        for solution in greedy + a_star:
+            self.assertTrue(solution.final_state().is_final())
+        self.assertEqual(len(set(len(solution) for solution in a_star)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+__author__ = 'Acko'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from application import tables
+from application.BoardType import BoardType
+from application.DistanceTable import DistanceTable
+from application.TableState import TableState
+from application.functions import solve_puzzle, IDA_STAR, DISTANCE_TABLE
+from application.benchmark import random_corpus
+
+
+class DistanceTableTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = DistanceTable.build(BoardType.get(3))
+
+    def test_rank(self):
+
+        # preparation
+        board_type = BoardType.get(2, 3)
+        table = DistanceTable(board_type, '')
+
+        # do work
+        ranks = [table.rank(board_type.pack(tiles)) for tiles in
+                 ([0, 1, 2, 3, 4, 5], [0, 1, 2, 3, 5, 4], [1, 0, 2, 3, 4, 5], [5, 4, 3, 2, 1, 0])]
+
+        # test
+        self.assertEqual(len(table), 720)
+        self.assertEqual(ranks, [0, 1, 120, 719])
+
+    def test_optimal_paths(self):
+
+        # preparation
+        puzzles = random_corpus(10, BoardType.get(3), seed=3)
+
+        # do work and test
+        self.assertEqual(self.table.value(TableState.goal(BoardType.get(3)).board), 0)
+        for puzzle in puzzles:
+            moves = self.table.path(puzzle)
+            self.assertEqual(len(moves), len(solve_puzzle(puzzle, IDA_STAR)))
+            state = puzzle
+            for move in moves:
+                state = state.move(move)
+            self.assertTrue(state.is_final())
+
+    def test_invalid_states(self):
+
+        # preparation
+        unsolvable = TableState('2 1 3 4 5 6 7 8 x', None)
+
+        # do work and test
+        self.assertEqual(self.table.value(unsolvable.board), DistanceTable.UNREACHABLE)
+        with self.assertRaises(ValueError):
+            self.table.path(unsolvable)
+        with self.assertRaises(ValueError):
+            self.table.path(TableState.goal())
+        with self.assertRaises(ValueError):
+            DistanceTable.build(BoardType.get(3, 4))
+
+    def test_save_load(self):
+
+        # preparation
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        puzzle = TableState('8 6 7 2 5 4 3 x 1', None)
+
+        # do work
+        self.table.save(path)
+        loaded = DistanceTable.load(path)
+
+        # test
+        try:
+            self.assertIs(loaded.board_type, BoardType.get(3))
+            self.assertEqual(loaded.path(puzzle), self.table.path(puzzle))
+            self.assertEqual(len(loaded.path(puzzle)), 31)
+        finally:
+            loaded.close()
+            os.remove(path)
+
+    def test_engine(self):
+
+        # preparation
+        directory = tempfile.mkdtemp()
+        original_file = tables.TABLES_FILE
+        tables.TABLES_FILE = os.path.join(directory, 'tables.bin')
+        puzzle = TableState('3 1 2 4 x 5', None, BoardType.get(2, 3))
+
+        # do work
+        try:
+            solution = solve_puzzle(puzzle, DISTANCE_TABLE)
+            saved = os.path.exists(os.path.join(directory, 'distances-2x3.bin'))
+        finally:
+            tables.TABLES_FILE = original_file
+            shutil.rmtree(directory)
+
+        # test
+        self.assertTrue(saved)
+        self.assertTrue(solution.final_state().is_final())
+        self.assertEqual(solution.bound, 1.0)
+        self.assertIs(DistanceTable.get(BoardType.get(2, 3)).board_type, BoardType.get(2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
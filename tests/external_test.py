@@ -0,0 +1,92 @@
+__author__ = 'Acko'
+
+import os
+import shutil
+import tempfile
+import unittest
+from application.BoardType import BoardType
+from application.TableState import TableState
+from application.SearchBudget import SearchLimitExceeded
+from application.SearchStats import SearchStats
+from application.external import external_search, _encode, _decode, _records, _write_run, _merge_layer, _contains
+from application.functions import solve_puzzle, A_STAR, EXTERNAL
+
+
+class ExternalTest(unittest.TestCase):
+
+    PUZZLES = [
+        '5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15',
+        '2 3 4 8 1 6 7 x 5 9 10 12 13 14 11 15',
+        '8 6 7 2 5 4 3 x 1'
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_optimal(self):
+
+        for puzzle in self.PUZZLES:
+
+            # preparation
+            initial_state = TableState(puzzle, None)
+            stats = SearchStats()
+
+            # do work (small chunks, so layers are merged from many runs)
+            a_star = solve_puzzle(initial_state, A_STAR)
+            solution = solve_puzzle(initial_state, EXTERNAL, directory=self.directory, chunk_size=16, stats=stats)
+
+            # test
+            self.assertEqual(len(solution), len(a_star))
+            self.assertTrue(solution.final_state().is_final())
+            self.assertGreater(stats.iterations, 0)
+            self.assertEqual(os.listdir(self.directory), [])
+
+    def test_breadth_first(self):
+
+        # preparation
+        initial_state = TableState('4 1 2 5 8 3 7 x 6', None)
+        stats = SearchStats()
+
+        # do work
+        solution = external_search(initial_state, lambda state: 0, directory=self.directory, stats=stats)
+
+        # test
+        self.assertEqual(len(solution), 7)
+        self.assertGreater(stats.duplicates, 0)
+        self.assertTrue(solution.final_state().is_final())
+
+    def test_layer_files(self):
+
+        # preparation
+        width = 8
+        runs = [os.path.join(self.directory, name) for name in ('run-0', 'run-1', 'previous', 'layer')]
+
+        # do work
+        _write_run(runs[0], [5, 1, 9, 5], width, 16)
+        _write_run(runs[1], [2, 9, 7], width, 16)
+        _write_run(runs[2], [1, 7], width, 16)
+        count, duplicates = _merge_layer(runs[:2], runs[2], runs[3], width, 16)
+
+        # test
+        self.assertEqual((count, duplicates), (3, 3))
+        self.assertEqual([_decode(record) for record in _records(runs[3], width, 16)], [2, 5, 9])
+        self.assertTrue(_contains(runs[3], _encode(5, width)))
+        self.assertFalse(_contains(runs[3], _encode(7, width)))
+        self.assertGreater(_encode(1 << 60, width), _encode(2, width))
+
+    def test_limits(self):
+
+        # preparation
+        initial_state = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+
+        # do work and test
+        with self.assertRaises(SearchLimitExceeded):
+            solve_puzzle(initial_state, EXTERNAL, max_nodes=50, directory=self.directory)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+__author__ = 'Acko'
+
+import time
+import unittest
+from application.BoardType import BoardType
+from application.Heap import BucketQueue
+from application.SearchBudget import SearchBudget
+from application.Solution import Solution
+from application.TableState import TableState
+from application.functions import *
+
+
+class FunctionsTest(unittest.TestCase):
+
+    def test_engines_solve(self):
+
+        # preparation
+        puzzle = TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None)
+
+        # do work and test (distance table is built only for small boards)
+        for engine in set(ENGINES) - {DISTANCE_TABLE}:
+            self.assertTrue(solve_puzzle(puzzle, engine).final_state().is_final())
+
+    def test_optimal_engines(self):
+
+        # preparation
+        puzzle = TableState('5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15', None)
+
+        # do work
+        a_star = solve_puzzle(puzzle, A_STAR)
+        ida_star = solve_puzzle(puzzle, IDA_STAR)
+        bucket_a_star = solve_puzzle(puzzle, A_STAR, queue=BucketQueue)
+        greedy = solve_puzzle(puzzle, GREEDY)
+
+        # test
+        self.assertEqual(len(a_star), len(ida_star))
+        self.assertEqual(len(a_star), len(bucket_a_star))
+        self.assertLessEqual(len(a_star), len(greedy))
+
+    def test_invalid_input(self):
+
+        # preparation
+        puzzle1 = TableState('2 1 3 4 5 6 7 8 9 10 11 12 x 13 14 15', None)
+        puzzle2 = TableState('1 2 3 4 5 6 7 8 9 10 11 12 x 13 14 15', None)
+
+        # do work and test
+        with self.assertRaises(NotSolvablePuzzle):
+            solve_puzzle(puzzle1)
+        with self.assertRaises(ValueError):
+            solve_puzzle(puzzle2, 'unknown')
+
+    def test_limits(self):
+
+        # preparation
+        puzzle = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+
+        # do work and test
+        with self.assertRaises(SearchLimitExceeded):
+            solve_puzzle(puzzle, A_STAR, max_nodes=100)
+        with self.assertRaises(SearchLimitExceeded):
+            solve_puzzle(puzzle, IDA_STAR, timeout=0)
+
+    def test_solve_many(self):
+
+        # preparation
+        puzzles = [
+            TableState('5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15', None),
+            TableState('2 1 3 4 5 6 7 8 9 10 11 12 x 13 14 15', None),
+            TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None),
+            TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None),
+            TableState('1 2 3 4 5 6 7 x 8', None),
+            TableState('1 2 3 4 5 x 6 7', None, BoardType.get(2, 4))
+        ]
+
+        # do work
+        for workers in (1, 2):
+            results = sorted(solve_many(puzzles, workers, engine=A_STAR, heuristic='linear_conflict', max_nodes=1000))
+
+            # test
+            self.assertEqual([index for index, _, _ in results], range(len(puzzles)))
+            self.assertEqual(len(results[0][1]), 12)
+            self.assertEqual(results[0][1].initial_state, puzzles[0])
+            self.assertEqual(results[0][1].final_state(), TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None))
+            self.assertEqual(results[1][1:], (None, 'Puzzle not solvable!'))
+            self.assertEqual(len(results[2][1]), 8)
+            self.assertIsNone(results[3][1])
+            self.assertIn('limit', results[3][2])
+            self.assertEqual(results[4][1].moves, 'R')
+            self.assertEqual(results[5][1].moves, 'RR')
+            self.assertIs(results[5][1].final_state().board_type, BoardType.get(2, 4))
+
+    def test_filter_solvable(self):
+
+        # preparation
+        board_type = BoardType.get(3)
+        states = [TableState('1 2 3 4 5 6 x 7 8', None), TableState('2 1 3 4 5 6 x 7 8', None),
+                  TableState('8 6 7 2 5 4 3 x 1', None)]
+
+        # do work
+        screened = filter_solvable(iter(states))
+        packed = list(filter_solvable([state.board for state in states], board_type))
+
+        # test
+        self.assertEqual(next(screened), states[0])
+        self.assertEqual(list(screened), [states[2]])
+        self.assertEqual(packed, [states[0].board, states[2].board])
+        self.assertEqual(list(filter_solvable([TableState.goal().board, TableState.goal().board ^ 0x33])),
+                         [TableState.goal().board])
+
+    def test_shorten_solution(self):
+
+        # preparation
+        puzzle = TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None)
+        cyclic = Solution(TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15', None), 'LRUDR')
+        detour = Solution(TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15', None), 'ULDRULDRULDRR')
+
+        # do work
+        greedy = solve_puzzle(puzzle, GREEDY)
+        shortened = solve_puzzle(puzzle, GREEDY, shorten_window=8)
+        optimal = solve_puzzle(puzzle, A_STAR, shorten_window=8)
+
+        # test
+        self.assertEqual(shorten_solution(cyclic).moves, 'R')
+        self.assertEqual(shorten_solution(detour, window=4).moves, 'R')
+        self.assertTrue(shortened.final_state().is_final())
+        self.assertLessEqual(len(shortened), len(greedy))
+        self.assertGreaterEqual(len(shortened), len(optimal))
+        self.assertEqual(optimal, solve_puzzle(puzzle, A_STAR))
+
+    def test_shorten_budget(self):
+
+        # preparation
+        greedy = solve_puzzle(TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None), GREEDY)
+        checks = [0]
+
+        def cancelled_later():
+            checks[0] += 1
+            return checks[0] > 10
+
+        # do work
+        full = shorten_solution(greedy, budget=SearchBudget(timeout=60))
+        cancelled = shorten_solution(greedy, budget=SearchBudget(cancelled=lambda: True))
+        partial = shorten_solution(greedy, budget=SearchBudget(cancelled=cancelled_later))
+        expired = shorten_solution(greedy, budget=SearchBudget(deadline=time.time() - 1))
+
+        # test
+        self.assertEqual(cancelled, shorten_solution(greedy, passes=0))
+        self.assertEqual(expired, cancelled)
+        self.assertTrue(len(full) < len(partial) < len(cancelled))
+        self.assertTrue(partial.final_state().is_final())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -65,6 +65,97 @@ class HeapTest(unittest.TestCase):
             self.assertEqual(h_up.pop(), (5 - i, 5 - i))
             self.assertEqual(h_down.pop(), (i, i))
 
+    def test_decrease_key(self):
+
+        # preparation
+        h = Heap()
+
+        for element in ([(5, '1'), (10, '2'), (2, '3'), (7, '4')]):
+            h.add(element[0], element[1])
+
+        # do work and test
+        self.assertTrue(h.contains('2'))
+        self.assertFalse(h.contains('5'))
+
+        h.decrease_key('2', 1)
+        self.assertEqual(h.top(), (1, '2'))
+
+        with self.assertRaises(HeapError):
+            h.decrease_key('4', 8)
+        with self.assertRaises(HeapError):
+            h.decrease_key('5', 1)
+        with self.assertRaises(HeapError):
+            h.add(3, '1')
+
+        self.assertEqual([h.pop() for _ in xrange(len(h))], [(1, '2'), (2, '3'), (5, '1'), (7, '4')])
+        self.assertFalse(h.contains('2'))
+
+
+class BucketQueueTest(unittest.TestCase):
+
+    def test_add(self):
+
+        # preparation
+        q = BucketQueue()
+
+        # do work and test
+        q.add(5, '1')
+        self.assertEqual(q.top(), (5, '1'))
+
+        q.add(10, '2')
+        self.assertEqual(q.top(), (5, '1'))
+
+        q.add(2, '3')
+        self.assertEqual(q.top(), (2, '3'))
+
+        with self.assertRaises(HeapError):
+            q.add(-1, '4')
+        with self.assertRaises(HeapError):
+            q.add(1.5, '4')
+
+    def test_pop(self):
+
+        # preparation
+        q = BucketQueue()
+
+        for element in ([(5, '1'), (10, '2'), (2, '3'), (7, '4'), (1, '5')]):
+            q.add(element[0], element[1])
+
+        # do work and test
+        self.assertEqual(q.pop(), (1, '5'))
+        self.assertEqual(q.pop(), (2, '3'))
+
+        q.add(0, '6')
+        self.assertEqual(q.pop(), (0, '6'))
+        self.assertEqual(q.pop(), (5, '1'))
+        self.assertEqual(q.pop(), (7, '4'))
+        self.assertEqual(q.pop(), (10, '2'))
+
+        with self.assertRaises(HeapError):
+            q.pop()
+
+    def test_decrease_key(self):
+
+        # preparation
+        q = BucketQueue()
+
+        for element in ([(5, '1'), (10, '2'), (2, '3'), (7, '4')]):
+            q.add(element[0], element[1])
+
+        # do work and test
+        q.decrease_key('2', 1)
+        self.assertTrue(q.contains('2'))
+        self.assertEqual(len(q), 4)
+        self.assertEqual(q.top(), (1, '2'))
+
+        with self.assertRaises(HeapError):
+            q.decrease_key('4', 8)
+        with self.assertRaises(HeapError):
+            q.decrease_key('5', 1)
+
+        self.assertEqual([q.pop() for _ in xrange(len(q))], [(1, '2'), (2, '3'), (5, '1'), (7, '4')])
+        self.assertTrue(q.is_empty())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+__author__ = 'Acko'
+
+import random
+import unittest
+from application.BoardType import BoardType
+from application.HeuristicCache import HeuristicCache
+from application.SearchStats import SearchStats
+from application.TableState import TableState
+from application.functions import solve_puzzle, IDA_STAR
+from application.heuristics import linear_conflict, walking_distance
+
+
+class HeuristicCacheTest(unittest.TestCase):
+
+    def walk(self, board_type, length, seed):
+        generator = random.Random(seed)
+        states = [TableState.goal(board_type)]
+        for _ in xrange(length):
+            states.append(generator.choice(states[-1].generate_next_moves()))
+        return states
+
+    def test_values(self):
+
+        # preparation
+        states = self.walk(BoardType.get(4), 300, 1) + self.walk(BoardType.get(3, 4), 100, 2) + \
+            self.walk(BoardType.get(4, 3), 100, 3)
+        caches = [HeuristicCache(linear_conflict), HeuristicCache(walking_distance)]
+
+        # do work and test
+        for _ in xrange(2):
+            for state in states:
+                self.assertEqual(caches[0](state), linear_conflict(state))
+                self.assertEqual(caches[1](state), walking_distance(state))
+
+        for cache in caches:
+            self.assertEqual(cache.misses, len(set((state.board_type, state.board) for state in states)))
+            self.assertEqual(cache.hits + cache.misses, 2 * len(states))
+        self.assertGreater(caches[0].line_hits, caches[0].line_misses)
+        self.assertEqual(caches[1].line_hits + caches[1].line_misses, 0)
+
+    def test_bounds(self):
+
+        # preparation
+        states = self.walk(BoardType.get(4), 2000, 4)
+        cache = HeuristicCache(linear_conflict, size=64, line_size=32)
+
+        # do work
+        for state in states:
+            self.assertEqual(cache(state), linear_conflict(state))
+            self.assertLessEqual(len(cache), 64)
+            self.assertLessEqual(cache.to_dict()['line_entries'], 32)
+
+        # test
+        self.assertGreater(cache.evictions, 0)
+        self.assertGreater(cache.line_evictions, 0)
+        self.assertEqual(cache(states[-1]), linear_conflict(states[-1]))
+        self.assertEqual(cache.to_dict()['hits'], cache.hits)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_solve_puzzle(self):
+
+        # preparation
+        puzzle = TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None)
+        stats = SearchStats()
+
+        # do work
+        solution = solve_puzzle(puzzle, IDA_STAR, 'linear_conflict', stats=stats, heuristic_cache=1024)
+
+        # test
+        self.assertEqual(solution, solve_puzzle(puzzle, IDA_STAR, 'linear_conflict'))
+        self.assertIs(HeuristicCache.get(linear_conflict, 1024), HeuristicCache.get(linear_conflict, 1024))
+        self.assertGreater(stats.cache_hits, 0)
+        self.assertEqual(stats.cache_hits + stats.cache_misses, stats.heuristic_calls)
+        self.assertEqual(stats.to_dict()['cache_misses'], stats.cache_misses)
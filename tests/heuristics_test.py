@@ -0,0 +1,91 @@
+__author__ = 'Acko'
+
+import random
+import unittest
+from application.BoardType import BoardType
+from application.TableState import TableState
+from application.heuristics import *
+from application.functions import solve_puzzle, IDA_STAR
+
+
+class HeuristicsTest(unittest.TestCase):
+
+    def test_values(self):
+
+        # preparation
+        puzzle1 = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+        puzzle2 = TableState('2 1 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+        puzzle3 = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 x 14 15', None)
+
+        # do work and test
+        for name in HEURISTICS:
+            # 4x4 pattern database takes minutes to build, 'pdb' is tested with 3x3 one in pattern_database_test
+            if name != 'pdb':
+                self.assertEqual(get_heuristic(name)(puzzle1), 0)
+
+        self.assertEqual(linear_conflict(puzzle2), puzzle2.manhattan() + 2)
+        self.assertEqual(linear_conflict(puzzle3), 2)
+        self.assertEqual(walking_distance(puzzle3), 2)
+        self.assertEqual(longest_increasing([3, 1, 2, 0, 4]), 3)
+        self.assertEqual(longest_increasing([]), 0)
+
+    def test_admissible(self):
+
+        # preparation
+        generator = random.Random(15)
+        combined = combine_max('linear_conflict', walking_distance)
+        heuristics = [get_heuristic(name) for name in ('manhattan', 'linear_conflict', 'walking_distance')]
+
+        for _ in xrange(10):
+            puzzle = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+            for _ in xrange(20):
+                puzzle = generator.choice(puzzle.generate_next_moves())
+            puzzle = TableState(puzzle.board, None)
+
+            # do work
+            solution = solve_puzzle(puzzle, IDA_STAR, combined)
+
+            # test
+            for remaining, state in enumerate(reversed(list(solution.states()))):
+                for heuristic in heuristics:
+                    self.assertLessEqual(heuristic(state), remaining)
+                self.assertLessEqual(combined(state), remaining)
+                self.assertGreaterEqual(linear_conflict(state), state.manhattan())
+
+    def test_rectangular(self):
+
+        # preparation
+        generator = random.Random(15)
+        heuristics = [get_heuristic(name) for name in ('manhattan', 'linear_conflict', 'walking_distance')]
+
+        for board_type in (BoardType.get(2, 4), BoardType.get(3, 4), BoardType.get(4, 3)):
+            puzzle = TableState.goal(board_type)
+            for _ in xrange(20):
+                puzzle = generator.choice(puzzle.generate_next_moves())
+            puzzle = TableState(puzzle.board, None, board_type)
+
+            # do work
+            solution = solve_puzzle(puzzle, IDA_STAR, 'linear_conflict')
+
+            # test
+            for remaining, state in enumerate(reversed(list(solution.states()))):
+                for heuristic in heuristics:
+                    self.assertLessEqual(heuristic(state), remaining)
+
+    def test_registry(self):
+
+        # preparation
+        register_heuristic('double_hamming', lambda state: 2 * state.hamming())
+        puzzle = TableState('2 1 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+
+        # do work and test
+        self.assertEqual(get_heuristic('double_hamming')(puzzle), 4)
+        self.assertIs(get_heuristic(walking_distance), walking_distance)
+        with self.assertRaises(ValueError):
+            get_heuristic('unknown')
+
+        del HEURISTICS['double_hamming']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,27 @@ __author__ = 'Acko'
 
 import unittest
 
-from heap_test import HeapTest
+from heap_test import HeapTest, BucketQueueTest
 from table_state_test import TableStateTest
+from functions_test import FunctionsTest
+from pattern_database_test import PatternDatabaseTest
+from heuristics_test import HeuristicsTest
+from bidirectional_test import BidirectionalTest
+from solution_cache_test import SolutionCacheTest
+from solution_test import SolutionTest
+from batch_test import BatchTest
+from closed_set_test import ClosedSetTest
+from anytime_test import AnytimeTest
+from search_stats_test import SearchStatsTest
+from benchmark_test import BenchmarkTest
+from pipeline_test import PipelineTest
+from solver_service_test import SolverServiceTest
+from tables_test import TablesTest
+from warm_test import WarmTest
+from distance_table_test import DistanceTableTest
+from parallel_test import ParallelTest
+from external_test import ExternalTest
+from heuristic_cache_test import HeuristicCacheTest
 
 
 class MainTest(unittest.TestCase):
@@ -11,8 +30,35 @@ class MainTest(unittest.TestCase):
     def runTests(self):
         table_state_test_suite = unittest.TestLoader().loadTestsFromTestCase(TableStateTest)
         heap_test_suite = unittest.TestLoader().loadTestsFromTestCase(HeapTest)
+        bucket_queue_test_suite = unittest.TestLoader().loadTestsFromTestCase(BucketQueueTest)
+        functions_test_suite = unittest.TestLoader().loadTestsFromTestCase(FunctionsTest)
+        pattern_database_test_suite = unittest.TestLoader().loadTestsFromTestCase(PatternDatabaseTest)
+        heuristics_test_suite = unittest.TestLoader().loadTestsFromTestCase(HeuristicsTest)
+        bidirectional_test_suite = unittest.TestLoader().loadTestsFromTestCase(BidirectionalTest)
+        solution_cache_test_suite = unittest.TestLoader().loadTestsFromTestCase(SolutionCacheTest)
+        solution_test_suite = unittest.TestLoader().loadTestsFromTestCase(SolutionTest)
+        batch_test_suite = unittest.TestLoader().loadTestsFromTestCase(BatchTest)
+        closed_set_test_suite = unittest.TestLoader().loadTestsFromTestCase(ClosedSetTest)
+        anytime_test_suite = unittest.TestLoader().loadTestsFromTestCase(AnytimeTest)
+        search_stats_test_suite = unittest.TestLoader().loadTestsFromTestCase(SearchStatsTest)
+        benchmark_test_suite = unittest.TestLoader().loadTestsFromTestCase(BenchmarkTest)
+        pipeline_test_suite = unittest.TestLoader().loadTestsFromTestCase(PipelineTest)
+        solver_service_test_suite = unittest.TestLoader().loadTestsFromTestCase(SolverServiceTest)
+        tables_test_suite = unittest.TestLoader().loadTestsFromTestCase(TablesTest)
+        warm_test_suite = unittest.TestLoader().loadTestsFromTestCase(WarmTest)
+        distance_table_test_suite = unittest.TestLoader().loadTestsFromTestCase(DistanceTableTest)
+        parallel_test_suite = unittest.TestLoader().loadTestsFromTestCase(ParallelTest)
+        external_test_suite = unittest.TestLoader().loadTestsFromTestCase(ExternalTest)
+        heuristic_cache_test_suite = unittest.TestLoader().loadTestsFromTestCase(HeuristicCacheTest)
 
-        test_suite = unittest.TestSuite([table_state_test_suite, heap_test_suite])
+        test_suite = unittest.TestSuite([table_state_test_suite, heap_test_suite, bucket_queue_test_suite,
+                                         functions_test_suite, pattern_database_test_suite, heuristics_test_suite,
+                                         bidirectional_test_suite, solution_cache_test_suite, solution_test_suite,
+                                         batch_test_suite, closed_set_test_suite, anytime_test_suite,
+                                         search_stats_test_suite, benchmark_test_suite,
+                                         pipeline_test_suite, solver_service_test_suite, tables_test_suite,
+                                         warm_test_suite, distance_table_test_suite,
+                                         parallel_test_suite, external_test_suite, heuristic_cache_test_suite])
         unittest.TextTestRunner().run(test_suite)
 
 if __name__ == '__main__':
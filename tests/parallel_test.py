@@ -0,0 +1,84 @@
+__author__ = 'Acko'
+
+import unittest
+from application.TableState import TableState
+from application.SearchBudget import SearchLimitExceeded
+from application.SearchStats import SearchStats
+from application.parallel import *
+from application.functions import solve_puzzle, A_STAR, HDA_STAR
+
+
+class ParallelTest(unittest.TestCase):
+
+    PUZZLES = [
+        '5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15',
+        '2 3 4 8 1 6 7 x 5 9 10 12 13 14 11 15',
+        '8 6 7 2 5 4 3 x 1'
+    ]
+
+    def test_optimal(self):
+
+        for puzzle in self.PUZZLES:
+
+            # preparation
+            initial_state = TableState(puzzle, None)
+
+            # do work
+            a_star = solve_puzzle(initial_state, A_STAR)
+            solutions = [solve_puzzle(initial_state, HDA_STAR, workers=workers, batch_size=8) for workers in (1, 3)]
+
+            # test
+            for solution in solutions:
+                self.assertEqual(len(solution), len(a_star))
+                self.assertEqual(solution.bound, 1.0)
+                self.assertTrue(solution.final_state().is_final())
+
+    def test_statistics(self):
+
+        # preparation
+        initial_state = TableState(self.PUZZLES[1], None)
+        stats = SearchStats()
+
+        # do work
+        solution = solve_puzzle(initial_state, HDA_STAR, stats=stats, workers=2)
+
+        # test
+        self.assertEqual(stats.solution_length, len(solution))
+        self.assertGreater(stats.expanded, 0)
+        self.assertGreaterEqual(stats.generated, stats.expanded)
+        self.assertGreater(stats.heuristic_calls, 0)
+
+    def test_final_state(self):
+
+        # preparation
+        initial_state = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+
+        # do work and test
+        self.assertEqual(len(hda_star_search(initial_state, workers=2)), 0)
+
+    def test_limits(self):
+
+        # preparation
+        initial_state = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', None)
+
+        # do work and test
+        with self.assertRaises(SearchLimitExceeded):
+            solve_puzzle(initial_state, HDA_STAR, max_nodes=50, workers=2)
+
+    def test_worker_error(self):
+
+        # preparation
+        initial_state = TableState(self.PUZZLES[0], None)
+
+        def broken(state):
+            raise ValueError('Broken heuristic')
+
+        # do work and test
+        with self.assertRaises(RuntimeError) as context:
+            hda_star_search(initial_state, broken, workers=2)
+        self.assertIn('Broken heuristic', str(context.exception))
+        self.assertNotIsInstance(context.exception, SearchLimitExceeded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+__author__ = 'Acko'
+
+import os
+import shutil
+import tempfile
+import unittest
+from application import tables
+from application.BoardType import BoardType
+from application.TableState import TableState
+from application.PatternDatabase import *
+from application.functions import solve_puzzle, A_STAR
+from application.heuristics import HEURISTICS
+
+
+class PatternDatabaseTest(unittest.TestCase):
+
+    PATTERNS = ((1, 2, 3), (4, 5, 6))
+
+    @classmethod
+    def setUpClass(cls):
+        cls.database = PatternDatabase.build(4, cls.PATTERNS)
+
+    def test_values(self):
+
+        # preparation
+        puzzle1 = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+        puzzle2 = TableState('2 1 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+        puzzle3 = TableState('5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15', None)
+
+        # do work and test
+        self.assertEqual(self.database(puzzle1), 0)
+        self.assertGreaterEqual(self.database(puzzle2), 2)
+        self.assertGreaterEqual(self.database(puzzle3), 2)
+        self.assertLessEqual(self.database(puzzle3), 16)
+
+    def test_admissible(self):
+
+        # preparation
+        puzzle = TableState('5 1 3 4 2 6 7 8 x 10 11 12 9 13 14 15', None)
+
+        # do work
+        solution = solve_puzzle(puzzle, A_STAR, self.database)
+
+        # test
+        for remaining, state in enumerate(reversed(list(solution.states()))):
+            self.assertLessEqual(self.database(state), remaining)
+
+    def test_save_load(self):
+
+        # preparation
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        puzzle = TableState('5 1 14 3 11 10 6 15 2 8 4 7 9 x 13 12', None)
+
+        # do work
+        self.database.save(path)
+        loaded = PatternDatabase.load(path)
+
+        # test
+        try:
+            self.assertEqual(loaded.size, 4)
+            self.assertEqual(loaded.patterns, self.PATTERNS)
+            self.assertEqual(loaded(puzzle), self.database(puzzle))
+        finally:
+            loaded.close()
+            os.remove(path)
+
+    def test_invalid_patterns(self):
+
+        # do work and test
+        with self.assertRaises(PatternDatabaseError):
+            PatternDatabase.build(4, ((1, 2), (2, 3)))
+        with self.assertRaises(PatternDatabaseError):
+            PatternDatabase.build(4, ((1, 16),))
+        with self.assertRaises(PatternDatabaseError):
+            PatternDatabase.get(5)
+
+    def test_get(self):
+
+        # preparation
+        directory = tempfile.mkdtemp()
+        original_file = tables.TABLES_FILE
+        tables.TABLES_FILE = os.path.join(directory, 'tables.bin')
+        puzzle = TableState('4 1 2 5 8 3 7 x 6', None)
+
+        # do work
+        try:
+            database = PatternDatabase.get(3)
+            loaded = PatternDatabase.load(os.path.join(directory, 'pattern-database-3x3.bin'))
+            solution = solve_puzzle(puzzle, A_STAR, 'pdb')
+        finally:
+            tables.TABLES_FILE = original_file
+            shutil.rmtree(directory)
+
+        # test
+        self.assertIs(PatternDatabase.get(3), database)
+        self.assertEqual(database.patterns, PatternDatabase.DEFAULT_PATTERNS[3])
+        self.assertEqual(database(puzzle), PatternDatabase.build(3)(puzzle))
+        self.assertEqual(loaded(puzzle), database(puzzle))
+        self.assertEqual(len(solution), len(solve_puzzle(puzzle, A_STAR)))
+        self.assertEqual(HEURISTICS['pdb'](puzzle), database(puzzle))
+        loaded.close()
+        self.assertEqual([len(pattern) for pattern in PatternDatabase.DEFAULT_PATTERNS[4]], [5, 5, 5])
+        self.assertEqual(database.size, BoardType.get(3).rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
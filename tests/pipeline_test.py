@@ -0,0 +1,105 @@
+__author__ = 'Acko'
+
+import json
+import unittest
+from StringIO import StringIO
+
+from application.Solution import Solution
+from application.TableState import TableState
+from application.functions import IDA_STAR
+from application.pipeline import read_puzzles, validate, solve_stream, write_text, write_json, write_binary, \
+    read_binary, SOLVED, REJECTED, FAILED
+
+
+class PipelineTest(unittest.TestCase):
+
+    def test_read_puzzles(self):
+
+        # preparation
+        lines = iter(['1 2 3 4 5 6 7 8 x\n', '\n', '# comment\n', '  8 6 7 2 5 4 3 x 1  \n'])
+
+        # do work
+        puzzles = read_puzzles(lines)
+
+        # test
+        self.assertEqual(next(puzzles), (1, '1 2 3 4 5 6 7 8 x'))
+        self.assertEqual(list(lines), ['\n', '# comment\n', '  8 6 7 2 5 4 3 x 1  \n'])
+        self.assertEqual(list(puzzles), [])
+
+    def test_validate(self):
+
+        # preparation
+        puzzles = [(1, '1 2 3 4 5 6 7 x 8'), (2, '1 2 3 4 5 6 8 7 x'), (3, '1 2 3 4 4 6 7 8 x'), (4, '1 2 3')]
+
+        # do work
+        records = list(validate(puzzles))
+
+        # test
+        self.assertEqual(records[0], (1, TableState('1 2 3 4 5 6 7 x 8')))
+        self.assertEqual(str(records[1][1]), 'Puzzle not solvable!')
+        self.assertIsInstance(records[2][1], ValueError)
+        self.assertIsInstance(records[3][1], ValueError)
+
+    def test_solve_stream(self):
+
+        # preparation
+        lines = ['1 2 3 4 5 6 7 x 8', 'not a puzzle', '8 6 7 2 5 4 3 x 1', '1 2 3 4 5 6 8 7 x']
+        collected = {}
+
+        # do work
+        for workers in (1, 2):
+            results = sorted(solve_stream(validate(read_puzzles(lines)), workers, on_stats=collected.__setitem__,
+                                          engine=IDA_STAR))
+
+            # test
+            self.assertEqual([result[0] for result in results], [1, 2, 3, 4])
+            self.assertEqual(results[0][1].moves, 'R')
+            self.assertIsNone(results[1][1])
+            self.assertTrue(results[1][3])
+            self.assertEqual(len(results[2][1]), 31)
+            self.assertEqual(results[3][2:], ('Puzzle not solvable!', True))
+            self.assertEqual(sorted(collected), [1, 3])
+
+    def test_writers(self):
+
+        # preparation
+        solution = Solution(TableState('1 2 3 4 5 6 x 7 8'), 'RR', 1.5)
+        text, lines, binary = StringIO(), StringIO(), StringIO()
+
+        # do work
+        for output, write in ((text, write_text), (lines, write_json), (binary, write_binary)):
+            write(output, 7, solution, None, False)
+            write(output, 8, None, 'Puzzle not solvable!', True)
+            write(output, 9, None, 'Node limit exceeded', False)
+
+        # test
+        self.assertEqual(text.getvalue().splitlines()[0], '7: solved in 2 moves (at most 1.50 times optimal): RR')
+        self.assertEqual(json.loads(lines.getvalue().splitlines()[0]), {'line': 7, 'length': 2, 'moves': 'RR',
+                                                                        'bound': 1.5})
+        self.assertEqual(json.loads(lines.getvalue().splitlines()[1])['rejected'], True)
+        binary.seek(0)
+        self.assertEqual(list(read_binary(binary)), [(7, SOLVED, 'RR', 1.5), (8, REJECTED, None, None),
+                                                     (9, FAILED, None, None)])
+
+    def test_binary_moves(self):
+
+        # preparation
+        moves = 'LURDDRULLLURRD'
+        output = StringIO()
+
+        # do work
+        write_binary(output, 1, Solution(TableState.goal(), moves), None, False)
+
+        # test
+        output.seek(0)
+        self.assertEqual(list(read_binary(output)), [(1, SOLVED, moves, None)])
+        output.truncate(len(output.getvalue()) - 1)
+        output.seek(0)
+        with self.assertRaises(ValueError):
+            list(read_binary(output))
+
+        # solutions of big boards can have more than 65535 moves
+        output = StringIO()
+        write_binary(output, 2, Solution(TableState.goal(), 'LR' * 40000), None, False)
+        output.seek(0)
+        self.assertEqual(list(read_binary(output)), [(2, SOLVED, 'LR' * 40000, None)])
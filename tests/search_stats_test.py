@@ -0,0 +1,136 @@
+__author__ = 'Acko'
+
+import json
+import unittest
+from StringIO import StringIO
+
+from application.Heap import Heap
+from application.SearchStats import SearchStats
+from application.TableState import TableState
+from application.functions import solve_puzzle, solve_many, A_STAR, IDA_STAR, GREEDY
+
+
+class SearchStatsTest(unittest.TestCase):
+
+    def test_counters(self):
+
+        # preparation
+        stats = SearchStats()
+        initial_state = TableState('1 2 3 4 5 6 7 8 9 10 11 12 x 13 14 15')
+
+        # do work
+        solution = solve_puzzle(initial_state, A_STAR, stats=stats)
+
+        # test
+        self.assertEqual(stats.engine, A_STAR)
+        self.assertEqual(stats.solution_length, len(solution))
+        self.assertEqual(stats.expanded, 3)
+        self.assertTrue(stats.generated >= stats.expanded)
+        self.assertTrue(stats.heuristic_calls > 0)
+        self.assertEqual(stats.heap_pops, 4)
+        self.assertTrue(stats.heap_pushes >= stats.heap_pops)
+        self.assertTrue(stats.peak_closed >= 3)
+
+    def test_iterations(self):
+
+        # preparation
+        stats = SearchStats(timing=False)
+        initial_state = TableState('1 2 3 4 5 6 x 8 9 10 7 12 13 14 11 15')
+
+        # do work
+        solve_puzzle(initial_state, IDA_STAR, stats=stats)
+
+        # test
+        self.assertEqual(stats.iterations, 1)
+        self.assertEqual(stats.heuristic_calls, 0)
+        self.assertEqual(stats.solution_length, 3)
+
+    def test_branching_factor(self):
+
+        # preparation
+        stats = SearchStats()
+        stats.solution_length = 3
+        stats.generated = 14
+
+        # do work and test
+        self.assertAlmostEqual(stats.branching_factor(), 2.0)
+
+        stats.solution_length = None
+        self.assertIsNone(stats.branching_factor())
+
+    def test_long_solution(self):
+
+        # preparation
+        stats = SearchStats()
+        solution = solve_puzzle(TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15'), GREEDY, stats=stats)
+        output = StringIO()
+
+        # do work
+        stats.dump(output)
+
+        # test
+        self.assertGreater(len(solution), 200)
+        factor = json.loads(output.getvalue())['branching_factor']
+        self.assertTrue(1.0 <= factor < 1.1)
+        self.assertLess(abs(sum(factor ** level for level in xrange(len(solution) + 1)) / (stats.generated + 1) - 1),
+                        1e-6)
+
+    def test_progress(self):
+
+        # preparation
+        calls = []
+        stats = SearchStats(calls.append, 2)
+
+        # do work
+        for _ in xrange(5):
+            stats.expand(10, 20)
+
+        # test
+        self.assertEqual(calls, [stats, stats])
+        self.assertEqual(stats.peak_open, 10)
+        self.assertEqual(stats.peak_closed, 20)
+
+    def test_dump(self):
+
+        # preparation
+        stats = SearchStats()
+        output = StringIO()
+        solve_puzzle(TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15'), GREEDY, stats=stats)
+
+        # do work
+        stats.dump(output)
+
+        # test
+        line = output.getvalue()
+        self.assertTrue(line.endswith('\n'))
+        self.assertEqual(json.loads(line)['solution_length'], 1)
+        self.assertEqual(json.loads(line)['engine'], GREEDY)
+
+    def test_solve_many(self):
+
+        # preparation
+        states = [TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15'),
+                  TableState('1 2 3 x 4 5 6 7 8 9 10 11 12 13 14 15')]
+        collected = {}
+
+        # do work
+        results = list(solve_many(states, 1, on_stats=collected.__setitem__, engine=A_STAR))
+
+        # test
+        self.assertEqual(len(results), 2)
+        self.assertEqual(collected[0]['solution_length'], 1)
+        self.assertIsNone(collected[1]['solution_length'])
+
+    def test_heap_counters(self):
+
+        # preparation
+        heap = Heap()
+
+        # do work
+        heap.add(3, 'a')
+        heap.add(2, 'b')
+        heap.decrease_key('a', 1)
+        heap.pop()
+
+        # test
+        self.assertEqual((heap.pushes, heap.pops, heap.decreases), (2, 1, 1))
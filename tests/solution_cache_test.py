@@ -0,0 +1,134 @@
+__author__ = 'Acko'
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from application.TableState import TableState
+from application.SolutionCache import SolutionCache
+from application.Solution import Solution
+from application.functions import solve_puzzle, A_STAR, GREEDY, WEIGHTED_A_STAR
+
+
+class SolutionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_mirrored(self):
+
+        # preparation
+        puzzle = TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None)
+
+        # do work
+        moves = solve_puzzle(puzzle, A_STAR).moves
+        mirrored_moves = solve_puzzle(puzzle.mirrored(), A_STAR).moves
+
+        # test
+        self.assertTrue(TableState.goal().mirrored().is_final())
+        self.assertEqual(puzzle.mirrored().mirrored(), puzzle)
+        swapped = ''.join({'L': 'U', 'U': 'L', 'R': 'D', 'D': 'R'}[move] for move in moves)
+        self.assertTrue(Solution(puzzle.mirrored(), swapped).final_state().is_final())
+        self.assertEqual(len(moves), len(mirrored_moves))
+
+    def test_solve_with_cache(self):
+
+        # preparation
+        cache = SolutionCache(self.path, memory_size=1)
+        puzzle = TableState('5 1 3 4 9 2 7 8 x 6 11 12 13 10 14 15', None)
+
+        # do work
+        first = solve_puzzle(puzzle, A_STAR, cache=cache)
+        second = solve_puzzle(puzzle, A_STAR, cache=cache)
+        mirrored = solve_puzzle(puzzle.mirrored(), A_STAR, cache=cache)
+
+        # test
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(first, second)
+        self.assertEqual((first.bound, second.bound, mirrored.bound), (1, 1, 1))
+        self.assertTrue(mirrored.final_state().is_final())
+        self.assertEqual(len(mirrored), len(first))
+
+        cache.close()
+        reopened = SolutionCache(self.path)
+        self.assertEqual(reopened.get(puzzle, A_STAR), first.moves)
+        self.assertIsNone(reopened.get(puzzle, 'other engine'))
+        self.assertEqual(reopened.get_solution(puzzle.mirrored(), A_STAR).bound, 1)
+        reopened.close()
+
+    def test_old_file(self):
+
+        # preparation
+        connection = sqlite3.connect(self.path)
+        connection.execute('CREATE TABLE solutions (key TEXT PRIMARY KEY, moves TEXT NOT NULL, used INTEGER NOT NULL)')
+        connection.commit()
+        connection.close()
+        puzzle = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15', None)
+
+        # do work
+        cache = SolutionCache(self.path)
+        cache.put(puzzle, 'R', 'old')
+        cache.put(puzzle, 'R', 'new', 1.5)
+        cache.close()
+        cache = SolutionCache(self.path)
+
+        # test
+        self.assertIsNone(cache.get_solution(puzzle, 'old').bound)
+        self.assertEqual(cache.get_solution(puzzle, 'new').bound, 1.5)
+        self.assertEqual(cache.get_solution(puzzle, 'new').moves, 'R')
+        cache.close()
+
+    def test_namespaces(self):
+
+        # preparation
+        cache = SolutionCache(self.path)
+        puzzle = TableState('1 2 3 4 5 6 7 8 x 11 12 14 10 9 15 13', None)
+
+        # do work
+        weighted = solve_puzzle(puzzle, WEIGHTED_A_STAR, cache=cache, weight=5.0)
+        optimal = solve_puzzle(puzzle, WEIGHTED_A_STAR, cache=cache, weight=1.0)
+        manhattan = solve_puzzle(puzzle, GREEDY, 'manhattan', cache=cache)
+        conflict = solve_puzzle(puzzle, GREEDY, 'linear_conflict', cache=cache)
+        size = len(cache)
+        unnamed = solve_puzzle(puzzle, GREEDY, lambda state: state.manhattan(), cache=cache)
+
+        # test
+        self.assertEqual((len(weighted), len(optimal)), (26, 20))
+        self.assertEqual((len(manhattan), len(conflict)), (54, 20))
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(len(cache), size)
+        self.assertEqual(unnamed, manhattan)
+        self.assertEqual(solve_puzzle(puzzle, WEIGHTED_A_STAR, cache=cache, weight=5.0), weighted)
+        self.assertEqual(cache.hits, 1)
+        cache.close()
+
+    def test_eviction(self):
+
+        # preparation
+        cache = SolutionCache(self.path, memory_size=2, disk_size=3)
+        puzzles = [TableState.goal()]
+        for direction in 'ULULDRDR':
+            puzzles.append(puzzles[-1].move(direction))
+        puzzles = [TableState(puzzle.board, None) for puzzle in puzzles]
+
+        # do work
+        for puzzle in puzzles:
+            cache.put(puzzle, 'L')
+        cache.get(puzzles[6])
+        cache.put(puzzles[0], '')
+
+        # test
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.get(puzzles[0]), '')
+        self.assertEqual(cache.get(puzzles[8]), 'L')
+        self.assertEqual(cache.get(puzzles[6]), 'L')
+        self.assertIsNone(cache.get(puzzles[7]))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
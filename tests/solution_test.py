@@ -0,0 +1,54 @@
+__author__ = 'Acko'
+
+import unittest
+from application.TableState import TableState
+from application.Solution import Solution
+
+
+class SolutionTest(unittest.TestCase):
+
+    def test_states(self):
+
+        # preparation
+        puzzle = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 x 14 15', None)
+        solution = Solution(puzzle, 'RR')
+
+        # do work
+        states = list(solution.states())
+
+        # test
+        self.assertEqual(len(solution), 2)
+        self.assertEqual(str(solution), 'RR')
+        self.assertEqual(states[0], puzzle)
+        self.assertEqual(states[1], TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15', None))
+        self.assertEqual(states[2], solution.final_state())
+        self.assertTrue(solution.final_state().is_final())
+        self.assertEqual(solution, Solution(puzzle, 'RR'))
+        self.assertNotEqual(solution, Solution(puzzle, 'RRL'))
+
+    def test_invalid_move(self):
+
+        # preparation
+        solution = Solution(TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None), 'R')
+
+        # do work and test
+        with self.assertRaises(ValueError):
+            solution.final_state()
+
+    def test_backtrack(self):
+
+        # preparation
+        puzzle = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
+        visited = {puzzle: puzzle}
+        state = puzzle
+        for direction in 'LLUR':
+            state = state.move(direction)
+            visited[state] = state
+
+        # do work and test
+        self.assertEqual(Solution.backtrack(state, visited), 'LLUR')
+        self.assertEqual(Solution.backtrack(puzzle, visited), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
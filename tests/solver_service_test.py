@@ -0,0 +1,116 @@
+__author__ = 'Acko'
+
+import json
+import threading
+import time
+import unittest
+import urllib2
+
+from application.SearchBudget import SearchBudget, SearchCancelled, SearchLimitExceeded
+from application.SolverService import SolverService, ServiceBusy
+from application.TableState import TableState
+from application.functions import solve_puzzle, NotSolvablePuzzle, A_STAR, IDA_STAR
+from application.service import make_server
+
+
+class SolverServiceTest(unittest.TestCase):
+
+    HARD = TableState('13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15')
+
+    def setUp(self):
+        self.service = SolverService(2, 2)
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_cancelled_budget(self):
+
+        # preparation
+        flag = []
+
+        # do work and test
+        with self.assertRaises(SearchCancelled):
+            solve_puzzle(self.HARD, A_STAR, cancelled=lambda: flag.append(1) or True)
+        self.assertEqual(flag, [1])
+        self.assertTrue(issubclass(SearchCancelled, SearchLimitExceeded))
+        SearchBudget(cancelled=lambda: False).spend()
+
+    def test_solve(self):
+
+        # do work and test
+        self.assertEqual(self.service.solve(TableState('8 6 7 2 5 4 3 x 1'), engine=IDA_STAR).moves,
+                         'LURURDLDRULLURRDLDLUURDDLUURDRD')
+        with self.assertRaises(NotSolvablePuzzle):
+            self.service.solve(TableState('1 2 3 4 5 6 8 7 x'))
+        with self.assertRaises(ValueError):
+            self.service.solve(TableState('1 2 3 4 5 6 7 x 8'), heuristic='unknown')
+
+    def test_coalescing_and_backpressure(self):
+
+        # do work
+        first = self.service.submit(self.HARD, A_STAR)
+        second = self.service.submit(self.HARD, A_STAR)
+        other = self.service.submit(self.HARD, IDA_STAR)
+
+        # test
+        self.assertIs(first.computation, second.computation)
+        self.assertEqual(len(self.service), 2)
+        with self.assertRaises(ServiceBusy):
+            self.service.submit(TableState('1 2 3 4 5 6 7 x 8'))
+
+        first.cancel()
+        self.assertTrue(first.done())
+        self.assertFalse(second.done())
+        second.cancel()
+        other.cancel()
+        with self.assertRaises(SearchLimitExceeded):
+            second.result()
+
+        # cancelled searches stop, and free their slots
+        for _ in xrange(100):
+            if not len(self.service):
+                break
+            time.sleep(0.05)
+        self.assertEqual(len(self.service), 0)
+
+    def test_deadline(self):
+
+        # preparation
+        finished = []
+
+        # do work
+        request = self.service.submit(self.HARD, A_STAR, timeout=0.2)
+        request.add_callback(finished.append)
+
+        # test
+        with self.assertRaises(SearchLimitExceeded):
+            request.result()
+        self.assertEqual(finished, [request])
+
+    def test_http(self):
+
+        # preparation
+        server = make_server(self.service, port=0, max_timeout=10)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = 'http://127.0.0.1:' + str(server.server_address[1]) + '/solve'
+
+        def post(body):
+            try:
+                response = urllib2.urlopen(url, json.dumps(body))
+            except urllib2.HTTPError as response:
+                pass
+            return response.getcode(), json.loads(response.read())
+
+        # do work and test
+        try:
+            self.assertEqual(post({'board': '1 2 3 4 5 x 6 7', 'board_type': '2x4', 'engine': 'astar'}),
+                             (200, {'moves': 'RR', 'length': 2, 'bound': 1.0}))
+            self.assertEqual(post({'board': '1 2 3 4 5 6 8 7 x'})[0], 422)
+            self.assertEqual(post({'board': '1 2 3'})[0], 400)
+            self.assertEqual(post({'board': '13 9 4 5 10 3 7 14 12 2 11 x 1 8 6 15', 'engine': 'astar',
+                                   'timeout': 0.2})[0], 504)
+        finally:
+            server.shutdown()
+            server.server_close()
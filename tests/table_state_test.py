@@ -1,6 +1,8 @@
 __author__ = 'Acko'
 
+import random
 import unittest
+from application.BoardType import BoardType
 from application.TableState import TableState
 
 
@@ -39,9 +41,37 @@ class TableStateTest(unittest.TestCase):
         puzzle1 = TableState('1 2 3 4 5 6 7 8 9 10 11 12 x 13 14 15', None)
         puzzle2 = TableState('2 1 3 4 5 6 7 8 9 10 11 12 x 13 14 15', None)
 
+        puzzle3 = TableState('1 2 3 4 5 6 x 7 8', None)
+        puzzle4 = TableState('2 1 3 4 5 6 x 7 8', None)
+
         # do work and test
         self.assertEqual(puzzle1.is_solvable(), True)
         self.assertEqual(puzzle2.is_solvable(), False)
+        self.assertEqual(puzzle3.is_solvable(), True)
+        self.assertEqual(puzzle4.is_solvable(), False)
+
+    def test_inversions_and_parity(self):
+
+        # preparation
+        rand = random.Random(5)
+
+        # do work and test
+        for board_type in (BoardType.get(2), BoardType.get(3), BoardType.get(4), BoardType.get(3, 4),
+                           BoardType.get(4, 3), BoardType.get(2, 5), BoardType.get(6)):
+            for _ in xrange(200):
+                tiles = range(board_type.length)
+                rand.shuffle(tiles)
+                state = TableState(tiles, None, board_type)
+
+                numbers = [tile for tile in tiles if tile]
+                inversions = sum(1 for i in xrange(len(numbers)) for j in xrange(i + 1, len(numbers))
+                                 if numbers[j] < numbers[i])
+                blank_row = tiles.index(0) // board_type.columns
+                solvable = inversions % 2 == 0 if board_type.columns % 2 else \
+                    (board_type.rows - 1 - blank_row) % 2 == inversions % 2
+
+                self.assertEqual(state.inversions(), inversions)
+                self.assertEqual(state.is_solvable(), solvable)
 
     def test_is_final(self):
 
@@ -87,19 +117,19 @@ class TableStateTest(unittest.TestCase):
         puzzle3 = TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 x', None)
 
         puzzle1_next_should_be = [
-            TableState('1 2 3 4 5 x 6 7 8 9 10 11 12 13 14 15', puzzle1),
-            TableState('1 2 x 4 5 6 3 7 8 9 10 11 12 13 14 15', puzzle1),
-            TableState('1 2 3 4 5 6 7 x 8 9 10 11 12 13 14 15', puzzle1),
-            TableState('1 2 3 4 5 6 10 7 8 9 x 11 12 13 14 15', puzzle1)
+            TableState('1 2 3 4 5 x 6 7 8 9 10 11 12 13 14 15', TableState.LEFT),
+            TableState('1 2 x 4 5 6 3 7 8 9 10 11 12 13 14 15', TableState.UP),
+            TableState('1 2 3 4 5 6 7 x 8 9 10 11 12 13 14 15', TableState.RIGHT),
+            TableState('1 2 3 4 5 6 10 7 8 9 x 11 12 13 14 15', TableState.DOWN)
         ]
         puzzle2_next_should_be = [
-            TableState('1 x 2 3 4 5 6 7 8 9 10 11 12 13 14 15', puzzle2),
-            TableState('4 1 2 3 x 5 6 7 8 9 10 11 12 13 14 15', puzzle2)
+            TableState('1 x 2 3 4 5 6 7 8 9 10 11 12 13 14 15', TableState.RIGHT),
+            TableState('4 1 2 3 x 5 6 7 8 9 10 11 12 13 14 15', TableState.DOWN)
         ]
 
         puzzle3_next_should_be = [
-            TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15', puzzle3),
-            TableState('1 2 3 4 5 6 7 8 9 10 11 x 13 14 15 12', puzzle3)
+            TableState('1 2 3 4 5 6 7 8 9 10 11 12 13 14 x 15', TableState.LEFT),
+            TableState('1 2 3 4 5 6 7 8 9 10 11 x 13 14 15 12', TableState.UP)
         ]
 
         # do work
@@ -111,6 +141,108 @@ class TableStateTest(unittest.TestCase):
         self.assertEqual(puzzle1_next, puzzle1_next_should_be)
         self.assertEqual(puzzle2_next, puzzle2_next_should_be)
         self.assertEqual(puzzle3_next, puzzle3_next_should_be)
+        for next_states, next_should_be in ((puzzle1_next, puzzle1_next_should_be),
+                                            (puzzle2_next, puzzle2_next_should_be),
+                                            (puzzle3_next, puzzle3_next_should_be)):
+            self.assertEqual([state.last_move for state in next_states],
+                             [state.last_move for state in next_should_be])
+
+    def test_inverse_move_pruned(self):
+
+        # preparation
+        puzzle = TableState('1 2 3 4 5 6 x 7 8 9 10 11 12 13 14 15', None)
+
+        # do work
+        left = puzzle.move(TableState.LEFT)
+        corner = TableState('x 1 2 3 4 5 6 7 8 9 10 11 12 13 14 15', None).move(TableState.DOWN)
+
+        # test
+        self.assertEqual([state.last_move for state in left.generate_next_moves()], ['L', 'U', 'D'])
+        self.assertNotIn(puzzle, left.generate_next_moves())
+        self.assertEqual([state.last_move for state in corner.generate_next_moves()], ['R', 'D'])
+        self.assertEqual(len(puzzle.generate_next_moves()), 4)
+        with self.assertRaises(ValueError):
+            corner.move(TableState.LEFT)
+
+    def test_previous(self):
+
+        # preparation
+        puzzle = TableState('1 2 3 4 5 6 x 7 8 9 10 11 12 13 14 15', None)
+
+        # do work
+        moved = puzzle.move(TableState.DOWN)
+        previous = moved.previous()
+
+        # test
+        self.assertEqual(moved.last_move, TableState.DOWN)
+        self.assertEqual(previous, puzzle)
+        self.assertIsNone(previous.last_move)
+        self.assertEqual(puzzle.direction_to(moved), TableState.DOWN)
+        self.assertIsNone(puzzle.previous())
+
+    def test_packed_board(self):
+
+        # preparation
+        puzzle1 = TableState('5 1 14 3 11 10 6 15 2 8 4 7 9 x 13 12', None)
+        puzzle2 = TableState(puzzle1.board, None)
+
+        # do work and test
+        self.assertEqual(puzzle1.tiles(), [5, 1, 14, 3, 11, 10, 6, 15, 2, 8, 4, 7, 9, 0, 13, 12])
+        self.assertEqual(puzzle1.blank, 13)
+        self.assertEqual(puzzle1, puzzle2)
+        self.assertEqual(str(puzzle1), str(puzzle2))
+        self.assertEqual(str(puzzle1), '5 1 14 3 \n11 10 6 15 \n2 8 4 7 \n9 x 13 12 \n')
+        self.assertFalse(hasattr(puzzle1, '__dict__'))
+
+    def test_incremental_updates(self):
+
+        # preparation
+        puzzle = TableState('5 1 14 3 11 10 6 15 2 8 4 7 9 x 13 12', None)
+
+        # do work and test
+        for _ in xrange(3):
+            for next_state in puzzle.generate_next_moves():
+                rebuilt = TableState(str(next_state), None)
+                self.assertEqual(next_state.manhattan(), rebuilt.manhattan())
+                self.assertEqual(hash(next_state), hash(rebuilt))
+            puzzle = next_state
+
+    def test_board_types(self):
+
+        # preparation
+        board_type = BoardType.get(3, 4)
+        puzzle1 = TableState('1 2 3 4 5 6 7 8 9 10 x 11', None, board_type)
+        puzzle2 = TableState('1 2 3 4 5 6 7 8 x', None)
+
+        # do work
+        mirrored = puzzle1.mirrored()
+
+        # test
+        self.assertIs(puzzle1.board_type, BoardType.parse('3x4'))
+        self.assertIs(puzzle2.board_type, BoardType.get(3))
+        self.assertEqual(str(puzzle1), '1 2 3 4 \n5 6 7 8 \n9 10 x 11 \n')
+        self.assertEqual(puzzle1.manhattan(), 1)
+        self.assertEqual(puzzle1.move(TableState.RIGHT), TableState.goal(board_type))
+        self.assertEqual([state.last_move for state in puzzle1.generate_next_moves()], ['L', 'U', 'R'])
+        self.assertTrue(puzzle1.is_solvable())
+        self.assertIs(mirrored.board_type, BoardType.get(4, 3))
+        self.assertEqual(mirrored.move(TableState.DOWN), TableState.goal(mirrored.board_type))
+        self.assertEqual(mirrored.mirrored(), puzzle1)
+        self.assertNotEqual(TableState(puzzle1.board, None, BoardType.get(4, 3)), puzzle1)
+        with self.assertRaises(ValueError):
+            TableState('1 2 3 4 5 6 7 8 9 10 x 11', None)
+        with self.assertRaises(ValueError):
+            TableState('1 2 3 4 5 6 7 8 x', None, board_type)
+
+    def test_invalid_tiles(self):
+
+        # do work and test
+        with self.assertRaises(ValueError):
+            TableState('1 2 3 4 5 5 6 7 x', None)
+        with self.assertRaises(ValueError):
+            TableState('1 2 3 4 5 6 7 9 x', None)
+        with self.assertRaises(ValueError):
+            TableState('1 2 3 4 5 6 7 8 0 x', None, BoardType.get(2, 5))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,69 @@
+__author__ = 'Acko'
+
+import marshal
+import os
+import shutil
+import tempfile
+import unittest
+
+from application import tables
+
+
+class TablesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.original_file, self.original_tables = tables.TABLES_FILE, dict(tables._tables)
+        tables.TABLES_FILE = os.path.join(self.directory, 'tables.bin')
+        tables._tables.clear()
+
+    def tearDown(self):
+        tables.TABLES_FILE = self.original_file
+        tables._tables.clear()
+        tables._tables.update(self.original_tables)
+        shutil.rmtree(self.directory)
+
+    def test_load_table(self):
+
+        # preparation
+        calls = []
+
+        def builder(size):
+            calls.append(size)
+            return {(size, 1): range(size)}
+
+        # do work
+        first = tables.load_table('squares_3', builder, 3)
+        tables.load_table('squares_4', builder, 4)
+        tables._tables.clear()
+        second = tables.load_table('squares_3', builder, 3)
+
+        # test
+        self.assertEqual(first, {(3, 1): [0, 1, 2]})
+        self.assertEqual(second, first)
+        self.assertEqual(calls, [3, 4])
+        self.assertIs(tables.load_table('squares_3', builder, 3), second)
+
+    def test_stale_file(self):
+
+        # preparation
+        with open(tables.TABLES_FILE, 'wb') as output:
+            marshal.dump((('puzzle-tables', tables.TABLES_VERSION - 1), {'table': (0, 2)}), output)
+            output.write(marshal.dumps(1)[:2])
+
+        # do work
+        value = tables.load_table('table', lambda: 'built')
+        tables._tables.clear()
+
+        # test
+        self.assertEqual(value, 'built')
+        self.assertEqual(tables.load_table('table', lambda: 'built again'), 'built')
+
+    def test_disabled_file(self):
+
+        # preparation
+        tables.TABLES_FILE = ''
+
+        # do work and test
+        self.assertEqual(tables.load_table('table', lambda: 5), 5)
+        self.assertEqual(os.listdir(self.directory), [])
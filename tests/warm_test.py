@@ -0,0 +1,68 @@
+__author__ = 'Acko'
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from multiprocessing import Process
+from StringIO import StringIO
+
+from application.warm import serve, run_client, _reads_stdin
+
+
+class WarmTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'socket')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reads_stdin(self):
+
+        # do work and test
+        self.assertTrue(_reads_stdin(['-', '--format', 'jsonl']))
+        self.assertTrue(_reads_stdin(['--stats', '-', '-']))
+        self.assertFalse(_reads_stdin(['--stats', '-']))
+        self.assertFalse(_reads_stdin(['puzzles.txt', '--output', 'results.txt']))
+
+    def test_no_worker(self):
+
+        # do work and test
+        self.assertIsNone(run_client(['--puzzle', '1 2 3 4 5 6 7 x 8'], self.path))
+
+    def test_worker(self):
+
+        # preparation
+        worker = Process(target=serve, args=(self.path,))
+        worker.start()
+        for _ in xrange(100):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.05)
+        output, sys.stdout = sys.stdout, StringIO()
+
+        # do work
+        try:
+            solved = run_client(['--puzzle', '1 2 3 4 5 6 7 x 8', '--engine', 'astar'], self.path)
+            failed = run_client(['--puzzle', '1 2 3 4 5 6 8 7 x'], self.path)
+            mode = os.stat(self.path).st_mode & 0o777
+            with self.assertRaises(RuntimeError):
+                serve(self.path)
+            kept = run_client(['--puzzle', '1 2 3 4 5 6 7 x 8'], self.path)
+        finally:
+            sys.stdout, captured = output, sys.stdout.getvalue()
+            worker.terminate()
+            worker.join()
+
+        # test
+        self.assertEqual(solved, 0)
+        self.assertEqual(failed, 1)
+        self.assertEqual(mode, 0o600)
+        self.assertEqual(kept, 0)
+        self.assertIn('Solved in 1 moves', captured)
+        self.assertIn('Puzzle not solvable!', captured)
+        self.assertFalse(os.path.exists(self.path))